@@ -3,16 +3,35 @@
 
 import os
 import sys
-import argparse
 
-from tubarr.web import app, ytj
+from tubarr.web import app, ytj, MAX_PROGRESS_STREAMS
 from tubarr.core import YTToJellyfin, DownloadJob, logger
 
-__all__ = ["app", "ytj", "YTToJellyfin", "DownloadJob", "main"]
+__all__ = ["app", "ytj", "YTToJellyfin", "DownloadJob", "main", "serve_web"]
 
+# Worker threads for the WSGI server; job polling and media listings overlap.
+# Open progress streams each hold a thread of their own on top of these.
+WEB_THREADS = 8
+
+
+def serve_web(host, port):
+    """Serve the web interface with waitress, or Flask's server without it."""
+    logger.info(f"Starting web interface on {host}:{port}")
+    # Media listings are served from a snapshot kept fresh in the background
+    ytj.start_media_refresher()
+    try:
+        from waitress import serve
+    except ImportError:
+        logger.warning("waitress not installed; using the Flask development server")
+        app.run(host=host, port=port, debug=False, threaded=True)
+        return
+    serve(app, host=host, port=port, threads=WEB_THREADS + MAX_PROGRESS_STREAMS)
+
+
+def _build_parser():
+    """Build the command line argument parser."""
+    import argparse
 
-def main():
-    """Parse command line arguments and execute the application."""
     parser = argparse.ArgumentParser(
         description="Download YouTube playlists as TV show episodes for Jellyfin"
     )
@@ -43,7 +62,17 @@ def main():
     parser.add_argument(
         "episode_start_pos", nargs="?", help="Episode start number (positional)"
     )
+    return parser
+
+
+def main():
+    """Parse command line arguments and execute the application."""
+    # Cron-style update checks take no other options; skip building the parser
+    if sys.argv[1:] == ["--check-updates"]:
+        ytj.check_playlist_updates()
+        return 0
 
+    parser = _build_parser()
     args = parser.parse_args()
 
     # Set environment variables from command line args if provided
@@ -62,48 +91,24 @@ def main():
         ytj.check_playlist_updates()
         return 0
 
+    config = ytj.config
+    web_enabled = config.get("web_enabled", True)
+    host = config.get("web_host", "0.0.0.0")
+    port = config.get("web_port", 8000)
+
     # Web-only mode
-    if args.web_only or ytj.config.get("web_enabled", True):
-        # Start web interface
-        host = ytj.config.get("web_host", "0.0.0.0")
-        port = ytj.config.get("web_port", 8000)
-
-        if args.web_only:
-            logger.info(f"Starting web interface on {host}:{port}")
-            app.run(host=host, port=port, debug=False)
-            return 0
-
-    # Command-line mode if URL is provided
-    url = args.url or args.url_pos
-    show_name = args.show_name or args.show_name_pos
-    season_num = args.season_num or args.season_num_pos
-    episode_start = args.episode_start or args.episode_start_pos
-
-    # Use defaults from config if available
-    if (
-        not url
-        and "defaults" in ytj.config
-        and "playlist_url" in ytj.config["defaults"]
-    ):
-        url = ytj.config["defaults"]["playlist_url"]
-    if (
-        not show_name
-        and "defaults" in ytj.config
-        and "show_name" in ytj.config["defaults"]
-    ):
-        show_name = ytj.config["defaults"]["show_name"]
-    if (
-        not season_num
-        and "defaults" in ytj.config
-        and "season_num" in ytj.config["defaults"]
-    ):
-        season_num = ytj.config["defaults"]["season_num"]
-    if (
-        not episode_start
-        and "defaults" in ytj.config
-        and "episode_start" in ytj.config["defaults"]
-    ):
-        episode_start = ytj.config["defaults"]["episode_start"]
+    if args.web_only:
+        serve_web(host, port)
+        return 0
+
+    # Command-line mode if URL is provided, falling back to config defaults
+    defaults = config.get("defaults") or {}
+    url = args.url or args.url_pos or defaults.get("playlist_url")
+    show_name = args.show_name or args.show_name_pos or defaults.get("show_name")
+    season_num = args.season_num or args.season_num_pos or defaults.get("season_num")
+    episode_start = (
+        args.episode_start or args.episode_start_pos or defaults.get("episode_start")
+    )
 
     if url and show_name and season_num and episode_start:
         try:
@@ -115,19 +120,13 @@ def main():
         success = ytj.process(url, show_name, season_num, episode_start_int)
 
         # Always start web interface after processing if enabled
-        if ytj.config.get("web_enabled", True) and not args.web_only:
-            host = ytj.config.get("web_host", "0.0.0.0")
-            port = ytj.config.get("web_port", 8000)
-            logger.info(f"Starting web interface on {host}:{port}")
-            app.run(host=host, port=port, debug=False)
+        if web_enabled:
+            serve_web(host, port)
 
         return 0 if success else 1
-    elif ytj.config.get("web_enabled", True):
+    elif web_enabled:
         # No command-line parameters, but web is enabled
-        host = ytj.config.get("web_host", "0.0.0.0")
-        port = ytj.config.get("web_port", 8000)
-        logger.info(f"Starting web interface on {host}:{port}")
-        app.run(host=host, port=port, debug=False)
+        serve_web(host, port)
         return 0
     else:
         parser.print_help()
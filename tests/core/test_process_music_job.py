@@ -40,6 +40,9 @@ class FakeMusicApp:
     def check_dependencies(self):
         return self.dependencies_ok
 
+    def _ensure_dependencies(self):
+        return self.check_dependencies()
+
     def create_music_album_folder(self, album_name, artist_name=None):
         base = Path(self.config["music_output_dir"])
         if artist_name:
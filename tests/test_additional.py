@@ -4,7 +4,6 @@ import tempfile
 import unittest
 from unittest.mock import patch, MagicMock
 from pathlib import Path
-import subprocess
 
 from tubarr.core import YTToJellyfin
 from tubarr.web import app, ytj
@@ -34,18 +33,18 @@ class TestConfigAndDependencies(unittest.TestCase):
         self.assertEqual(yt.config["cookies"], "/tmp/cookies.txt")
 
     @patch("subprocess.run")
-    @patch("os.access", return_value=True)
-    @patch("os.path.exists", return_value=True)
-    def test_check_dependencies(self, mock_exists, mock_access, mock_run):
-        mock_run.return_value = MagicMock(returncode=0, stdout="/usr/bin/tool")
+    @patch("shutil.which", side_effect=lambda cmd: f"/usr/bin/{cmd}")
+    @patch("os.stat", return_value=MagicMock(st_mode=0o100755))
+    def test_check_dependencies(self, mock_stat, mock_which, mock_run):
+        mock_run.return_value = MagicMock(returncode=0, stdout=" A..... libmp3lame")
         yt = YTToJellyfin()
         yt.config["ytdlp_path"] = "/usr/bin/yt-dlp"
         self.assertTrue(yt.check_dependencies())
+        # PATH lookups happen in-process; only ffmpeg and yt-dlp are executed
+        commands = [c.args[0][0] for c in mock_run.call_args_list]
+        self.assertNotIn("which", commands)
 
-        mock_run.side_effect = [
-            MagicMock(returncode=0, stdout=""),
-            subprocess.CalledProcessError(1, ["which", "ffmpeg"]),
-        ]
+        mock_which.side_effect = lambda cmd: None if cmd == "montage" else cmd
         self.assertFalse(yt.check_dependencies())
 
 
@@ -1,10 +1,13 @@
+import gzip
 import os
 import unittest
 import json
 import tempfile
+import threading
 from unittest.mock import patch, MagicMock
 from unittest.mock import call
 
+from tubarr.jobs import DownloadJob
 from tubarr.web import app, ytj
 
 
@@ -114,6 +117,63 @@ class TestAPIEndpoints(unittest.TestCase):
         response = self.client.get("/jobs/nonexistent")
         self.assertEqual(response.status_code, 404)
 
+    def test_job_progress_streams_until_finished(self):
+        """/jobs/<id>/progress pushes each change as a server-sent event"""
+        job = DownloadJob("job1", "url", "Test Show", "01", "01")
+        ytj.jobs = {"job1": job}
+
+        def worker():
+            job.update(status="downloading", progress=40)
+            job.update(status="completed", progress=100)
+
+        response = self.client.get("/jobs/job1/progress", buffered=False)
+        self.addCleanup(response.close)
+        self.assertEqual(response.mimetype, "text/event-stream")
+        stream = iter(response.response)
+        first = next(stream)
+        threading.Thread(target=worker).start()
+        body = first + b"".join(stream)
+        events = [
+            json.loads(line[len(b"data: ") :])
+            for line in body.split(b"\n")
+            if line.startswith(b"data: ")
+        ]
+        self.assertEqual(events[0]["status"], "queued")
+        self.assertEqual(events[-1]["status"], "completed")
+        self.assertEqual(events[-1]["progress"], 100)
+
+        response = self.client.get("/jobs/nonexistent/progress")
+        self.assertEqual(response.status_code, 404)
+
+    def test_job_progress_streams_are_capped(self):
+        """Progress streams are refused once the cap is reached"""
+        ytj.jobs = {"job1": DownloadJob("job1", "url", "Test Show", "01", "01")}
+
+        with patch("tubarr.web._sse_streams", threading.BoundedSemaphore(1)):
+            first = self.client.get("/jobs/job1/progress", buffered=False)
+            self.assertEqual(first.status_code, 200)
+
+            refused = self.client.get("/jobs/job1/progress")
+            self.assertEqual(refused.status_code, 503)
+            self.assertIn("Retry-After", refused.headers)
+
+            # Closing a stream frees its slot
+            first.close()
+            again = self.client.get("/jobs/job1/progress", buffered=False)
+            self.assertEqual(again.status_code, 200)
+            again.close()
+
+    @patch("tubarr.web._SSE_MAX_AGE", 0)
+    def test_job_progress_stream_lifetime_is_capped(self):
+        """A stream for a running job ends once it reaches its maximum age"""
+        job = DownloadJob("job1", "url", "Test Show", "01", "01")
+        ytj.jobs = {"job1": job}
+
+        with patch.object(job, "wait_for_change", return_value=False):
+            body = self.client.get("/jobs/job1/progress").get_data()
+        self.assertEqual(body.count(b"data: "), 1)
+        self.assertNotIn(b"heartbeat", body)
+
     def test_history_endpoint(self):
         """Test that /history returns only finished jobs"""
         ytj.jobs = {
@@ -193,6 +253,47 @@ class TestAPIEndpoints(unittest.TestCase):
         self.assertEqual(len(data[0]["seasons"]), 1)
         self.assertEqual(len(data[0]["seasons"][0]["episodes"]), 1)
 
+    @patch("app.YTToJellyfin.list_media")
+    def test_get_media_streams_valid_json(self, mock_list_media):
+        """Media listings are valid JSON for any number of shows"""
+        for shows in ([], [{"name": "A"}], [{"name": "A"}, {"name": "B"}]):
+            mock_list_media.return_value = shows
+            response = self.client.get("/media")
+            self.assertEqual(response.mimetype, "application/json")
+            self.assertEqual(json.loads(response.data), shows)
+
+    @patch("app.YTToJellyfin.list_media")
+    def test_get_media_etag_and_gzip(self, mock_list_media):
+        """Unchanged media listings revalidate with 304 and gzip on request"""
+        shows = [{"name": "Show", "seasons": []}]
+        mock_list_media.return_value = shows
+        gzip_headers = {"Accept-Encoding": "gzip"}
+        response = self.client.get("/media", headers=gzip_headers)
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response.headers["Vary"])
+        self.assertEqual(json.loads(gzip.decompress(response.data)), shows)
+        gzip_etag = response.headers["ETag"]
+
+        response = self.client.get(
+            "/media", headers={"If-None-Match": gzip_etag, **gzip_headers}
+        )
+        self.assertEqual(response.status_code, 304)
+
+        # The plain body is a different representation with its own ETag
+        response = self.client.get("/media", headers={"If-None-Match": gzip_etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("Content-Encoding", response.headers)
+        etag = response.headers["ETag"]
+        self.assertNotEqual(etag, gzip_etag)
+
+        response = self.client.get("/media", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+
+        mock_list_media.return_value = [{"name": "Other", "seasons": []}]
+        response = self.client.get("/media", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+
     def test_media_files_endpoint(self):
         """Test serving of media files"""
         with tempfile.TemporaryDirectory() as tempdir:
@@ -206,6 +307,37 @@ class TestAPIEndpoints(unittest.TestCase):
             rel_path = os.path.relpath(poster, tempdir)
             response = self.client.get(f"/media_files/{rel_path}")
             self.assertEqual(response.status_code, 200)
+            etag = response.headers["ETag"]
+            response.close()
+
+            response = self.client.get(
+                f"/media_files/{rel_path}", headers={"If-None-Match": etag}
+            )
+            self.assertEqual(response.status_code, 304)
+
+    def test_static_assets_are_cacheable(self):
+        """Static assets carry a max-age so browsers reuse them"""
+        response = self.client.get("/static/style.css")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("max-age=3600", response.headers["Cache-Control"])
+        response.close()
+
+    def test_episode_media_files_are_cacheable(self):
+        """Converted episodes are served with a long-lived cache policy"""
+        with tempfile.TemporaryDirectory() as tempdir:
+            ytj.config["output_dir"] = tempdir
+            season_dir = os.path.join(tempdir, "Test Show", "Season 01")
+            os.makedirs(season_dir, exist_ok=True)
+            with open(os.path.join(season_dir, "Test Show - S01E01.mp4"), "wb") as f:
+                f.write(b"data")
+
+            response = self.client.get(
+                "/media_files/Test Show/Season 01/Test Show - S01E01.mp4"
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertIn("immutable", response.headers["Cache-Control"])
+            self.assertIn("max-age=3600", response.headers["Cache-Control"])
+            response.close()
 
     def test_get_config(self):
         """Test configuration endpoint"""
@@ -227,6 +359,14 @@ class TestAPIEndpoints(unittest.TestCase):
         # Verify sensitive data is excluded
         self.assertNotIn("cookies", data)
 
+        # Unchanged settings revalidate to a 304
+        etag = response.headers["ETag"]
+        response = self.client.get("/config", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        ytj.config["quality"] = "720"
+        response = self.client.get("/config", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+
     @patch("app.ytj.get_playlist_videos")
     def test_playlist_info_endpoint(self, mock_get):
         mock_get.return_value = [{"index": 1, "id": "abc", "title": "Video"}]
@@ -245,22 +385,31 @@ class TestAPIEndpoints(unittest.TestCase):
         self.assertEqual(data["created_jobs"], ["job-1"])
         mock_check.assert_called_once()
 
-    @patch("os.path.exists", return_value=True)
-    def test_config_put(self, mock_exists):
-        response = self.client.put(
-            "/config",
-            json={
-                "output_dir": "/new",
-                "cookies_path": "/cookies.txt",
-                "use_h265": False,
-            },
-        )
-        self.assertEqual(response.status_code, 200)
-        data = json.loads(response.data)
-        self.assertTrue(data["success"])
-        self.assertEqual(ytj.config["output_dir"], "/new")
-        self.assertFalse(ytj.config["use_h265"])
-        self.assertEqual(ytj.config["cookies"], "/cookies.txt")
+    def test_config_put(self):
+        with tempfile.TemporaryDirectory() as tempdir:
+            cookies = os.path.join(tempdir, "cookies.txt")
+            with open(cookies, "w") as f:
+                f.write("# Netscape HTTP Cookie File\n")
+            response = self.client.put(
+                "/config",
+                json={
+                    "output_dir": "/new",
+                    "cookies_path": cookies,
+                    "use_h265": False,
+                },
+            )
+            self.assertEqual(response.status_code, 200)
+            data = json.loads(response.data)
+            self.assertTrue(data["success"])
+            self.assertEqual(ytj.config["output_dir"], "/new")
+            self.assertFalse(ytj.config["use_h265"])
+            self.assertEqual(ytj.config["cookies"], cookies)
+
+            # A directory is not a usable cookies file
+            response = self.client.put("/config", json={"cookies_path": tempdir})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(ytj.config["cookies_path"], tempdir)
+            self.assertEqual(ytj.config["cookies"], "")
 
     @patch("app.YTToJellyfin.create_movie_job")
     def test_create_movie_job(self, mock_create):
@@ -1,11 +1,11 @@
 import os
 import unittest
-import subprocess
 import tempfile
 from unittest.mock import patch, MagicMock
 from pathlib import Path
 
 from tubarr.core import YTToJellyfin, DownloadJob
+from tubarr.config import _YAML_CACHE
 
 
 class TestYTToJellyfin(unittest.TestCase):
@@ -26,10 +26,11 @@ class TestYTToJellyfin(unittest.TestCase):
         self.assertEqual(self.app.sanitize_name("Test/Name:*?"), "TestName")
         self.assertEqual(self.app.sanitize_name("  Spaces  "), "Spaces")
 
+    @patch("shutil.which", side_effect=lambda cmd: f"/usr/bin/{cmd}")
     @patch("subprocess.run")
-    def test_check_dependencies(self, mock_run):
+    def test_check_dependencies(self, mock_run, mock_which):
         # Setup mock to return successfully
-        # Mock for both 'which' commands and ffmpeg encoder check
+        # Mock for the ffmpeg encoder check and yt-dlp version call
         mock_result = MagicMock(returncode=0)
         mock_result.stdout = "libmp3lame encoder support present"
         mock_run.return_value = mock_result
@@ -37,10 +38,18 @@ class TestYTToJellyfin(unittest.TestCase):
         # Test dependency checking with success
         self.assertTrue(self.app.check_dependencies())
 
-        # Test dependency checking with failure by using subprocess.CalledProcessError
-        mock_run.side_effect = subprocess.CalledProcessError(1, "which")
+        # Test dependency checking with failure when a tool is not on PATH
+        mock_which.side_effect = lambda cmd: None
         self.assertFalse(self.app.check_dependencies())
 
+    @patch.object(YTToJellyfin, "check_dependencies")
+    def test_dependency_check_reused_after_success(self, mock_check):
+        mock_check.side_effect = [False, True]
+        self.assertFalse(self.app._ensure_dependencies())
+        self.assertTrue(self.app._ensure_dependencies())
+        self.assertTrue(self.app._ensure_dependencies())
+        self.assertEqual(mock_check.call_count, 2)
+
     def test_folder_creation(self):
         # Test folder structure creation
         with patch("pathlib.Path.mkdir") as mock_mkdir:
@@ -95,9 +104,10 @@ web:
   host: localhost
 """,
     )
-    @patch("yaml.safe_load")
+    @patch("yaml.load")
     def test_config_loading_from_yaml(self, mock_yaml_load, mock_open, mock_exists):
         # Test loading configuration from YAML file
+        _YAML_CACHE.clear()
         mock_exists.return_value = True
         mock_yaml_load.return_value = {
             "media": {
@@ -139,6 +149,75 @@ web:
         self.assertEqual(len(media_list[0]["seasons"]), 1)
         self.assertEqual(media_list[0]["seasons"][0]["name"], "Season 01")
         self.assertEqual(len(media_list[0]["seasons"][0]["episodes"]), 2)
+        episodes = media_list[0]["seasons"][0]["episodes"]
+        self.assertEqual([e["episode_num"] for e in episodes], [1, 2])
+        self.assertEqual(episodes[0]["name"], "Test Show S01E01")
+        self.assertEqual(media_list[0]["episode_count"], 2)
+
+    def test_list_media_stats_large_seasons_in_parallel(self):
+        season_dir = Path(self.temp_dir) / "Big Show" / "Season 01"
+        os.makedirs(season_dir, exist_ok=True)
+        for n in range(1, 13):
+            (season_dir / f"Big Show S01E{n:02d}.mp4").write_bytes(b"x" * n)
+
+        media_list = self.app.list_media()
+
+        self.assertIsNotNone(self.app._stat_pool)
+        episodes = media_list[0]["seasons"][0]["episodes"]
+        self.assertEqual([e["size"] for e in episodes], list(range(1, 13)))
+
+    def test_list_media_scans_shows_in_parallel(self):
+        for name in ("Show A", "Show B", "Show C"):
+            season_dir = Path(self.temp_dir) / name / "Season 01"
+            os.makedirs(season_dir)
+            (season_dir / f"{name} S01E01.mp4").touch()
+
+        media_list = self.app.list_media()
+
+        self.assertIsNotNone(self.app._show_pool)
+        self.assertEqual(
+            sorted(show["name"] for show in media_list),
+            ["Show A", "Show B", "Show C"],
+        )
+        self.assertTrue(all(show["episode_count"] == 1 for show in media_list))
+
+    def test_list_media_orders_seasons_numerically(self):
+        show_dir = Path(self.temp_dir) / "Long Show"
+        for name in ("Season 10", "Season 2", "Season 1"):
+            os.makedirs(show_dir / name)
+
+        seasons = self.app.list_media()[0]["seasons"]
+        self.assertEqual(
+            [s["name"] for s in seasons], ["Season 1", "Season 2", "Season 10"]
+        )
+
+    def test_list_media_served_from_refresher_snapshot(self):
+        season_dir = Path(self.temp_dir) / "Test Show" / "Season 01"
+        os.makedirs(season_dir, exist_ok=True)
+        (season_dir / "Test Show S01E01.mp4").touch()
+
+        self.app.start_media_refresher()
+        self.addCleanup(self.app.stop_media_refresher)
+        snapshot = self.app.list_media()
+        with patch("tubarr.media._media_tree_key") as mock_key:
+            self.assertIs(self.app.list_media(), snapshot)
+        mock_key.assert_not_called()
+        self.assertEqual(snapshot[0]["episode_count"], 1)
+
+    def test_list_media_cached_until_tree_changes(self):
+        season_dir = Path(self.temp_dir) / "Test Show" / "Season 01"
+        os.makedirs(season_dir, exist_ok=True)
+        (season_dir / "Test Show S01E01.mp4").touch()
+
+        first = self.app.list_media()
+        with patch("tubarr.media._build_media_list") as mock_build:
+            self.assertIs(self.app.list_media(), first)
+        mock_build.assert_not_called()
+
+        (season_dir / "Test Show S01E02.mp4").touch()
+        os.utime(season_dir, ns=(0, 1))
+        updated = self.app.list_media()
+        self.assertEqual(len(updated[0]["seasons"][0]["episodes"]), 2)
 
     def test_download_job_creation_and_updates(self):
         # Create a download job
@@ -1,12 +1,17 @@
 import os
+import tempfile
 import unittest
 from unittest.mock import patch, mock_open
 import yaml
 
+from tubarr import config as config_module
 from tubarr.config import _load_config
 
 
 class TestConfigValidation(unittest.TestCase):
+    def setUp(self):
+        config_module._YAML_CACHE.clear()
+
     def test_invalid_web_port(self):
         env = {
             "WEB_PORT": "70000",
@@ -80,6 +85,43 @@ class TestConfigValidation(unittest.TestCase):
         self.assertTrue(cfg["imdb_enabled"])
         self.assertEqual(cfg["imdb_api_key"], "xyz")
 
+    def test_config_file_parsed_once_while_unchanged(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "config.yml")
+            with open(path, "w") as f:
+                yaml.safe_dump({"tmdb": {"api_key": "first"}}, f)
+            env = {"CONFIG_FILE": path}
+            with patch.dict(os.environ, env, clear=True), patch(
+                "yaml.load", wraps=yaml.load
+            ) as mock_load:
+                cfg = _load_config()
+                cfg_again = _load_config()
+                self.assertEqual(mock_load.call_count, 1)
+                self.assertEqual(cfg_again["tmdb_api_key"], "first")
+
+                with open(path, "w") as f:
+                    yaml.safe_dump({"tmdb": {"api_key": "second-key"}}, f)
+                cfg = _load_config()
+            self.assertEqual(mock_load.call_count, 2)
+            self.assertEqual(cfg["tmdb_api_key"], "second-key")
+
+    def test_json_sidecar_skips_yaml_in_new_process(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "config.yml")
+            with open(path, "w") as f:
+                yaml.safe_dump({"tmdb": {"api_key": "cached"}}, f)
+            env = {"CONFIG_FILE": path}
+            with patch.dict(os.environ, env, clear=True):
+                _load_config()
+                sidecar = os.path.join(tmp, ".config.yml.jsoncache")
+                self.assertTrue(os.path.exists(sidecar))
+                # Simulate a fresh process: only the on-disk sidecar remains
+                config_module._YAML_CACHE.clear()
+                with patch("yaml.load") as mock_load:
+                    cfg = _load_config()
+            mock_load.assert_not_called()
+            self.assertEqual(cfg["tmdb_api_key"], "cached")
+
 
 if __name__ == "__main__":
     unittest.main()
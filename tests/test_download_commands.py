@@ -1,11 +1,16 @@
 import json
+import subprocess
+import sys
 import tempfile
+import time
+import threading
 import unittest
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 from tubarr.core import YTToJellyfin
 from tubarr.media import download_playlist, process_metadata
+from tubarr.utils import iter_process_output
 
 
 class DummyProcess:
@@ -97,6 +102,36 @@ class TestDownloadCommandGeneration(unittest.TestCase):
         self.assertEqual(invoked_cmd[1], f"--cookies={self.cookies_file}")
         self.job.update.assert_any_call(status="downloaded", stage="downloading", progress=100, stage_progress=100, detailed_status="Download completed successfully", message="Download completed successfully")
 
+    def test_download_progress_updates_are_throttled(self):
+        folder = Path(self.output_dir) / "Test Show" / "Season 01"
+        folder.mkdir(parents=True)
+        self.app._get_archive_file = MagicMock(
+            return_value=str(Path(self.temp_dir.name) / "archives" / "t.txt")
+        )
+        progress_lines = [
+            "[download] Destination: /tmp/Test_Show_S01E01.mp4",
+            "[download]   10.0% of 2.00MiB",
+            "[download]   20.0% of 2.00MiB",
+            "[download]   30.0% of 2.00MiB",
+            "[download] Destination: /tmp/Test_Show_S01E02.mp4",
+        ]
+
+        with patch("subprocess.Popen", return_value=DummyProcess(progress_lines)):
+            download_playlist(self.app, "url", str(folder), "01", self.job_id, 1)
+
+        stage_updates = [
+            c.kwargs["stage_progress"]
+            for c in self.job.update.call_args_list
+            if "stage_progress" in c.kwargs and "status" not in c.kwargs
+        ]
+        self.assertEqual(stage_updates, [10.0])
+        self.job.update.assert_any_call(
+            file_name="Test_Show_S01E02.mp4",
+            processed_files=2,
+            detailed_status="Downloading: Test_Show_S01E02.mp4",
+            message="Downloading file: Test_Show_S01E02.mp4",
+        )
+
 
 class TestMetadataTagging(unittest.TestCase):
     def setUp(self):
@@ -174,5 +209,46 @@ class TestMetadataTagging(unittest.TestCase):
         self.job.update.assert_any_call(message="Created NFO file for Cool Show Title")
 
 
+class TestProcessOutputReader(unittest.TestCase):
+    def test_cancel_stops_silent_process(self):
+        process = subprocess.Popen(
+            [sys.executable, "-c", "import time; time.sleep(30)"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            universal_newlines=True,
+            start_new_session=True,
+        )
+        self.addCleanup(process.kill)
+        job = MagicMock(status="downloading")
+        threading.Timer(0.2, lambda: setattr(job, "status", "cancelled")).start()
+
+        started = time.monotonic()
+        lines = list(iter_process_output(process, job, poll_interval=0.05))
+
+        self.assertEqual(lines, [])
+        self.assertLess(time.monotonic() - started, 10)
+        self.assertIsNotNone(process.poll())
+
+    def test_binary_output_splits_carriage_returns(self):
+        script = (
+            "import sys; "
+            "sys.stdout.buffer.write(b'frame=1 time=00:00:01.00\\r"
+            "frame=2 time=00:00:02.00\\rdone\\n')"
+        )
+        process = subprocess.Popen(
+            [sys.executable, "-c", script],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+        )
+        self.addCleanup(process.wait)
+
+        lines = list(iter_process_output(process, poll_interval=0.05))
+
+        self.assertEqual(
+            lines,
+            [b"frame=1 time=00:00:01.00", b"frame=2 time=00:00:02.00", b"done"],
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -237,6 +237,57 @@ class TestIntegration(unittest.TestCase):
         self.assertEqual(started, job_ids[:2])
         self.assertEqual(self.app.job_queue, job_ids[2:])
 
+    @patch("threading.Thread")
+    def test_raising_limit_starts_queued_jobs(self, mock_thread):
+        """Raising max_concurrent_jobs at runtime drains the queue"""
+        job_ids = [
+            self.app.create_job(
+                f"https://youtube.com/playlist?list=TEST{i}",
+                f"Test Show {i}",
+                "01",
+                "01",
+                playlist_start=None,
+            )
+            for i in range(3)
+        ]
+        self.assertEqual(mock_thread.call_count, 1)
+
+        self.app.set_max_concurrent_jobs(3)
+
+        self.assertEqual(mock_thread.call_count, 3)
+        self.assertEqual(self.app.active_jobs, job_ids)
+        self.assertEqual(self.app.job_queue, [])
+
+    @patch("waitress.serve")
+    def test_web_only_uses_waitress(self, mock_serve):
+        """--web-only serves the Flask app through waitress"""
+        import app as app_module
+
+        self.addCleanup(app_module.ytj.stop_media_refresher)
+        with patch("sys.argv", ["app.py", "--web-only"]):
+            self.assertEqual(app_module.main(), 0)
+
+        mock_serve.assert_called_once()
+        self.assertIs(mock_serve.call_args.args[0], app_module.app)
+        self.assertEqual(
+            mock_serve.call_args.kwargs["threads"],
+            app_module.WEB_THREADS + app_module.MAX_PROGRESS_STREAMS,
+        )
+
+    def test_check_updates_skips_parser(self):
+        """A bare --check-updates runs the check without building the parser"""
+        import app as app_module
+
+        with patch("sys.argv", ["app.py", "--check-updates"]), patch.object(
+            app_module, "_build_parser"
+        ) as mock_parser, patch.object(
+            app_module.ytj, "check_playlist_updates"
+        ) as mock_check:
+            self.assertEqual(app_module.main(), 0)
+
+        mock_check.assert_called_once_with()
+        mock_parser.assert_not_called()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -108,14 +108,74 @@ class TestJellyfinIntegration(unittest.TestCase):
             )
             mock_scan.assert_not_called()
 
+    def test_link_mode_hardlinks_into_library(self):
+        self.app.config["jellyfin_copy_mode"] = "link"
+        episode = self.source_folder / "Test Show S01E01.mp4"
+        episode.write_text("video")
+        with patch.object(self.app, "trigger_jellyfin_scan"):
+            self.app.copy_to_jellyfin("Test Show", "01", "job1")
+        dest = Path(self.jellyfin_dir) / "Test Show" / "Season 01" / episode.name
+        self.assertTrue(os.path.samefile(episode, dest))
+
+    def test_link_failure_falls_back_to_copy(self):
+        src = self.source_folder / "Test Show S01E01.nfo"
+        dest = Path(self.jellyfin_dir) / "copied.nfo"
+        with patch("os.link", side_effect=OSError(18, "cross-device")), patch(
+            "shutil.copy2"
+        ) as mock_copy2:
+            jellyfin_mod._transfer_file(src, dest, "link")
+        mock_copy2.assert_called_once_with(src, dest)
+
+    @unittest.skipUnless(hasattr(os, "copy_file_range"), "needs copy_file_range")
+    def test_reflink_mode_copies_in_kernel(self):
+        src = self.source_folder / "Test Show S01E01.mp4"
+        src.write_bytes(b"x" * 100_000)
+        os.utime(src, (1_000_000, 1_000_000))
+        dest = Path(self.jellyfin_dir) / src.name
+        with patch("shutil.copy2") as mock_copy2:
+            jellyfin_mod._transfer_file(src, dest, "reflink")
+        mock_copy2.assert_not_called()
+        self.assertEqual(dest.read_bytes(), src.read_bytes())
+        self.assertEqual(dest.stat().st_mtime, 1_000_000)
+        self.assertFalse(os.path.samefile(src, dest))
+
+    def test_switching_from_link_mode_keeps_source(self):
+        """Copying over a hardlink left by link mode replaces the link"""
+        src = self.source_folder / "Test Show S01E01.mp4"
+        dest = Path(self.jellyfin_dir) / src.name
+        for mode in ("reflink", "copy"):
+            src.write_bytes(b"x" * 100_000)
+            jellyfin_mod._transfer_file(src, dest, "link")
+            self.assertTrue(os.path.samefile(src, dest))
+
+            jellyfin_mod._transfer_file(src, dest, mode)
+            self.assertEqual(src.read_bytes(), b"x" * 100_000)
+            self.assertEqual(dest.read_bytes(), b"x" * 100_000)
+            self.assertFalse(os.path.samefile(src, dest))
+        self.assertEqual(os.listdir(self.jellyfin_dir), [src.name])
+
+    def test_same_size_different_content_is_recopied(self):
+        src = self.source_folder / "Test Show S01E01.mp4"
+        dest = Path(self.jellyfin_dir) / src.name
+        src.write_bytes(b"new encode")
+        dest.write_bytes(b"old encode")
+        self.assertTrue(jellyfin_mod._copy_if_changed(src, dest, "copy"))
+        self.assertEqual(dest.read_bytes(), b"new encode")
+        self.assertFalse(jellyfin_mod._copy_if_changed(src, dest, "copy"))
+
     def test_trigger_jellyfin_scan(self):
         self.app.config["jellyfin_api_key"] = "token"
-        url = "http://localhost:8096/Library/Refresh?api_key=token"
+        url = "http://localhost:8096/Library/Refresh"
         with patch(
-            "requests.post", return_value=MagicMock(status_code=204)
+            "requests.Session.post", return_value=MagicMock(status_code=204)
         ) as mock_post:
             jellyfin_mod.trigger_jellyfin_scan(self.app, "job1")
-            mock_post.assert_called_once_with(url, timeout=10)
+            jellyfin_mod.trigger_jellyfin_scan(self.app, "job1")
+            mock_post.assert_called_with(
+                url, headers={"X-Emby-Token": "token"}, timeout=10
+            )
+            self.assertEqual(mock_post.call_count, 2)
+            self.assertIsNotNone(self.app._jellyfin_session)
             self.assertTrue(
                 any(
                     "Successfully triggered Jellyfin library scan" in m["text"]
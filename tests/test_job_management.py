@@ -1,4 +1,6 @@
 import os
+import threading
+import time
 import unittest
 import tempfile
 import shutil
@@ -9,6 +11,7 @@ from unittest.mock import patch, MagicMock
 from tubarr.episode_detection import EpisodeMatch
 
 from tubarr.core import YTToJellyfin, DownloadJob
+from tubarr.jobs import MAX_JOB_MESSAGES
 
 
 class TestJobManagement(unittest.TestCase):
@@ -52,7 +55,7 @@ class TestJobManagement(unittest.TestCase):
         self.assertEqual(job.episode_start, "01")
         self.assertEqual(job.status, "queued")
         self.assertEqual(job.progress, 0)
-        self.assertEqual(job.messages, [])
+        self.assertEqual(list(job.messages), [])
 
     def test_job_update(self):
         """Test updating job status and progress"""
@@ -94,6 +97,59 @@ class TestJobManagement(unittest.TestCase):
         self.assertEqual(job_dict["status"], "downloading")
         self.assertEqual(job_dict["progress"], 30)
         self.assertEqual(len(job_dict["messages"]), 1)
+        # Timestamps are stored as epoch floats and formatted on serialization
+        self.assertIsInstance(job.messages[0]["time"], float)
+        stamp = time.localtime(int(job.messages[0]["time"]))
+        self.assertEqual(
+            job_dict["messages"][0]["time"],
+            time.strftime("%Y-%m-%d %H:%M:%S", stamp),
+        )
+        self.assertRegex(
+            job_dict["created_at"], r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}$"
+        )
+
+    def test_job_done_event_set_on_terminal_status(self):
+        """Waiters are released when a job finishes, fails or is cancelled"""
+        for status in ("completed", "failed", "cancelled"):
+            job = DownloadJob("test-id", "url", "show", "01", "01")
+            job.update(status="downloading")
+            self.assertFalse(job.done.is_set())
+            job.update(status=status)
+            self.assertTrue(job.done.wait(0))
+
+    def test_job_messages_are_capped(self):
+        """Only the most recent messages are retained and returned"""
+        job = DownloadJob("test-id", "url", "show", "01", "01")
+        for n in range(MAX_JOB_MESSAGES + 10):
+            job.update(message=f"line {n}")
+
+        self.assertEqual(len(job.messages), MAX_JOB_MESSAGES)
+        self.assertEqual(job.messages[0]["text"], "line 10")
+        recent = job.to_dict(message_limit=2)["messages"]
+        self.assertEqual(
+            [m["text"] for m in recent],
+            [f"line {MAX_JOB_MESSAGES + 8}", f"line {MAX_JOB_MESSAGES + 9}"],
+        )
+
+    def test_job_to_dict_while_messages_arrive(self):
+        """Serializing a job is safe while a worker appends messages"""
+        job = DownloadJob("test-id", "url", "show", "01", "01")
+        stop = threading.Event()
+
+        def writer():
+            n = 0
+            while not stop.is_set():
+                job.update(message=f"line {n}")
+                n += 1
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        try:
+            for _ in range(2000):
+                job.to_dict(message_limit=50)
+        finally:
+            stop.set()
+            thread.join()
 
     @patch.object(YTToJellyfin, "_register_playlist")
     @patch("threading.Thread")
@@ -145,17 +201,41 @@ class TestJobManagement(unittest.TestCase):
         mock_thread.assert_called_once()
         mock_thread.return_value.start.assert_called_once()
 
+    @patch.object(YTToJellyfin, "_register_playlist", return_value=True)
+    @patch("threading.Thread")
+    def test_create_job_lists_playlist_once(self, mock_thread, mock_register):
+        """Queue preview and archive seeding share one yt-dlp listing"""
+        self.app.playlists = {}
+        videos = [{"index": i, "id": f"vid{i}", "title": f"V{i}"} for i in (1, 2, 3)]
+        archive = os.path.join(self.temp_dir, "archive.txt")
+        with patch.object(
+            self.app, "get_playlist_videos", return_value=videos
+        ) as mock_videos, patch.object(
+            self.app, "_get_archive_file", return_value=archive
+        ):
+            job_id = self.app.create_job(
+                "https://youtube.com/playlist?list=TEST",
+                "Test Show",
+                "01",
+                "01",
+                playlist_start=3,
+            )
+
+        mock_videos.assert_called_once()
+        self.assertEqual(self.app.jobs[job_id].remaining_files, ["V3 S01E01"])
+        with open(archive) as f:
+            self.assertEqual(f.read().split(), ["vid1", "vid2"])
+
     def test_job_limit_enforcement(self):
         """Test that completed jobs limit is enforced"""
-        # Create more jobs than the limit
+        # Finish more jobs than the limit; each completion retires the oldest
         for i in range(5):
-            # Create completed jobs
             job_id = f"job-{i}"
             job = DownloadJob(job_id, "url", "show", "01", "01")
             job.update(status="completed")
             self.app.jobs[job_id] = job
+            self.app._on_job_complete(job_id)
 
-        # Add a new job, which should trigger cleanup
         with patch("uuid.uuid4", return_value="new-job"):
             self.app.create_job("url", "show", "01", "01")
 
@@ -201,6 +281,23 @@ class TestJobManagement(unittest.TestCase):
         self.assertIn("mp4", cmd_args)
         self.assertIn("url", cmd_args)
 
+    @patch("subprocess.Popen")
+    def test_download_progress_without_download_prefix(self, mock_popen):
+        """Percentages are picked up from lines other than [download] too"""
+        process_mock = MagicMock()
+        process_mock.stdout = ["[hlsnative] 42.5% of ~10.00MiB", "[info] 1 of 2 items"]
+        process_mock.returncode = 1
+        mock_popen.return_value = process_mock
+
+        job_id = "test-job"
+        job = DownloadJob(job_id, "url", "show", "01", "01")
+        self.app.jobs[job_id] = job
+
+        self.assertFalse(self.app.download_playlist("url", self.temp_dir, "01", job_id))
+        self.assertEqual(job.stage_progress, 42.5)
+        # Item counts are only read from [download] lines
+        self.assertEqual(job.total_files, 0)
+
     @patch("subprocess.Popen")
     def test_download_failure(self, mock_popen):
         """Test handling of download failures"""
@@ -223,23 +320,25 @@ class TestJobManagement(unittest.TestCase):
         self.assertEqual(job.status, "failed")
 
     @patch("os.path.exists")
-    @patch("json.load")
+    @patch("tubarr.media.load_json_file")
     @patch("builtins.open", new_callable=unittest.mock.mock_open)
+    @patch("tubarr.media._write_nfo")
     @patch("os.remove")
-    @patch("os.rename")
+    @patch("os.replace")
     def test_process_metadata(
-        self, mock_rename, mock_remove, mock_open, mock_json_load, mock_exists
+        self,
+        mock_rename,
+        mock_remove,
+        mock_write_nfo,
+        mock_open,
+        mock_json_load,
+        mock_exists,
     ):
         """Test metadata processing"""
         # Setup mocks
-        # Only mp4 and json files should be considered existing
-        mock_exists.side_effect = lambda p: p.endswith(".mp4") or p.endswith(
-            ".info.json"
-        )
+        mock_exists.return_value = False
         mock_json_load.side_effect = [
-            # First JSON file (to get first index)
-            {"playlist_index": 1},
-            # Individual JSON files
+            # Each JSON file is parsed exactly once
             {
                 "title": "Video 1",
                 "description": "Desc 1",
@@ -254,16 +353,17 @@ class TestJobManagement(unittest.TestCase):
             },
         ]
 
-        # Mock Path.glob to return two JSON files
-        with patch("pathlib.Path.glob") as mock_glob:
-            mock_glob.return_value = [
-                MagicMock(
-                    __str__=lambda self: f"{self.temp_dir}/Test Show S01E01.info.json"
-                ),
-                MagicMock(
-                    __str__=lambda self: f"{self.temp_dir}/Test Show S01E02.info.json"
-                ),
-            ]
+        # Mock the directory scan to return two JSON files and their videos
+        json_files = [
+            Path(self.temp_dir, "Test Show S01E01.info.json"),
+            Path(self.temp_dir, "Test Show S01E02.info.json"),
+        ]
+        videos = [
+            Path(self.temp_dir, "Test Show S01E01.mp4"),
+            Path(self.temp_dir, "Test Show S01E02.mp4"),
+        ]
+        scan = {"info.json": json_files, "mp4": videos}
+        with patch("tubarr.media._scan_season", return_value=scan):
 
             # Create a job
             job_id = "test-job"
@@ -280,9 +380,9 @@ class TestJobManagement(unittest.TestCase):
             )  # Should be 100% after processing two files
 
             # Verify files were processed
-            self.assertEqual(
-                mock_open.call_count, 6
-            )  # 3 reads + 2 NFO writes + 1 tracker save
+            self.assertEqual(mock_json_load.call_count, 2)  # One parse per file
+            self.assertEqual(mock_write_nfo.call_count, 2)  # One NFO per episode
+            self.assertEqual(mock_open.call_count, 1)  # Tracker save
             self.assertEqual(mock_remove.call_count, 2)  # Remove two JSON files
             self.assertEqual(mock_rename.call_count, 2)  # Rename two video files
 
@@ -446,11 +546,8 @@ class TestJobManagement(unittest.TestCase):
         }
         self.app.config["ytdlp_path"] = "yt-dlp"
 
-        # yt-dlp returns a playlist with one old id and one new id
-        mock_run.return_value = MagicMock(
-            stdout=json.dumps({"entries": [{"id": "oldid"}, {"id": "newid"}]}),
-            returncode=0,
-        )
+        # yt-dlp prints one old id and one new id
+        mock_run.return_value = MagicMock(stdout="oldid\nnewid\n", returncode=0)
 
         with patch.object(self.app, "create_job", return_value="job-1") as mock_create:
             jobs = self.app.check_playlist_updates()
@@ -474,15 +571,38 @@ class TestJobManagement(unittest.TestCase):
                 "archive": archive,
             }
         }
-        mock_run.return_value = MagicMock(
-            stdout=json.dumps({"entries": [{"id": "id1"}]}), returncode=0
-        )
+        mock_run.return_value = MagicMock(stdout="id1\n", returncode=0)
 
         with patch.object(self.app, "create_job") as mock_create:
             jobs = self.app.check_playlist_updates()
             mock_create.assert_not_called()
             self.assertEqual(jobs, [])
 
+    @patch("subprocess.run")
+    def test_check_playlist_updates_lists_playlists_concurrently(self, mock_run):
+        """Each playlist is listed on its own worker; jobs keep playlist order."""
+        self.app.playlists = {}
+        for pid in ("A", "B", "C"):
+            self.app.playlists[pid] = {
+                "url": f"https://youtube.com/playlist?list={pid}",
+                "show_name": f"Show {pid}",
+                "season_num": "01",
+                "archive": os.path.join(self.temp_dir, f"{pid}.txt"),
+            }
+        barrier = threading.Barrier(3, timeout=5)
+
+        def fake_run(cmd, **kwargs):
+            barrier.wait()
+            return MagicMock(stdout=f"{cmd[-1][-1]}1\n", returncode=0)
+
+        mock_run.side_effect = fake_run
+        with patch.object(self.app, "create_job", side_effect=["j1", "j2", "j3"]) as mc:
+            jobs = self.app.check_playlist_updates()
+        self.assertEqual(jobs, ["j1", "j2", "j3"])
+        self.assertEqual(
+            [c.args[1] for c in mc.call_args_list], ["Show A", "Show B", "Show C"]
+        )
+
     @patch("subprocess.run")
     def test_check_playlist_updates_respects_start_index(self, mock_run):
         archive = os.path.join(self.temp_dir, "PID.txt")
@@ -501,12 +621,7 @@ class TestJobManagement(unittest.TestCase):
         }
         self.app.config["ytdlp_path"] = "yt-dlp"
 
-        mock_run.return_value = MagicMock(
-            stdout=json.dumps(
-                {"entries": [{"id": "id1"}, {"id": "id2"}, {"id": "id3"}]}
-            ),
-            returncode=0,
-        )
+        mock_run.return_value = MagicMock(stdout="id1\nid2\nid3\n", returncode=0)
 
         with patch.object(self.app, "create_job", return_value="job-42") as mock_create:
             jobs = self.app.check_playlist_updates()
@@ -2,10 +2,12 @@ import os
 import unittest
 import tempfile
 import shutil
-from unittest.mock import patch, MagicMock, mock_open, call
+import subprocess
+from unittest.mock import patch, MagicMock
 from pathlib import Path
 
-from tubarr.core import YTToJellyfin
+from tubarr import media
+from tubarr.core import YTToJellyfin, DownloadJob
 
 
 class TestMediaProcessing(unittest.TestCase):
@@ -39,6 +41,7 @@ class TestMediaProcessing(unittest.TestCase):
         self.job_id = "job1"
         self.job = MagicMock()
         self.app.jobs[self.job_id] = self.job
+        media._probe_video_cached.cache_clear()
 
     def tearDown(self):
         shutil.rmtree(self.temp_dir, ignore_errors=True)
@@ -61,57 +64,77 @@ class TestMediaProcessing(unittest.TestCase):
             "  <studio>YouTube</studio>\n"
             "</tvshow>\n"
         )
-        m1 = mock_open()
-        m2 = mock_open()
-        with patch(
-            "builtins.open", side_effect=[m1.return_value, m2.return_value]
-        ) as m_open:
-            self.app.create_nfo_files(folder, "Test Show", "01", self.job_id)
-
-        m_open.assert_has_calls(
-            [
-                call(f"{folder}/season.nfo", "w"),
-                call(f"{show_folder}/tvshow.nfo", "w"),
-            ]
-        )
-        m1.return_value.write.assert_called_once_with(season_nfo)
-        m2.return_value.write.assert_called_once_with(tvshow_nfo)
+        os.makedirs(folder)
+        self.app.create_nfo_files(folder, "Test Show", "01", self.job_id)
+
+        with open(f"{folder}/season.nfo", encoding="utf-8") as f:
+            self.assertEqual(f.read(), season_nfo)
+        with open(f"{show_folder}/tvshow.nfo", encoding="utf-8") as f:
+            self.assertEqual(f.read(), tvshow_nfo)
         self.job.update.assert_any_call(
             status="creating_nfo", message="Creating NFO files"
         )
         self.job.update.assert_any_call(progress=100, message="Created NFO files")
 
+    def test_nfo_files_escape_xml_characters(self):
+        folder = os.path.join(self.temp_dir, "Tom & Jerry", "Season 01")
+        os.makedirs(folder)
+        self.app.create_nfo_files(folder, "Tom & Jerry <Classic>", "01", self.job_id)
+
+        with open(os.path.join(os.path.dirname(folder), "tvshow.nfo")) as f:
+            tvshow_nfo = f.read()
+        self.assertIn("<title>Tom &amp; Jerry &lt;Classic&gt;</title>", tvshow_nfo)
+
+    def test_nfo_written_as_utf8(self):
+        folder = os.path.join(self.temp_dir, "Pokémon", "Season 01")
+        os.makedirs(folder)
+        self.app.create_nfo_files(folder, "Pokémon", "01", self.job_id)
+
+        with open(os.path.join(os.path.dirname(folder), "tvshow.nfo"), "rb") as f:
+            self.assertIn("<title>Pokémon</title>".encode("utf-8"), f.read())
+
     @patch("subprocess.Popen")
     @patch("subprocess.run")
     def test_generate_artwork_invokes_tools(self, mock_run, mock_popen):
         folder = os.path.join(self.temp_dir, "Test Show", "Season 01")
-        episodes = [Path(f"{folder}/Test_Show_S01E01.mp4")]
-        season_frames_dir = os.path.join(self.app.temp_dir, "season_frames")
-
-        def glob_side_effect(self, pattern):
-            p = str(self)
-            if p == folder and pattern == "*S01E*.mp4":
-                return episodes
-            if p == season_frames_dir and pattern == "*.jpg":
-                return [Path(os.path.join(season_frames_dir, "frame_000.jpg"))]
-            return []
+        episodes = [Path(f"{folder}/Test_Show_S01E0{n}.mp4") for n in (1, 2)]
 
+        p0 = MagicMock()
+        p0.wait.return_value = 0
         p1 = MagicMock()
-        p1.stdout = MagicMock()
+        p1.wait.return_value = 0
         p2 = MagicMock()
-        mock_popen.side_effect = [p1, p2]
+        p2.returncode = 0
+        mock_popen.side_effect = [p0, p1, p2]
         mock_run.return_value = MagicMock()
 
-        with patch("pathlib.Path.glob", new=glob_side_effect), patch("os.makedirs"):
+        with patch("tubarr.media._scan_season", return_value={"mp4": episodes}):
             self.app.generate_artwork(folder, "Test Show", "01", self.job_id)
 
-        self.assertEqual(mock_popen.call_count, 2)
-        self.assertEqual(mock_popen.call_args_list[0].args[0][0], "montage")
-        self.assertEqual(mock_popen.call_args_list[1].args[0][0], "convert")
+        self.assertEqual(mock_popen.call_count, 3)
+        frames_cmd = mock_popen.call_args_list[0].args[0]
+        self.assertEqual(frames_cmd[0], "ffmpeg")
+        self.assertEqual(frames_cmd.count("-i"), 2)
+        # Frame grabs only decode, so ffmpeg may use a hardware decoder
+        self.assertEqual(frames_cmd.count("-hwaccel"), 2)
+        self.assertIn("image2pipe", frames_cmd)
+        self.assertEqual(frames_cmd[-1], "pipe:1")
+        self.assertEqual(mock_popen.call_args_list[1].args[0][0], "montage")
+        self.assertIn("ppm:-", mock_popen.call_args_list[1].args[0])
+        self.assertIs(mock_popen.call_args_list[1].kwargs["stdin"], p0.stdout)
+        convert_cmd = mock_popen.call_args_list[2].args[0]
+        self.assertEqual(convert_cmd[0], "convert")
+        self.assertIs(mock_popen.call_args_list[2].kwargs["stdin"], p1.stdout)
+        # Poster and landscape season images come from one convert run
+        self.assertEqual(
+            convert_cmd[convert_cmd.index("-write") + 1],
+            f"{folder}/season01-poster.jpg",
+        )
+        self.assertEqual(convert_cmd[-1], f"{folder}/season01.jpg")
         ffmpeg_calls = [c for c in mock_run.call_args_list if c.args[0][0] == "ffmpeg"]
         self.assertTrue(ffmpeg_calls)
         expected_filter = "select=not(mod(n\\,1000)),scale=640:360"
-        self.assertIn(expected_filter, ffmpeg_calls[0].args[0])
+        self.assertTrue(any(expected_filter in c.args[0] for c in ffmpeg_calls))
         self.job.update.assert_any_call(
             status="generating_artwork", message="Generating thumbnails and artwork"
         )
@@ -119,27 +142,298 @@ class TestMediaProcessing(unittest.TestCase):
 
     @patch("subprocess.Popen")
     @patch("subprocess.run")
-    def test_generate_artwork_handles_no_episodes(self, mock_run, mock_popen):
+    def test_generate_artwork_reports_montage_failure(self, mock_run, mock_popen):
         folder = os.path.join(self.temp_dir, "Test Show", "Season 01")
-        season_frames_dir = os.path.join(self.app.temp_dir, "season_frames")
+        episodes = [Path(f"{folder}/Test_Show_S01E0{n}.mp4") for n in (1, 2)]
 
-        def glob_side_effect(self, pattern):
-            p = str(self)
-            if p == folder and pattern == "*S01E*.mp4":
-                return []
-            if p == season_frames_dir and pattern == "*.jpg":
-                return []
-            return []
+        p0 = MagicMock()
+        p0.wait.return_value = 0
+        p1 = MagicMock()
+        p1.wait.return_value = 1
+        p1.returncode = 1
+        p2 = MagicMock()
+        p2.returncode = 0
+        mock_popen.side_effect = [p0, p1, p2]
+        mock_run.return_value = MagicMock()
 
-        with patch("pathlib.Path.glob", new=glob_side_effect), patch("os.makedirs"):
+        with patch(
+            "tubarr.media._scan_season", return_value={"mp4": episodes}
+        ), patch("tubarr.media.log_job") as mock_log:
             self.app.generate_artwork(folder, "Test Show", "01", self.job_id)
 
+        errors = [c.args[2] for c in mock_log.call_args_list if c.args[1] >= 40]
+        self.assertTrue(any("montage" in e for e in errors))
+        self.assertNotIn(
+            ((), {"progress": 100, "message": "Created season artwork"}),
+            [(c.args, c.kwargs) for c in self.job.update.call_args_list],
+        )
+
+    @patch("subprocess.Popen")
+    @patch("subprocess.run")
+    def test_generate_artwork_handles_no_episodes(self, mock_run, mock_popen):
+        folder = os.path.join(self.temp_dir, "Test Show", "Season 01")
+
+        self.assertFalse(os.path.exists(folder))
+        self.app.generate_artwork(folder, "Test Show", "01", self.job_id)
+
         mock_run.assert_not_called()
         mock_popen.assert_not_called()
         self.job.update.assert_any_call(
             message="No episodes found for artwork generation"
         )
 
+    @patch("subprocess.Popen")
+    @patch("subprocess.run")
+    def test_convert_video_files_runs_encodes_in_parallel(self, mock_run, mock_popen):
+        folder = os.path.join(self.temp_dir, "Test Show", "Season 01")
+        os.makedirs(folder)
+        for n in (1, 2):
+            Path(folder, f"Test Show - S01E0{n}.webm").write_text("raw")
+        self.app.config.update(
+            use_h265=True, parallel_encodes=2, ffmpeg_threads=3, hwaccel="none"
+        )
+        job = DownloadJob("conv", "url", "Test Show", "01", "01")
+        self.app.jobs["conv"] = job
+
+        def fake_popen(cmd, **kwargs):
+            Path(cmd[-1]).write_text("encoded")
+            proc = MagicMock()
+            proc.stdout = []
+            proc.returncode = 0
+            return proc
+
+        mock_popen.side_effect = fake_popen
+        mock_run.return_value = MagicMock(
+            stdout='{"streams": [{"codec_name": "vp9"}], '
+            '"format": {"duration": "60.0"}}'
+        )
+        self.app.convert_video_files(folder, "01", "conv")
+
+        # One ffprobe per file covers both the codec check and the duration
+        self.assertEqual(mock_run.call_count, 2)
+        self.assertEqual(mock_popen.call_count, 2)
+        for c in mock_popen.call_args_list:
+            self.assertIn("-x265-params", c.args[0])
+            self.assertIn("pipe:1", c.args[0])
+            self.assertIn("+faststart", c.args[0])
+            cmd = c.args[0]
+            self.assertEqual(cmd[cmd.index("-threads") + 1], "3")
+        self.assertEqual(
+            sorted(os.listdir(folder)),
+            ["Test Show - S01E01.mp4", "Test Show - S01E02.mp4"],
+        )
+        self.assertEqual(job.processed_files, 2)
+        self.assertEqual(job.progress, 100)
+
+    @patch("subprocess.run")
+    def test_probe_cached_until_file_changes(self, mock_run):
+        video = Path(self.temp_dir, "clip.webm")
+        video.write_text("raw")
+        mock_run.return_value = MagicMock(
+            stdout='{"streams": [{"codec_name": "vp9", "pix_fmt": "yuv420p"}], '
+            '"format": {"duration": "12.5"}}'
+        )
+        self.assertEqual(media._probe_video(video), ("vp9", 12.5, "yuv420p"))
+        media._probe_video(video)
+        self.assertEqual(mock_run.call_count, 1)
+        video.write_text("re-encoded")
+        media._probe_video(video)
+        self.assertEqual(mock_run.call_count, 2)
+
+    @patch("subprocess.Popen")
+    @patch("subprocess.run")
+    def test_conversion_progress_reported_once_per_percent(self, mock_run, mock_popen):
+        video = Path(self.temp_dir, "Show S01E01.webm")
+        video.write_text("raw")
+        mock_run.return_value = MagicMock(
+            stdout='{"streams": [{"codec_name": "vp9"}], '
+            '"format": {"duration": "100.0"}}'
+        )
+        proc = MagicMock()
+        proc.stdout = [b"out_time_us=1000000"] * 3 + [b"out_time_us=2000000"]
+        proc.returncode = 1
+        mock_popen.return_value = proc
+        media._convert_one(
+            self.app, self.job_id, video, 0, 1, 28, "libx265", None, lambda i, p: p
+        )
+        reported = [
+            c.kwargs["stage_progress"]
+            for c in self.job.update.call_args_list
+            if "stage_progress" in c.kwargs
+        ]
+        self.assertEqual(reported, [1, 2])
+
+    def test_ffmpeg_progress_lines_parsed_without_regex(self):
+        self.assertEqual(media._ffmpeg_progress_seconds(b"out_time_us=1500000"), 1.5)
+        self.assertIsNone(media._ffmpeg_progress_seconds(b"out_time_us=N/A"))
+        self.assertIsNone(media._ffmpeg_progress_seconds(b"frame=42"))
+        self.assertIsNone(media._ffmpeg_progress_seconds(b"progress=end"))
+
+    def test_scan_season_buckets_by_extension(self):
+        folder = os.path.join(self.temp_dir, "scan")
+        os.makedirs(folder)
+        for name in (
+            "Show S01E01.mp4",
+            "Show S01E01.info.json",
+            "Show S01E02.webm",
+            "Show S02E01.mp4",
+            "poster.jpg",
+        ):
+            Path(folder, name).touch()
+
+        season = media._scan_season(folder, "01")
+        self.assertEqual(sorted(season), ["info.json", "mp4", "webm"])
+        self.assertEqual([p.name for p in season["mp4"]], ["Show S01E01.mp4"])
+        everything = media._scan_season(folder)
+        self.assertEqual(len(everything["mp4"]), 2)
+        self.assertIn("jpg", everything)
+        self.assertEqual(media._scan_season(os.path.join(folder, "missing")), {})
+
+    @patch("subprocess.run")
+    def test_thumbnails_extracted_in_one_ffmpeg_run(self, mock_run):
+        folder = os.path.join(self.temp_dir, "thumbs")
+        os.makedirs(folder)
+        thumbnails = [
+            (Path(folder, f"Show S01E0{n}.mp4"), os.path.join(folder, f"t{n}.jpg"))
+            for n in (1, 2, 3)
+        ]
+
+        def fake_run(cmd, **kwargs):
+            for _, thumb in thumbnails[:2]:
+                Path(thumb).touch()
+            return MagicMock(returncode=0)
+
+        mock_run.side_effect = fake_run
+        results = media._extract_thumbnails(thumbnails)
+
+        mock_run.assert_called_once()
+        cmd = mock_run.call_args.args[0]
+        self.assertEqual(cmd.count("-i"), 3)
+        self.assertEqual(cmd.count("-map"), 3)
+        self.assertEqual(results, [True, True, False])
+
+    @patch("subprocess.run")
+    def test_failed_thumbnail_batch_retries_each_video(self, mock_run):
+        thumbnails = [
+            (Path(self.temp_dir, "bad.mp4"), os.path.join(self.temp_dir, "b.jpg")),
+            (Path(self.temp_dir, "good.mp4"), os.path.join(self.temp_dir, "g.jpg")),
+        ]
+
+        def fake_run(cmd, **kwargs):
+            if "bad" in " ".join(cmd):
+                raise subprocess.CalledProcessError(1, cmd)
+            Path(cmd[-1]).touch()
+            return MagicMock(returncode=0)
+
+        mock_run.side_effect = fake_run
+        self.assertEqual(media._extract_thumbnails(thumbnails), [False, True])
+        self.assertEqual(mock_run.call_count, 3)
+
+    def test_frame_decode_follows_hwaccel_setting(self):
+        self.app.config["hwaccel"] = "auto"
+        self.assertEqual(media._frame_decode_args(self.app), ["-hwaccel", "auto"])
+        self.app.config["hwaccel"] = "none"
+        self.assertEqual(media._frame_decode_args(self.app), [])
+
+    @patch("subprocess.run")
+    def test_thumbnail_batches_run_concurrently_in_order(self, mock_run):
+        thumbnails = [
+            (Path(self.temp_dir, f"e{n}.mp4"), os.path.join(self.temp_dir, f"{n}.jpg"))
+            for n in range(media._THUMBNAIL_BATCH + 2)
+        ]
+
+        def fake_run(cmd, **kwargs):
+            outputs = [arg for arg in cmd if arg.endswith(".jpg")]
+            for thumb in outputs[:-1]:
+                Path(thumb).touch()
+            return MagicMock(returncode=0)
+
+        mock_run.side_effect = fake_run
+        results = media._extract_thumbnails(thumbnails)
+
+        self.assertEqual(mock_run.call_count, 2)
+        expected = [True] * (media._THUMBNAIL_BATCH - 1) + [False, True, False]
+        self.assertEqual(results, expected)
+
+
+class TestHevcEncoderSelection(unittest.TestCase):
+    def setUp(self):
+        media._select_hevc_encoder.cache_clear()
+        media._cuda_decode_available.cache_clear()
+        self.addCleanup(media._select_hevc_encoder.cache_clear)
+        self.addCleanup(media._cuda_decode_available.cache_clear)
+
+    def test_none_skips_detection(self):
+        with patch("subprocess.run") as mock_run:
+            self.assertEqual(media._select_hevc_encoder("none"), "libx265")
+        mock_run.assert_not_called()
+
+    def test_auto_picks_first_working_encoder(self):
+        def fake_run(cmd, **kwargs):
+            encoder = cmd[cmd.index("-c:v") + 1]
+            return MagicMock(returncode=0 if encoder == "hevc_qsv" else 1)
+
+        with patch("subprocess.run", side_effect=fake_run) as mock_run:
+            self.assertEqual(media._select_hevc_encoder("auto"), "hevc_qsv")
+            self.assertEqual(media._select_hevc_encoder("auto"), "hevc_qsv")
+        # nvenc then qsv probed once, second lookup served from the cache
+        self.assertEqual(mock_run.call_count, 2)
+
+    def test_hardware_encoders_use_their_quality_knob(self):
+        _, args = media._hevc_encode_args("hevc_nvenc", 24)
+        self.assertNotIn("-crf", args)
+        self.assertEqual(args[args.index("-cq") + 1], "24")
+        self.assertEqual(args[args.index("-tune") + 1], "hq")
+        # Without -b:v 0 NVENC caps the bitrate and -cq is not honoured
+        self.assertEqual(args[args.index("-b:v") + 1], "0")
+        pre, args = media._hevc_encode_args("hevc_vaapi", 24)
+        self.assertEqual(pre, ["-vaapi_device", "/dev/dri/renderD128"])
+        self.assertIn("format=nv12,hwupload", args)
+        _, args = media._hevc_encode_args("hevc_videotoolbox", 28)
+        self.assertEqual(args[args.index("-q:v") + 1], "45")
+
+    def test_nvenc_decodes_on_gpu_when_cuda_listed(self):
+        hwaccels = MagicMock(stdout="Hardware acceleration methods:\ncuda\nvaapi\n")
+        with patch("subprocess.run", return_value=hwaccels) as mock_run:
+            self.assertEqual(
+                media._hevc_decode_args("hevc_nvenc"),
+                ["-hwaccel", "cuda", "-hwaccel_output_format", "cuda"],
+            )
+            self.assertEqual(media._hevc_decode_args("libx265"), [])
+            media._hevc_decode_args("hevc_nvenc")
+        mock_run.assert_called_once()
+
+    def test_output_pinned_to_420_with_10bit_kept(self):
+        self.assertEqual(
+            media._pix_fmt_args("libx265", "yuv444p", []), ["-pix_fmt", "yuv420p"]
+        )
+        self.assertEqual(
+            media._pix_fmt_args("libx265", "yuv420p10le", []),
+            ["-pix_fmt", "yuv420p10le"],
+        )
+        self.assertEqual(
+            media._pix_fmt_args("hevc_qsv", "rgb24", []), ["-pix_fmt", "nv12"]
+        )
+        self.assertEqual(
+            media._pix_fmt_args("hevc_qsv", "p010le", []), ["-pix_fmt", "p010le"]
+        )
+        # 8-bit formats whose names merely contain "10" or "12"
+        self.assertEqual(
+            media._pix_fmt_args("hevc_qsv", "nv12", []), ["-pix_fmt", "nv12"]
+        )
+        self.assertEqual(
+            media._pix_fmt_args("libx265", "yuv410p", []), ["-pix_fmt", "yuv420p"]
+        )
+        # NVDEC frames stay on the GPU and VAAPI converts in its own filter
+        cuda = ["-hwaccel", "cuda"]
+        self.assertEqual(media._pix_fmt_args("hevc_nvenc", "yuv420p", cuda), [])
+        self.assertEqual(media._pix_fmt_args("hevc_vaapi", "yuv420p", []), [])
+
+    def test_libx265_uses_configured_preset_and_tuning(self):
+        _, args = media._hevc_encode_args("libx265", 24, "pools=2", "faster")
+        self.assertEqual(args[args.index("-preset") + 1], "faster")
+        self.assertEqual(args[args.index("-x265-params") + 1], "aq-mode=3:pools=2")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -7,6 +7,7 @@ from unittest.mock import patch, MagicMock
 from pathlib import Path
 
 from tubarr.core import YTToJellyfin, DownloadJob
+from tubarr.playlist import _read_archive_ids
 
 
 class TestPlaylistOperations(unittest.TestCase):
@@ -73,8 +74,20 @@ class TestPlaylistOperations(unittest.TestCase):
         folder = self.app.create_folder_structure("Show2", "01")
         Path(folder, "Show2 S01E01.mp4").touch()
         Path(folder, "Show2 S01E03.mp4").touch()
+        Path(folder, "Show2 S01E12.info.json").touch()
         max_idx = self.app._get_existing_max_index(folder, "01")
         self.assertEqual(max_idx, 3)
+        missing = os.path.join(folder, "missing")
+        self.assertEqual(self.app._get_existing_max_index(missing, "01"), 0)
+
+    def test_read_archive_ids_handles_both_line_formats(self):
+        archive = os.path.join(self.temp_dir, "archive.txt")
+        with open(archive, "w") as f:
+            f.write("youtube abc123\n\nplain456\n")
+        ids = _read_archive_ids(archive)
+        self.assertIn("abc123", ids)
+        self.assertIn("plain456", ids)
+        self.assertEqual(_read_archive_ids(archive + ".missing"), frozenset())
 
     def test_disable_and_remove_playlist(self):
         url = "https://youtube.com/playlist?list=XYZ"
@@ -1,7 +1,8 @@
 import os
+import copy
+import json
 import logging
-import os
-from typing import Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 import yaml
 from pydantic import BaseModel, Field, ValidationError, validator
@@ -16,12 +17,22 @@ if not logging.getLogger().handlers:
 logger = logging.getLogger("yt-to-jellyfin")
 logger.setLevel(logging.INFO)
 
+# Prefer the libyaml C loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Parsed config files keyed by (path, st_mtime_ns, st_size)
+_YAML_CACHE: Dict[Tuple[str, int, int], Any] = {}
+
 
 class ConfigModel(BaseModel):
     output_dir: str = Field(..., min_length=1)
     quality: int = Field(..., gt=0)
     use_h265: bool = True
     crf: int = Field(..., ge=0, le=51)
+    parallel_encodes: int = Field(0, ge=0)
+    ffmpeg_threads: int = Field(0, ge=0)
+    hwaccel: str = "auto"
+    x265_preset: str = "faster"
     ytdlp_path: str = Field(..., min_length=1)
     cookies: str = ""
     completed_jobs_limit: int = Field(..., ge=1)
@@ -38,6 +49,7 @@ class ConfigModel(BaseModel):
     jellyfin_host: str = ""
     jellyfin_port: int = Field(8096, ge=1, le=65535)
     jellyfin_api_key: str = ""
+    jellyfin_copy_mode: str = "copy"
     tmdb_api_key: str = ""
     tvdb_api_key: str = ""
     tvdb_pin: str = ""
@@ -61,16 +73,84 @@ class ConfigModel(BaseModel):
         return v
 
 
+def _json_cache_path(config_file: str) -> str:
+    """Return the path of the parsed-JSON sidecar kept next to ``config_file``."""
+    directory, name = os.path.split(config_file)
+    return os.path.join(directory, f".{name}.jsoncache")
+
+
+def _read_json_cache(config_file: str, st: os.stat_result) -> Any:
+    """Return the sidecar's data if it matches ``st``, else ``None``."""
+    try:
+        with open(_json_cache_path(config_file), "r") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (
+        not isinstance(cached, dict)
+        or cached.get("mtime") != st.st_mtime_ns
+        or cached.get("size") != st.st_size
+    ):
+        return None
+    return cached.get("data")
+
+
+def _write_json_cache(config_file: str, st: os.stat_result, data: Any) -> None:
+    """Store parsed config as JSON so later processes can skip PyYAML."""
+    cache_file = _json_cache_path(config_file)
+    tmp_file = f"{cache_file}.tmp"
+    try:
+        with open(tmp_file, "w") as f:
+            json.dump({"mtime": st.st_mtime_ns, "size": st.st_size, "data": data}, f)
+        os.replace(tmp_file, cache_file)
+    except (OSError, TypeError, ValueError) as e:
+        logger.debug(f"Not caching parsed config {config_file}: {e}")
+
+
+def _read_config_file(config_file: str) -> Any:
+    """Parse a YAML config file, reusing the result while it is unchanged.
+
+    Parsed files are kept in memory and in a JSON sidecar keyed by the YAML
+    file's mtime and size, so a fresh process only runs PyYAML after an edit.
+    """
+    try:
+        st = os.stat(config_file)
+        key = (os.path.abspath(config_file), st.st_mtime_ns, st.st_size)
+    except OSError:
+        st = key = None
+    if key is not None and key in _YAML_CACHE:
+        return copy.deepcopy(_YAML_CACHE[key])
+    data = _read_json_cache(config_file, st) if st is not None else None
+    if data is None:
+        with open(config_file, "r") as f:
+            data = yaml.load(f, Loader=_YAML_LOADER)
+        if st is not None and data is not None:
+            _write_json_cache(config_file, st, data)
+    if key is not None:
+        for stale in [k for k in _YAML_CACHE if k[0] == key[0]]:
+            del _YAML_CACHE[stale]
+        _YAML_CACHE[key] = data
+    return copy.deepcopy(data)
+
+
+def _is_exec(path: str) -> bool:
+    """Return ``True`` if ``path`` exists with an execute bit, using one stat."""
+    try:
+        return bool(os.stat(path).st_mode & 0o111)
+    except OSError:
+        return False
+
+
 def _load_config() -> Dict:
     """Load configuration from environment variables or config file."""
     # Check for a local yt-dlp in the same directory as this file
     script_dir = os.path.dirname(os.path.abspath(__file__))
     local_ytdlp = os.path.join(script_dir, "yt-dlp")
-    if os.path.exists(local_ytdlp) and os.access(local_ytdlp, os.X_OK):
+    if _is_exec(local_ytdlp):
         ytdlp_default = local_ytdlp
     else:
         for path in ["/usr/local/bin/yt-dlp", "/usr/bin/yt-dlp"]:
-            if os.path.exists(path) and os.access(path, os.X_OK):
+            if _is_exec(path):
                 ytdlp_default = path
                 break
         else:
@@ -81,6 +161,10 @@ def _load_config() -> Dict:
         "quality": os.environ.get("VIDEO_QUALITY", "1080"),
         "use_h265": os.environ.get("USE_H265", "true").lower() == "true",
         "crf": int(os.environ.get("CRF", "28")),
+        "parallel_encodes": int(os.environ.get("PARALLEL_ENCODES", "0")),
+        "ffmpeg_threads": int(os.environ.get("FFMPEG_THREADS", "0")),
+        "hwaccel": os.environ.get("HWACCEL", "auto"),
+        "x265_preset": os.environ.get("X265_PRESET", "faster"),
         "ytdlp_path": os.environ.get("YTDLP_PATH", ytdlp_default),
         "cookies": "",
         "completed_jobs_limit": int(os.environ.get("COMPLETED_JOBS_LIMIT", "10")),
@@ -100,6 +184,7 @@ def _load_config() -> Dict:
         "jellyfin_host": os.environ.get("JELLYFIN_HOST", ""),
         "jellyfin_port": os.environ.get("JELLYFIN_PORT", "8096"),
         "jellyfin_api_key": os.environ.get("JELLYFIN_API_KEY", ""),
+        "jellyfin_copy_mode": os.environ.get("JELLYFIN_COPY_MODE", "copy"),
         "tmdb_api_key": os.environ.get("TMDB_API_KEY", ""),
         "imdb_enabled": os.environ.get("IMDB_ENABLED", "false").lower()
         == "true",
@@ -136,8 +221,7 @@ def _load_config() -> Dict:
     config_file = os.environ.get("CONFIG_FILE", "config/config.yml")
     if os.path.exists(config_file):
         try:
-            with open(config_file, "r") as f:
-                file_config = yaml.safe_load(f)
+            file_config = _read_config_file(config_file)
             if file_config and isinstance(file_config, dict):
                 if "media" in file_config and isinstance(file_config["media"], dict):
                     for key, value in file_config["media"].items():
@@ -149,6 +233,14 @@ def _load_config() -> Dict:
                             config["use_h265"] = value
                         elif key == "crf":
                             config["crf"] = int(value)
+                        elif key == "parallel_encodes":
+                            config["parallel_encodes"] = int(value)
+                        elif key == "ffmpeg_threads":
+                            config["ffmpeg_threads"] = int(value)
+                        elif key == "hwaccel":
+                            config["hwaccel"] = str(value)
+                        elif key == "x265_preset":
+                            config["x265_preset"] = str(value)
                         elif key == "clean_filenames":
                             config["clean_filenames"] = value
 
@@ -203,6 +295,8 @@ def _load_config() -> Dict:
                             config["jellyfin_port"] = str(value)
                         elif key == "api_key":
                             config["jellyfin_api_key"] = value
+                        elif key == "copy_mode":
+                            config["jellyfin_copy_mode"] = str(value)
 
                 if "blackhole" in file_config and isinstance(
                     file_config["blackhole"], dict
@@ -307,6 +401,10 @@ def _save_config(config: Dict) -> None:
             "quality": int(config.get("quality", 1080)),
             "use_h265": config.get("use_h265", True),
             "crf": int(config.get("crf", 28)),
+            "parallel_encodes": int(config.get("parallel_encodes", 0)),
+            "ffmpeg_threads": int(config.get("ffmpeg_threads", 0)),
+            "hwaccel": config.get("hwaccel", "auto"),
+            "x265_preset": config.get("x265_preset", "faster"),
             "clean_filenames": config.get("clean_filenames", True),
         },
         "cookies_path": config.get("cookies_path", "./config/cookies.txt"),
@@ -330,6 +428,7 @@ def _save_config(config: Dict) -> None:
             "host": config.get("jellyfin_host", "localhost"),
             "port": int(config.get("jellyfin_port", 8096)),
             "api_key": config.get("jellyfin_api_key", ""),
+            "copy_mode": config.get("jellyfin_copy_mode", "copy"),
         },
         "tmdb": {
             "api_key": config.get("tmdb_api_key", ""),
@@ -354,6 +453,7 @@ def _save_config(config: Dict) -> None:
         "defaults": config.get("defaults", {}),
     }
 
+    _YAML_CACHE.clear()
     try:
         with open(config_file, "w") as f:
             yaml.safe_dump(yaml_config, f, default_flow_style=False, sort_keys=False)
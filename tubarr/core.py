@@ -3,12 +3,13 @@
 import os
 import tempfile
 import threading
-import time
 import shutil
 import uuid
 import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Deque, Dict, List, Optional
 from pathlib import Path as PathType
 
 from .config import _load_config, logger
@@ -53,6 +54,8 @@ from .media import (
     generate_movie_artwork,
     create_nfo_files,
     list_media,
+    start_media_refresher,
+    stop_media_refresher,
     list_movies,
     get_playlist_videos,
     get_music_playlist_details,
@@ -109,12 +112,23 @@ class YTToJellyfin:
         self.job_lock = threading.Lock()
         self.job_queue: List[str] = []
         self.active_jobs: List[str] = []
+        # Completed/failed job ids, oldest first, pruned to completed_jobs_limit
+        self.finished_jobs: Deque[str] = deque()
+        # (tree key, listing) for list_media; see media._media_tree_key
+        self._media_cache: tuple = (None, [])
+        self._media_cache_lock = threading.Lock()
+        self._stat_pool: Optional[ThreadPoolExecutor] = None
+        self._show_pool: Optional[ThreadPoolExecutor] = None
+        self._jellyfin_session = None
+        self.media_refresh_thread: Optional[threading.Thread] = None
+        self.media_refresh_stop_event: Optional[threading.Event] = None
         self.playlists_file = os.path.join("config", "playlists.json")
         self.playlists = self._load_playlists()
         self.episodes_file = os.path.join("config", "episodes.json")
         self.episode_tracker = _load_episode_tracker(self.episodes_file)
         self.subscriptions_file = os.path.join("config", "subscriptions.json")
         self.subscriptions = _load_subscriptions(self.subscriptions_file)
+        self._dependencies_ok = False
         self.update_thread: Optional[threading.Thread] = None
         self.update_stop_event: Optional[threading.Event] = None
         if self.config.get("update_checker_enabled"):
@@ -128,6 +142,16 @@ class YTToJellyfin:
     def check_dependencies(self) -> bool:
         return check_dependencies(self.config["ytdlp_path"])
 
+    def _ensure_dependencies(self) -> bool:
+        """Run the dependency check until it first succeeds, then reuse it.
+
+        Failures are not cached so tools installed after startup are picked up
+        by the next job without a restart.
+        """
+        if not self._dependencies_ok:
+            self._dependencies_ok = self.check_dependencies()
+        return self._dependencies_ok
+
     def _start_job(self, job_id: str, *, start_thread: bool = True) -> None:
         """Start the correct worker for a job based on its media type."""
 
@@ -371,7 +395,7 @@ class YTToJellyfin:
             return
         try:
             job.update(status="in_progress", message="Starting job processing")
-            if not self.check_dependencies():
+            if not self._ensure_dependencies():
                 job.update(status="failed", message="Missing dependencies")
                 return
             try:
@@ -499,7 +523,7 @@ class YTToJellyfin:
             return
         try:
             job.update(status="in_progress", message="Starting job processing")
-            if not self.check_dependencies():
+            if not self._ensure_dependencies():
                 job.update(status="failed", message="Missing dependencies")
                 return
             folder = self.create_movie_folder(
@@ -546,7 +570,7 @@ class YTToJellyfin:
 
         try:
             job.update(status="in_progress", message="Starting music job")
-            if not self.check_dependencies():
+            if not self._ensure_dependencies():
                 job.update(status="failed", message="Missing dependencies")
                 return
 
@@ -673,7 +697,7 @@ class YTToJellyfin:
                 message="Starting audiobook job",
                 detailed_status="Preparing audiobook",
             )
-            if not self.check_dependencies():
+            if not self._ensure_dependencies():
                 job.update(status="failed", message="Missing dependencies")
                 return
 
@@ -728,16 +752,36 @@ class YTToJellyfin:
             self._on_job_complete(job_id)
 
     def _on_job_complete(self, job_id: str) -> None:
-        """Start the next queued job if available."""
+        """Retire old finished jobs and start the next queued job if available."""
         with self.job_lock:
             if job_id in self.active_jobs:
                 self.active_jobs.remove(job_id)
-            while self.job_queue and len(self.active_jobs) < self.config.get(
-                "max_concurrent_jobs", 1
-            ):
-                next_id = self.job_queue.pop(0)
-                self.active_jobs.append(next_id)
-                self._start_job(next_id, start_thread=True)
+            job = self.jobs.get(job_id)
+            if job and job.status in {"completed", "failed"}:
+                self.finished_jobs.append(job_id)
+                limit = self.config.get("completed_jobs_limit", 10)
+                while len(self.finished_jobs) > limit:
+                    self.jobs.pop(self.finished_jobs.popleft(), None)
+            self._start_queued_jobs()
+
+    def _start_queued_jobs(self) -> None:
+        """Start queued jobs up to the concurrency limit; hold ``job_lock``."""
+        while self.job_queue and len(self.active_jobs) < self.config.get(
+            "max_concurrent_jobs", 1
+        ):
+            next_id = self.job_queue.pop(0)
+            self.active_jobs.append(next_id)
+            self._start_job(next_id, start_thread=True)
+
+    def set_max_concurrent_jobs(self, limit: int) -> None:
+        """Change how many jobs run at once, starting queued jobs right away.
+
+        Lowering the limit does not interrupt running jobs; queued jobs just
+        wait until enough of them finish.
+        """
+        with self.job_lock:
+            self.config["max_concurrent_jobs"] = max(1, int(limit))
+            self._start_queued_jobs()
 
     # media functions
     def create_folder_structure(
@@ -886,6 +930,12 @@ class YTToJellyfin:
     def list_media(self) -> List[Dict]:
         return list_media(self)
 
+    def start_media_refresher(self) -> None:
+        start_media_refresher(self)
+
+    def stop_media_refresher(self) -> None:
+        stop_media_refresher(self)
+
     def list_movies(self) -> List[Dict]:
         return list_movies(self)
 
@@ -963,10 +1013,10 @@ class YTToJellyfin:
                 playlist_url, show_name, season_num, str(episode_start)
             )
             job = self.jobs.get(job_id)
-            while job and job.status not in ("completed", "failed"):
-                time.sleep(1)
-                job = self.jobs.get(job_id)
-            return job.status == "completed" if job else False
+            if not job:
+                return False
+            job.done.wait()
+            return job.status == "completed"
         except Exception as e:
             logger.exception(f"Error processing playlist {playlist_url}: {e}")
             return False
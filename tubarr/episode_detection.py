@@ -9,6 +9,9 @@ from .tvdb import TVDBClient
 
 logger = logging.getLogger("yt-to-jellyfin.episode_detection")
 
+# Dates such as "1st May 2019" or "9th_March_2018"
+_TITLE_DATE_RE = re.compile(r"(\d{1,2})(st|nd|rd|th)?[\s_]+([A-Za-z]+)[\s_]+(\d{4})")
+
 
 @dataclass
 class EpisodeMetadata:
@@ -54,7 +57,7 @@ def _parse_jeremy_kyle_date(title: str) -> Optional[str]:
     """
 
     # Handle both spaces and underscores as separators
-    match = re.search(r"(\d{1,2})(st|nd|rd|th)?[\s_]+([A-Za-z]+)[\s_]+(\d{4})", title)
+    match = _TITLE_DATE_RE.search(title)
     if not match:
         return None
     day = match.group(1)
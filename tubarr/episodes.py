@@ -3,14 +3,13 @@ import json
 from typing import Dict
 
 from .config import logger
-from .utils import sanitize_name
+from .utils import dumps_json, load_json_file, sanitize_name
 
 
 def _load_episode_tracker(episodes_file: str) -> Dict[str, Dict[str, int]]:
     if os.path.exists(episodes_file):
         try:
-            with open(episodes_file, "r") as f:
-                return json.load(f)
+            return load_json_file(episodes_file)
         except (IOError, json.JSONDecodeError):
             logger.warning("Failed to load episode tracker, starting fresh")
     return {}
@@ -18,8 +17,8 @@ def _load_episode_tracker(episodes_file: str) -> Dict[str, Dict[str, int]]:
 
 def _save_episode_tracker(episodes_file: str, data: Dict[str, Dict[str, int]]) -> None:
     os.makedirs(os.path.dirname(episodes_file), exist_ok=True)
-    with open(episodes_file, "w") as f:
-        json.dump(data, f, indent=2)
+    with open(episodes_file, "wb") as f:
+        f.write(dumps_json(data, indent=True))
 
 
 def get_last_episode(
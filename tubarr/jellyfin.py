@@ -1,11 +1,160 @@
+import hashlib
 import os
 import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 import logging
 
+import requests
+
 from .config import logger
 from .utils import log_job
 
+# Library copies are I/O bound, so a few overlap reads with writes
+_COPY_WORKERS = 4
+# Bytes hashed from each end of a file to tell same-sized files apart
+_FINGERPRINT_CHUNK = 1 << 20
+
+
+def _copy_file_range(source, dest) -> None:
+    """Copy ``source`` to ``dest`` inside the kernel with ``copy_file_range``.
+
+    Copy-on-write filesystems (btrfs, XFS) turn this into a reflink and NFS
+    4.2 into a server-side copy. Metadata is then copied like ``copy2``. The
+    copy is written beside ``dest`` and renamed over it, so a hardlink to
+    ``source`` left there by link mode is replaced rather than truncated.
+    """
+    fd, tmp = tempfile.mkstemp(
+        dir=os.path.dirname(dest), prefix=f".{os.path.basename(dest)}."
+    )
+    try:
+        with open(source, "rb") as src, os.fdopen(fd, "wb") as dst:
+            remaining = os.fstat(src.fileno()).st_size
+            while remaining > 0:
+                copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+        shutil.copystat(source, tmp)
+        os.replace(tmp, dest)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _transfer_file(source, dest, mode: str = "copy") -> None:
+    """Place ``source`` at ``dest`` according to ``mode``.
+
+    ``link`` hardlinks, which costs no I/O but needs both paths on one
+    filesystem. ``reflink`` copies with ``copy_file_range`` where the platform
+    has it. Any failure falls back to ``shutil.copy2``, which already uses
+    ``sendfile`` on Linux.
+    """
+    if mode == "link":
+        try:
+            if os.path.lexists(dest):
+                os.unlink(dest)
+            os.link(source, dest)
+            return
+        except OSError as e:
+            logger.debug(f"Hardlink {source} -> {dest} failed, copying: {e}")
+    elif mode == "reflink" and hasattr(os, "copy_file_range"):
+        try:
+            _copy_file_range(source, dest)
+            return
+        except OSError as e:
+            logger.debug(f"copy_file_range {source} -> {dest} failed, copying: {e}")
+    if os.path.exists(dest) and os.path.samefile(source, dest):
+        # A hardlink from link mode; copying onto it would hit the source
+        os.unlink(dest)
+    shutil.copy2(source, dest)
+
+
+def _fingerprint(path, size: int) -> bytes:
+    """Hash the first and last ``_FINGERPRINT_CHUNK`` bytes of ``path``."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as fh:
+        digest.update(fh.read(_FINGERPRINT_CHUNK))
+        if size > 2 * _FINGERPRINT_CHUNK:
+            fh.seek(-_FINGERPRINT_CHUNK, os.SEEK_END)
+            digest.update(fh.read(_FINGERPRINT_CHUNK))
+        elif size > _FINGERPRINT_CHUNK:
+            digest.update(fh.read())
+    return digest.digest()
+
+
+def _copy_if_changed(source: Path, dest: Path, mode: str) -> bool:
+    """Transfer ``source`` unless ``dest`` already holds the same content.
+
+    Sizes are compared first; only equal sizes pay for reading the ends of
+    both files, which catches different encodes that happen to match in size.
+    """
+    try:
+        dest_size = os.stat(dest).st_size
+    except FileNotFoundError:
+        dest_size = -1
+    size = os.stat(source).st_size
+    if dest_size == size and _fingerprint(dest, size) == _fingerprint(source, size):
+        return False
+    _transfer_file(source, dest, mode)
+    return True
+
+
+def _copy_files(job_id, job, files, dest_folder: Path, mode: str, label: str) -> None:
+    """Copy ``files`` into ``dest_folder`` concurrently, reporting each one."""
+    total_files = len(files)
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(_COPY_WORKERS, total_files))
+    ) as executor:
+        futures = {
+            executor.submit(
+                _copy_if_changed, file_path, dest_folder / file_path.name, mode
+            ): file_path
+            for file_path in files
+        }
+        for processed, future in enumerate(as_completed(futures), start=1):
+            file_path = futures[future]
+            if not future.result():
+                log_job(
+                    job_id,
+                    logging.INFO,
+                    f"Skipping {file_path.name} - already exists with the same "
+                    "size and fingerprint",
+                )
+                if job:
+                    job.update(
+                        processed_files=processed,
+                        message=f"Skipped {file_path.name} - already exists",
+                    )
+                continue
+            log_job(
+                job_id,
+                logging.INFO,
+                f"Copied {file_path.name} to Jellyfin",
+            )
+            if job:
+                job.update(
+                    processed_files=processed,
+                    file_name=file_path.name,
+                    stage_progress=int(processed / total_files * 100),
+                    detailed_status=(
+                        f"Copying: {file_path.name} ({processed}/{total_files})"
+                    ),
+                    message=f"Copied {file_path.name} to Jellyfin {label}",
+                )
+
+
+def _http_session(app) -> requests.Session:
+    """Return the app's Jellyfin session so scans reuse one connection."""
+    session = getattr(app, "_jellyfin_session", None)
+    if session is None:
+        session = app._jellyfin_session = requests.Session()
+    return session
+
 
 def copy_to_jellyfin(app, show_name: str, season_num: str, job_id: str) -> None:
     if not app.config.get("jellyfin_enabled", False):
@@ -78,6 +227,7 @@ def copy_to_jellyfin(app, show_name: str, season_num: str, job_id: str) -> None:
                     message=f"Error: Failed to create Jellyfin season folder: {e}"
                 )
             return
+    copy_mode = app.config.get("jellyfin_copy_mode", "copy")
     try:
         media_files = list(source_folder.glob("*.mp4"))
         nfo_files = list(source_folder.glob("*.nfo"))
@@ -90,37 +240,9 @@ def copy_to_jellyfin(app, show_name: str, season_num: str, job_id: str) -> None:
                 processed_files=0,
                 detailed_status=f"Copying {total_files} files to Jellyfin",
             )
-        for i, file_path in enumerate(all_files):
-            dest_file = dest_season_folder / file_path.name
-            if (
-                os.path.exists(dest_file)
-                and os.path.getsize(dest_file) == os.path.getsize(file_path)
-            ):
-                log_job(
-                    job_id,
-                    logging.INFO,
-                    f"Skipping {file_path.name} - already exists and same size",
-                )
-                if job:
-                    job.update(
-                        processed_files=i + 1,
-                        message=f"Skipped {file_path.name} - already exists",
-                    )
-                continue
-            shutil.copy2(file_path, dest_file)
-            log_job(
-                job_id,
-                logging.INFO,
-                f"Copied {file_path.name} to Jellyfin",
-            )
-            if job:
-                job.update(
-                    processed_files=i + 1,
-                    file_name=file_path.name,
-                    stage_progress=int((i + 1) / total_files * 100),
-                    detailed_status=f"Copying: {file_path.name} ({i+1}/{total_files})",
-                    message=f"Copied {file_path.name} to Jellyfin TV folder",
-                )
+        _copy_files(
+            job_id, job, all_files, dest_season_folder, copy_mode, "TV folder"
+        )
         show_files = [
             (
                 Path(app.config["output_dir"]) / sanitized_show / "tvshow.nfo",
@@ -137,7 +259,7 @@ def copy_to_jellyfin(app, show_name: str, season_num: str, job_id: str) -> None:
         ]
         for source, dest in show_files:
             if source.exists():
-                shutil.copy2(source, dest)
+                _transfer_file(source, dest, copy_mode)
                 log_job(
                     job_id,
                     logging.INFO,
@@ -205,6 +327,7 @@ def copy_movie_to_jellyfin(app, movie_name: str, job_id: str) -> None:
                     message=f"Error: Failed to create Jellyfin movie folder: {e}"
                 )
             return
+    copy_mode = app.config.get("jellyfin_copy_mode", "copy")
     try:
         all_files = list(source_folder.glob("*"))
         total_files = len(all_files)
@@ -214,37 +337,7 @@ def copy_movie_to_jellyfin(app, movie_name: str, job_id: str) -> None:
                 processed_files=0,
                 detailed_status=f"Copying {total_files} files to Jellyfin",
             )
-        for i, file_path in enumerate(all_files):
-            dest_file = dest_folder / file_path.name
-            if (
-                os.path.exists(dest_file)
-                and os.path.getsize(dest_file) == os.path.getsize(file_path)
-            ):
-                log_job(
-                    job_id,
-                    logging.INFO,
-                    f"Skipping {file_path.name} - already exists and same size",
-                )
-                if job:
-                    job.update(
-                        processed_files=i + 1,
-                        message=f"Skipped {file_path.name} - already exists",
-                    )
-                continue
-            shutil.copy2(file_path, dest_file)
-            log_job(
-                job_id,
-                logging.INFO,
-                f"Copied {file_path.name} to Jellyfin",
-            )
-            if job:
-                job.update(
-                    processed_files=i + 1,
-                    file_name=file_path.name,
-                    stage_progress=int((i + 1) / total_files * 100),
-                    detailed_status=f"Copying: {file_path.name} ({i+1}/{total_files})",
-                    message=f"Copied {file_path.name} to Jellyfin movie folder",
-                )
+        _copy_files(job_id, job, all_files, dest_folder, copy_mode, "movie folder")
         if job:
             job.update(
                 progress=98,
@@ -277,11 +370,11 @@ def trigger_jellyfin_scan(app, job_id: str) -> None:
             "Jellyfin API key or host not set, skipping library scan",
         )
         return
-    url = f"http://{host}:{port}/Library/Refresh?api_key={api_key}"
+    url = f"http://{host}:{port}/Library/Refresh"
     try:
-        import requests
-
-        response = requests.post(url, timeout=10)
+        response = _http_session(app).post(
+            url, headers={"X-Emby-Token": api_key}, timeout=10
+        )
         if response.status_code in (200, 204):
             log_job(
                 job_id,
@@ -378,11 +471,12 @@ def copy_music_to_jellyfin(
         source_folder.glob("*.png")
     )
     total_files = len(audio_files) + len(artwork_files)
+    copy_mode = app.config.get("jellyfin_copy_mode", "copy")
 
     for idx, file_path in enumerate(audio_files + artwork_files, start=1):
         dest_file = dest_folder / file_path.name
         try:
-            shutil.copy2(file_path, dest_file)
+            _transfer_file(file_path, dest_file, copy_mode)
             log_job(job_id, logging.INFO, f"Copied {file_path.name} to Jellyfin")
             if job:
                 job.update(
@@ -3,13 +3,29 @@ import copy
 import uuid
 import threading
 import subprocess
+import time
+from collections import deque
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Deque, Dict, List, Optional, Tuple
 
 from .config import logger
 from .utils import terminate_process
 
+# Only the most recent job messages are kept; older ones are discarded
+MAX_JOB_MESSAGES = 500
+_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+@lru_cache(maxsize=1024)
+def _format_timestamp(seconds: int) -> str:
+    """Format an epoch second; bursts of messages share one cached string."""
+    return time.strftime(_TIMESTAMP_FORMAT, time.localtime(seconds))
+
+
+TERMINAL_JOB_STATUSES = frozenset({"completed", "failed", "cancelled"})
+
 
 @dataclass
 class TrackMetadata:
@@ -83,11 +99,17 @@ class DownloadJob:
         self.destination_path = destination_path
         self.destination_label = destination_label
         self.detected_seasons: List[str] = []
+        # Set once the job reaches a terminal status so waiters need not poll
+        self.done = threading.Event()
+        # Bumped and notified on every change so progress streams need not poll
+        self._changed = threading.Condition(threading.RLock())
+        self._version = 0
         self.status = "queued"
         self.progress = 0
-        self.messages = []
-        self.created_at = datetime.now()
-        self.updated_at = datetime.now()
+        self.messages: Deque[Dict[str, str]] = deque(maxlen=MAX_JOB_MESSAGES)
+        # Epoch seconds; formatted only when the job is serialized
+        self.created_at = time.time()
+        self.updated_at = self.created_at
         self.process: Optional[subprocess.Popen] = None
         self.current_stage = "waiting"
         self.stage_progress = 0
@@ -96,6 +118,55 @@ class DownloadJob:
         self.processed_files = 0
         self.detailed_status = "Job queued"
         self.remaining_files: List[str] = []
+        # Fields that never change after creation, serialized once. season_num
+        # is excluded because process_job may reassign it.
+        self._static = {
+            "job_id": job_id,
+            "playlist_url": playlist_url,
+            "show_name": show_name,
+            "episode_start": episode_start,
+            "playlist_start": playlist_start,
+            "media_type": media_type,
+            "movie_name": movie_name,
+            "book_title": book_title,
+            "book_author": book_author,
+            "cover_url": cover_url,
+            "subscription_id": subscription_id,
+            "created_at": _format_timestamp(int(self.created_at)),
+        }
+
+    @property
+    def status(self) -> str:
+        return self._status
+
+    @status.setter
+    def status(self, value: str) -> None:
+        with self._changed:
+            self._status = value
+            if value in TERMINAL_JOB_STATUSES:
+                self.done.set()
+            self._version += 1
+            self._changed.notify_all()
+
+    def progress_snapshot(self) -> Tuple[int, Dict[str, Any]]:
+        """Return the change counter and the job's current progress fields."""
+        with self._changed:
+            return self._version, {
+                "job_id": self.job_id,
+                "status": self.status,
+                "progress": self.progress,
+                "current_stage": self.current_stage,
+                "stage_progress": self.stage_progress,
+                "current_file": self.current_file,
+                "total_files": self.total_files,
+                "processed_files": self.processed_files,
+                "detailed_status": self.detailed_status,
+            }
+
+    def wait_for_change(self, version: int, timeout: Optional[float] = None) -> bool:
+        """Block until the job changes after ``version``; ``False`` on timeout."""
+        with self._changed:
+            return self._changed.wait_for(lambda: self._version != version, timeout)
 
     def update(
         self,
@@ -109,69 +180,65 @@ class DownloadJob:
         processed_files=None,
         detailed_status=None,
     ):
-        if status:
-            self.status = status
-        if progress is not None:
-            self.progress = progress
-        if stage:
-            self.current_stage = stage
-        if file_name:
-            self.current_file = file_name
-        if stage_progress is not None:
-            self.stage_progress = stage_progress
-        if total_files is not None:
-            self.total_files = total_files
-        if processed_files is not None:
-            self.processed_files = processed_files
-        if detailed_status:
-            self.detailed_status = detailed_status
-        if message:
-            if stage and not detailed_status:
-                stage_desc = {
-                    "waiting": "Waiting to start",
-                    "downloading": "Downloading videos",
-                    "processing_metadata": "Processing metadata",
-                    "converting": "Converting videos to H.265",
-                    "generating_artwork": "Generating artwork and thumbnails",
-                    "creating_nfo": "Creating NFO files",
-                    "completed": "Processing completed",
-                    "failed": "Processing failed",
-                }
-                prefix = f"[{stage_desc.get(stage, stage)}]"
-                message = f"{prefix} {message}"
-            self.messages.append(
-                {"time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "text": message}
-            )
-        self.updated_at = datetime.now()
+        with self._changed:
+            if status:
+                self.status = status
+            if progress is not None:
+                self.progress = progress
+            if stage:
+                self.current_stage = stage
+            if file_name:
+                self.current_file = file_name
+            if stage_progress is not None:
+                self.stage_progress = stage_progress
+            if total_files is not None:
+                self.total_files = total_files
+            if processed_files is not None:
+                self.processed_files = processed_files
+            if detailed_status:
+                self.detailed_status = detailed_status
+            if message:
+                if stage and not detailed_status:
+                    stage_desc = {
+                        "waiting": "Waiting to start",
+                        "downloading": "Downloading videos",
+                        "processing_metadata": "Processing metadata",
+                        "converting": "Converting videos to H.265",
+                        "generating_artwork": "Generating artwork and thumbnails",
+                        "creating_nfo": "Creating NFO files",
+                        "completed": "Processing completed",
+                        "failed": "Processing failed",
+                    }
+                    prefix = f"[{stage_desc.get(stage, stage)}]"
+                    message = f"{prefix} {message}"
+                self.messages.append({"time": time.time(), "text": message})
+            self.updated_at = time.time()
+            self._version += 1
+            self._changed.notify_all()
 
     def to_dict(
         self, include_messages: bool = True, message_limit: Optional[int] = None
     ):
         messages = []
         if include_messages:
-            if message_limit is not None:
-                messages = self.messages[-message_limit:]
-            else:
-                messages = self.messages
+            # Copy under the lock; update() appends from worker threads
+            with self._changed:
+                skip = 0
+                if message_limit is not None:
+                    skip = max(len(self.messages) - message_limit, 0)
+                snapshot = list(islice(self.messages, skip, None))
+            messages = [
+                {"time": _format_timestamp(int(m["time"])), "text": m["text"]}
+                for m in snapshot
+            ]
         return {
-            "job_id": self.job_id,
-            "playlist_url": self.playlist_url,
-            "show_name": self.show_name,
+            **self._static,
             "season_num": self.season_num,
-            "episode_start": self.episode_start,
-            "playlist_start": self.playlist_start,
-            "media_type": self.media_type,
-            "movie_name": self.movie_name,
-            "book_title": self.book_title,
-            "book_author": self.book_author,
-            "cover_url": self.cover_url,
-            "subscription_id": self.subscription_id,
             "music_request": self.music_request,
             "status": self.status,
             "progress": self.progress,
             "messages": messages,
-            "created_at": self.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-            "updated_at": self.updated_at.strftime("%Y-%m-%d %H:%M:%S"),
+            "updated_at": _format_timestamp(int(self.updated_at)),
             "current_stage": self.current_stage,
             "stage_progress": self.stage_progress,
             "current_file": self.current_file,
@@ -234,6 +301,8 @@ def create_job(
         ep_start_num = int(episode_start)
     except ValueError:
         ep_start_num = 1
+    # One flat-playlist listing serves both the queue preview and archive seeding
+    videos: Optional[List[Dict]] = None
     try:
         videos = app.get_playlist_videos(playlist_url)
         start_idx = playlist_start or 1
@@ -250,7 +319,8 @@ def create_job(
         )
         if added and playlist_start and playlist_start > 1:
             try:
-                videos = app.get_playlist_videos(playlist_url)
+                if videos is None:
+                    videos = app.get_playlist_videos(playlist_url)
                 ids_to_seed = [
                     v.get("id") for v in videos[: playlist_start - 1] if v.get("id")
                 ]
@@ -264,14 +334,6 @@ def create_job(
 
     with app.job_lock:
         app.jobs[job_id] = job
-        completed_jobs = [
-            j for j in app.jobs.values() if j.status in {"completed", "failed"}
-        ]
-        completed_jobs.sort(key=lambda j: j.updated_at)
-        while len(completed_jobs) > app.config.get("completed_jobs_limit", 10):
-            old_job = completed_jobs.pop(0)
-            del app.jobs[old_job.job_id]
-
         if len(app.active_jobs) < app.config.get("max_concurrent_jobs", 1):
             app.active_jobs.append(job_id)
             if start_thread:
@@ -292,8 +354,11 @@ def get_job(app, job_id: str) -> Optional[Dict]:
 
 
 def get_jobs(app) -> List[Dict]:
+    # Snapshot under the lock, serialize outside it so job creation and
+    # completion are not held up by the conversion.
     with app.job_lock:
-        return [job.to_dict(include_messages=False) for job in app.jobs.values()]
+        jobs = tuple(app.jobs.values())
+    return [job.to_dict(include_messages=False) for job in jobs]
 
 
 def cancel_job(app, job_id: str) -> bool:
@@ -1,29 +1,155 @@
 import os
+import sys
 import json
 import re
 import subprocess
 import logging
+import threading
+import time
 import requests
+from string import Template
+from xml.sax.saxutils import escape
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
-from typing import List, Dict, Optional, Sequence, TYPE_CHECKING
+from typing import List, Dict, Optional, Sequence, Tuple, TYPE_CHECKING
 from datetime import datetime
 
 from mutagen.id3 import ID3, TIT2, TPE1, TPE2, TALB, TRCK, TPOS, TDRC, TCON, APIC, ID3NoHeaderError
 
-from .config import logger
+from .config import _is_exec, logger
 from .episode_detection import EpisodeDetectionError, EpisodeMatch, EpisodeMetadata
 from .utils import (
     sanitize_name,
     clean_filename,
     run_subprocess,
-    terminate_process,
+    iter_process_output,
+    PIPE_BUFSIZE,
     log_job,
+    loads_json,
+    load_json_file,
 )
 from . import tmdb
 
+try:  # Pillow is an optional speed-up; ImageMagick is used otherwise
+    from PIL import Image
+except ImportError:  # pragma: no cover - depends on the environment
+    Image = None
+
 if TYPE_CHECKING:
     from .jobs import TrackMetadata
 
+_PROGRESS_PCT_RE = re.compile(r"(\d+\.\d+)%")
+_DOWNLOAD_DEST_RE = re.compile(r"Destination:\s+(.+)")
+_DOWNLOAD_TOTAL_RE = re.compile(r"of\s+(\d+)\s+item")
+# Minimum seconds between job updates for yt-dlp percentage lines; file
+# starts and item counts are always passed through
+_PROGRESS_UPDATE_INTERVAL = 0.25
+_SEASON_NUM_RE = re.compile(r"(\d+)")
+_EPISODE_CODE_RE = re.compile(r"S(\d+)E(\d+)")
+# An SxxEyy code and surrounding dashes, stripped from episode titles
+_TITLE_EPISODE_CODE_RE = re.compile(
+    r"\s*-?\s*S\d{1,2}E\d{1,2}\s*-?\s*", re.IGNORECASE
+)
+# Pixel formats above 8 bits per component name the depth at the end, e.g.
+# yuv420p10le, p010le or gray12le (but not nv12 or yuv410p)
+_HIGH_DEPTH_PIX_FMT_RE = re.compile(r"(?:p0?|gray)(?:10|12|14|16)(?:le|be)?$")
+
+# yt-dlp .info.json sidecars read, and episodes renamed, side by side in
+# process_metadata
+_METADATA_READ_WORKERS = 8
+_METADATA_WORKERS = 8
+
+# Episode stats are issued concurrently once a season has this many files;
+# the syscalls release the GIL, which pays off on NAS/SMB-backed libraries.
+_STAT_WORKERS = 16
+_PARALLEL_STAT_MIN = 8
+# Shows are scanned concurrently on their own pool
+_SHOW_WORKERS = 16
+
+SEASON_PREFIX = b"Season "
+_SCANDIR_FD = os.scandir in os.supports_fd
+_DIR_OPEN_FLAGS = os.O_RDONLY | getattr(os, "O_DIRECTORY", 0)
+
+# Seconds between background rebuilds of the media listing snapshot
+MEDIA_REFRESH_INTERVAL = 30
+
+# Emit ffmpeg progress as key=value lines on stdout instead of the stats line
+_FFMPEG_PROGRESS_ARGS = ("-nostats", "-progress", "pipe:1")
+
+# x265 scales sub-linearly past a handful of threads, so wide hosts are
+# better served by several concurrent encodes than by one large one.
+_THREADS_PER_ENCODE = 4
+
+# Hardware HEVC encoders in order of preference when ``hwaccel`` is ``auto``
+_HEVC_HW_ENCODERS = (
+    "hevc_nvenc",
+    "hevc_qsv",
+    "hevc_vaapi",
+    "hevc_amf",
+    "hevc_videotoolbox",
+)
+_VAAPI_DEVICE = "/dev/dri/renderD128"
+
+# With NVENC, decode on the GPU too and keep frames in device memory
+_CUDA_DECODE_ARGS = ("-hwaccel", "cuda", "-hwaccel_output_format", "cuda")
+# Decode-only calls (thumbnails, posters) let ffmpeg pick any hardware decoder
+# and quietly fall back to software when there is none.
+_FRAME_DECODE_ARGS = ("-hwaccel", "auto")
+# ``hwaccel`` values that keep all video work on the CPU
+_SOFTWARE_HWACCEL = ("none", "off", "cpu", "libx265")
+
+# Auto-variance AQ keeps dark and flat scenes clean at the faster presets
+_X265_TUNING = "aq-mode=3"
+
+# Episodes handled by each batched thumbnail ffmpeg run
+_THUMBNAIL_BATCH = 16
+# Thumbnail batches are seek-bound, so a few can run side by side
+_THUMBNAIL_WORKERS = 4
+
+# NFO documents; every substituted value must be passed through ``escape``
+_NFO_HEADER = "<?xml version='1.0' encoding='UTF-8' standalone='yes'?>\n"
+_EPISODE_NFO = Template(
+    _NFO_HEADER + "<episodedetails>\n"
+    "  <title>$title</title>\n"
+    "  <season>$season</season>\n"
+    "  <episode>$episode</episode>\n"
+    "  <plot>$plot</plot>\n"
+    "  <aired>$aired</aired>\n"
+    "  <studio>YouTube</studio>\n"
+    "  <showtitle>$show</showtitle>\n"
+    "</episodedetails>\n"
+)
+_SEASON_NFO = Template(
+    _NFO_HEADER + "<season>\n"
+    "  <seasonnumber>$season</seasonnumber>\n"
+    "  <title>Season $season</title>\n"
+    "  <plot>Season $season of $show</plot>\n"
+    "</season>\n"
+)
+_TVSHOW_NFO = Template(
+    _NFO_HEADER + "<tvshow>\n"
+    "  <title>$show</title>\n"
+    "  <studio>YouTube</studio>\n"
+    "</tvshow>\n"
+)
+
+
+def _write_nfo(path, content: str) -> None:
+    """Write an NFO document as UTF-8, matching its XML declaration.
+
+    The pre-encoded bytes go out through ``os.write`` on a raw descriptor,
+    so there is no text wrapper or locale-dependent encoding in between.
+    """
+    data = memoryview(content.encode("utf-8"))
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        while data:
+            data = data[os.write(fd, data) :]
+    finally:
+        os.close(fd)
+
 
 def create_folder_structure(
     app, show_name: str, season_num: str, *, base_path: Optional[str] = None
@@ -137,7 +263,7 @@ def download_playlist(
     if not os.path.isabs(ytdlp_path):
         script_dir = os.path.dirname(os.path.abspath(__file__))
         local_ytdlp = os.path.join(script_dir, ytdlp_path)
-        if os.path.exists(local_ytdlp) and os.access(local_ytdlp, os.X_OK):
+        if _is_exec(local_ytdlp):
             ytdlp_path = local_ytdlp
     log_job(job_id, logging.INFO, f"Using yt-dlp from: {ytdlp_path}")
     job = app.jobs.get(job_id)
@@ -188,26 +314,28 @@ def download_playlist(
     current_file = ""
     total_files = 0
     processed_files = 0
+    last_progress_update = float("-inf")
     try:
         process = subprocess.Popen(
             cmd,
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
             universal_newlines=True,
+            bufsize=PIPE_BUFSIZE,
             start_new_session=True,
         )
         if job:
             job.process = process
-        for line in process.stdout:
-            if job and job.status == "cancelled":
-                terminate_process(process)
-                break
+        for line in iter_process_output(process, job):
             line = line.strip()
             log_job(job_id, logging.INFO, line)
             if job:
-                if "[download]" in line and "Destination:" in line:
+                # Destination and item-count lines only come from [download];
+                # percentages are parsed wherever they appear
+                is_download = line.startswith("[download]")
+                if is_download and "Destination:" in line:
                     try:
-                        file_match = re.search(r"Destination:\s+(.+)", line)
+                        file_match = _DOWNLOAD_DEST_RE.search(line)
                         if file_match:
                             current_file = os.path.basename(file_match.group(1))
                             processed_files += 1
@@ -225,9 +353,9 @@ def download_playlist(
                             logging.ERROR,
                             f"Error parsing destination: {e}",
                         )
-                elif "[download]" in line and "of" in line and "item" in line:
+                elif is_download and "of" in line and "item" in line:
                     try:
-                        total_match = re.search(r"of\s+(\d+)\s+item", line)
+                        total_match = _DOWNLOAD_TOTAL_RE.search(line)
                         if total_match:
                             total_files = int(total_match.group(1))
                             job.update(total_files=total_files)
@@ -238,8 +366,12 @@ def download_playlist(
                             f"Error parsing total files: {e}",
                         )
                 elif "%" in line:
+                    now = time.monotonic()
+                    if now - last_progress_update < _PROGRESS_UPDATE_INTERVAL:
+                        continue
+                    last_progress_update = now
                     try:
-                        progress_str = re.search(r"(\d+\.\d+)%", line)
+                        progress_str = _PROGRESS_PCT_RE.search(line)
                         if progress_str:
                             file_progress = float(progress_str.group(1))
                             if total_files > 0:
@@ -299,6 +431,36 @@ def download_playlist(
         return False
 
 
+def _scan_season(
+    folder: str, season_num: Optional[str] = None
+) -> Dict[str, List[Path]]:
+    """Bucket the files in ``folder`` by extension using one directory scan.
+
+    When ``season_num`` is given only names containing ``S{season_num}E`` are
+    kept. yt-dlp metadata sidecars are bucketed under ``"info.json"``.
+    """
+    marker = f"S{season_num}E" if season_num is not None else None
+    buckets: Dict[str, List[Path]] = {}
+    try:
+        with os.scandir(folder) as it:
+            for entry in it:
+                name = entry.name
+                if marker and marker not in name:
+                    continue
+                if name.endswith(".info.json"):
+                    ext = "info.json"
+                elif "." in name:
+                    ext = name.rsplit(".", 1)[1]
+                else:
+                    continue
+                buckets.setdefault(ext, []).append(Path(entry.path))
+    except (FileNotFoundError, NotADirectoryError):
+        return {}
+    for paths in buckets.values():
+        paths.sort()
+    return buckets
+
+
 def _normalize_upload_date(upload_date: str) -> str:
     """Convert various upload date formats to ``YYYY-MM-DD``.
 
@@ -339,7 +501,8 @@ def process_metadata(
             detailed_status="Processing metadata from videos",
             message="Processing metadata and creating NFO files",
         )
-    json_files = list(Path(folder).glob("*.info.json"))
+    scan = _scan_season(folder)
+    json_files = scan.get("info.json", [])
     if not json_files:
         if job:
             job.update(
@@ -348,19 +511,27 @@ def process_metadata(
             )
         log_job(job_id, logging.WARNING, "No JSON metadata files found")
         return []
-    with open(json_files[0], "r") as f:
-        first_data = json.load(f)
-        first_index = first_data.get("playlist_index", 1)
-    total_files = len(json_files)
+    # Downloaded video for each yt-dlp base name, preferring mp4 over mkv/webm
+    videos_by_base: Dict[str, Path] = {}
+    for ext in ("mp4", "mkv", "webm"):
+        for path in scan.get(ext, []):
+            videos_by_base.setdefault(str(path)[: -len(ext) - 1], path)
+    if len(json_files) > 1:
+        workers = min(_METADATA_READ_WORKERS, len(json_files))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            documents = list(executor.map(load_json_file, json_files))
+    else:
+        documents = [load_json_file(json_file) for json_file in json_files]
+    parsed = list(zip(json_files, documents))
+    first_index = parsed[0][1].get("playlist_index", 1)
+    total_files = len(parsed)
     if job:
         job.update(
             total_files=total_files,
             detailed_status=f"Processing metadata for {total_files} videos",
         )
     entries: List[EpisodeMetadata] = []
-    for json_file in json_files:
-        with open(json_file, "r") as f:
-            data = json.load(f)
+    for json_file, data in parsed:
         title = data.get("title", "Unknown Title")
         description = (
             data.get("description", "").split("\n")[0]
@@ -407,86 +578,480 @@ def process_metadata(
                 )
             )
 
-    seasons_last_episode: Dict[int, int] = {}
-    for i, match in enumerate(matches):
-        season_padded = f"{match.season:02d}"
-        processed_seasons.add(season_padded)
-        if destination_path:
-            dest_folder = Path(destination_path)
-        else:
-            show_folder = Path(app.config["output_dir"]) / sanitize_name(show_name)
-            dest_folder = show_folder / f"Season {season_padded}"
-        dest_folder.mkdir(parents=True, exist_ok=True)
+    def _finalize(match: EpisodeMatch) -> EpisodeMatch:
+        _finalize_episode(
+            app, job, match, show_name, destination_path, videos_by_base
+        )
+        return match
 
-        file_name = os.path.basename(match.base_path)
-        if job:
-            job.update(
-                file_name=file_name,
-                processed_files=i + 1,
-                detailed_status=f"Processing metadata: {file_name}",
-                message=f"Processing metadata for {match.title}",
+    # Each episode's rename and NFO are independent, so they run side by side;
+    # progress and episode tracking are folded in here as they complete.
+    seasons_last_episode: Dict[int, int] = {}
+    workers = max(1, min(_METADATA_WORKERS, len(matches)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_finalize, match) for match in matches]
+        for done, future in enumerate(as_completed(futures), start=1):
+            match = future.result()
+            processed_seasons.add(f"{match.season:02d}")
+            seasons_last_episode[match.season] = max(
+                seasons_last_episode.get(match.season, 0), match.episode
             )
+            if job and total_files:
+                progress = int(done / total_files * 100)
+                job.update(
+                    processed_files=done,
+                    progress=progress,
+                    stage_progress=progress,
+                    detailed_status=f"Processed {done} of {total_files} files",
+                )
+
+    for season, last_ep in seasons_last_episode.items():
+        app.update_last_episode(show_name, f"{season:02d}", last_ep)
 
-        episode_title = re.sub(
-            r"\s*-?\s*S\d{1,2}E\d{1,2}\s*-?\s*", " ", match.title, flags=re.IGNORECASE
-        ).strip(" -")
+    return sorted(processed_seasons)
 
-        base_name = f"{show_name} - S{season_padded}E{match.episode:02d}"
-        if episode_title:
-            base_name = f"{base_name} - {episode_title}"
 
-        new_base = dest_folder / base_name
-        clean_base = new_base
-        if app.config.get("clean_filenames", True):
-            clean_base = dest_folder / clean_filename(new_base.name)
-
-        for ext in ["mp4", "mkv", "webm"]:
-            original = f"{match.base_path}.{ext}"
-            if os.path.exists(original):
-                new_file = f"{clean_base}.{ext}"
-                os.rename(original, new_file)
-                if job:
-                    job.update(message=f"Renamed file to {os.path.basename(new_file)}")
-                break
+def _finalize_episode(
+    app,
+    job,
+    match: EpisodeMatch,
+    show_name: str,
+    destination_path: Optional[str],
+    videos_by_base: Dict[str, Path],
+) -> None:
+    """Rename one downloaded episode, write its NFO and drop its info.json."""
+    season_padded = f"{match.season:02d}"
+    if destination_path:
+        dest_folder = Path(destination_path)
+    else:
+        show_folder = Path(app.config["output_dir"]) / sanitize_name(show_name)
+        dest_folder = show_folder / f"Season {season_padded}"
+    dest_folder.mkdir(parents=True, exist_ok=True)
 
-        nfo_content = (
-            "<?xml version='1.0' encoding='UTF-8' standalone='yes'?>\n"
-            "<episodedetails>\n"
-            f"  <title>{match.title}</title>\n"
-            f"  <season>{season_padded}</season>\n"
-            f"  <episode>{match.episode:02d}</episode>\n"
-            f"  <plot>{match.description}</plot>\n"
-            f"  <aired>{match.air_date or ''}</aired>\n"
-            "  <studio>YouTube</studio>\n"
-            f"  <showtitle>{show_name}</showtitle>\n"
-            "</episodedetails>\n"
+    file_name = os.path.basename(match.base_path)
+    if job:
+        job.update(
+            file_name=file_name,
+            detailed_status=f"Processing metadata: {file_name}",
+            message=f"Processing metadata for {match.title}",
         )
-        nfo_file = f"{clean_base}.nfo"
-        with open(nfo_file, "w") as f:
-            f.write(nfo_content)
+
+    episode_title = _TITLE_EPISODE_CODE_RE.sub(" ", match.title).strip(" -")
+
+    base_name = f"{show_name} - S{season_padded}E{match.episode:02d}"
+    if episode_title:
+        base_name = f"{base_name} - {episode_title}"
+
+    new_base = dest_folder / base_name
+    clean_base = new_base
+    if app.config.get("clean_filenames", True):
+        clean_base = dest_folder / clean_filename(new_base.name)
+
+    original = videos_by_base.get(match.base_path)
+    if original is not None:
+        new_file = f"{clean_base}{original.suffix}"
+        os.replace(original, new_file)
         if job:
-            job.update(message=f"Created NFO file for {match.title}")
+            job.update(message=f"Renamed file to {os.path.basename(new_file)}")
+
+    nfo_content = _EPISODE_NFO.substitute(
+        title=escape(str(match.title)),
+        season=season_padded,
+        episode=f"{match.episode:02d}",
+        plot=escape(str(match.description or "")),
+        aired=escape(str(match.air_date or "")),
+        show=escape(show_name),
+    )
+    nfo_file = f"{clean_base}.nfo"
+    _write_nfo(nfo_file, nfo_content)
+    if job:
+        job.update(message=f"Created NFO file for {match.title}")
 
-        json_file = f"{match.base_path}.info.json"
-        if os.path.exists(json_file):
-            os.remove(json_file)
+    try:
+        os.remove(f"{match.base_path}.info.json")
+    except FileNotFoundError:
+        pass
+
+
+def _ffmpeg_progress_seconds(line: bytes) -> Optional[float]:
+    """Return the encoded position from an ``-progress`` ``out_time_us`` line."""
+    key, _, value = line.partition(b"=")
+    if key != b"out_time_us":
+        return None
+    try:
+        return int(value) / 1_000_000
+    except ValueError:  # ``N/A`` before the first frame is written
+        return None
 
-        seasons_last_episode[match.season] = max(
-            seasons_last_episode.get(match.season, 0), match.episode
+
+def _probe_video(path) -> Tuple[str, float, str]:
+    """Return the first video stream's codec and pixel format and the duration."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return _probe_video_cached(str(path), -1, -1)
+    return _probe_video_cached(str(path), st.st_size, st.st_mtime_ns)
+
+
+@lru_cache(maxsize=256)
+def _probe_video_cached(path: str, size: int, mtime_ns: int) -> Tuple[str, float, str]:
+    """Run ffprobe once per file version; ``size`` and ``mtime_ns`` key the cache."""
+    probe_cmd = [
+        "ffprobe",
+        "-v",
+        "error",
+        "-select_streams",
+        "v:0",
+        "-show_entries",
+        "stream=codec_name,pix_fmt:format=duration",
+        "-of",
+        "json",
+        str(path),
+    ]
+    result = subprocess.run(probe_cmd, capture_output=True, text=True)
+    try:
+        data = loads_json(result.stdout)
+    except ValueError:
+        return "", 0.0, ""
+    stream = (data.get("streams") or [{}])[0]
+    codec = stream.get("codec_name", "")
+    try:
+        duration = float(data.get("format", {}).get("duration", 0) or 0)
+    except (TypeError, ValueError):
+        duration = 0.0
+    return codec, duration, stream.get("pix_fmt", "")
+
+
+def _pix_fmt_args(
+    encoder: str, source_pix_fmt: str, decode_args: List[str]
+) -> List[str]:
+    """Pin 4:2:0 output so sources in RGB or 4:4:4 are not carried through.
+
+    10/12-bit sources keep a 10-bit format. VAAPI uploads as nv12 in its own
+    filter chain, and frames already decoded on the GPU by NVDEC are 4:2:0.
+    """
+    if encoder == "hevc_vaapi" or decode_args:
+        return []
+    high_depth = _HIGH_DEPTH_PIX_FMT_RE.search(source_pix_fmt) is not None
+    if encoder in ("hevc_nvenc", "hevc_qsv", "hevc_videotoolbox"):
+        return ["-pix_fmt", "p010le" if high_depth else "nv12"]
+    return ["-pix_fmt", "yuv420p10le" if high_depth else "yuv420p"]
+
+
+def _hevc_encode_args(
+    encoder: str,
+    crf_value: int,
+    x265_params: Optional[str] = None,
+    x265_preset: str = "medium",
+) -> Tuple[List[str], List[str]]:
+    """Return ffmpeg ``(input_args, output_args)`` for the chosen HEVC encoder.
+
+    Hardware encoders ignore ``-crf`` so the CRF value is mapped onto each
+    encoder's own constant-quality knob. ``x265_preset`` and ``x265_params``
+    only apply to the libx265 software encoder.
+    """
+    quality = str(crf_value)
+    if encoder == "hevc_nvenc":
+        return [], [
+            "-c:v",
+            encoder,
+            "-preset",
+            "p6",
+            "-tune",
+            "hq",
+            "-rc",
+            "vbr",
+            "-cq",
+            quality,
+            "-b:v",
+            "0",
+        ]
+    if encoder == "hevc_qsv":
+        return [], ["-c:v", encoder, "-global_quality", quality, "-preset", "medium"]
+    if encoder == "hevc_vaapi":
+        return (
+            ["-vaapi_device", _VAAPI_DEVICE],
+            [
+                "-vf",
+                "format=nv12,hwupload",
+                "-c:v",
+                encoder,
+                "-rc_mode",
+                "ICQ",
+                "-global_quality",
+                quality,
+            ],
         )
+    if encoder == "hevc_amf":
+        return [], ["-c:v", encoder, "-rc", "cqp", "-qp_i", quality, "-qp_p", quality]
+    if encoder == "hevc_videotoolbox":
+        # VideoToolbox quality runs 1-100 with higher meaning better
+        vt_quality = str(max(1, min(100, round(100 - crf_value * 100 / 51))))
+        return [], ["-c:v", encoder, "-q:v", vt_quality]
+    params = _X265_TUNING + (f":{x265_params}" if x265_params else "")
+    return [], [
+        "-c:v",
+        "libx265",
+        "-preset",
+        x265_preset,
+        "-crf",
+        quality,
+        "-x265-params",
+        params,
+    ]
 
-        if job and total_files:
-            progress = int((i + 1) / total_files * 100)
-            job.update(
-                progress=progress,
-                stage_progress=progress,
-                detailed_status=f"Processed {i+1} of {total_files} files",
-            )
 
-    for season, last_ep in seasons_last_episode.items():
-        app.update_last_episode(show_name, f"{season:02d}", last_ep)
+def _hevc_encoder_works(encoder: str) -> bool:
+    """Check that ``encoder`` can actually open a device by encoding one frame."""
+    input_args, output_args = _hevc_encode_args(encoder, 28)
+    cmd = [
+        "ffmpeg",
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        *input_args,
+        "-f",
+        "lavfi",
+        "-i",
+        "color=black:s=256x256:d=0.1",
+        "-frames:v",
+        "1",
+        *output_args,
+        "-f",
+        "null",
+        "-",
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+    except (OSError, subprocess.SubprocessError):
+        return False
+    return result.returncode == 0
 
-    return sorted(processed_seasons)
+
+@lru_cache(maxsize=None)
+def _cuda_decode_available() -> bool:
+    """Return ``True`` when ffmpeg lists ``cuda`` among its hwaccels."""
+    try:
+        result = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-hwaccels"],
+            capture_output=True,
+            text=True,
+            timeout=30,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return False
+    return "cuda" in result.stdout.split()
+
+
+def _hevc_decode_args(encoder: str) -> List[str]:
+    """Return ffmpeg decoder arguments to pair with ``encoder``."""
+    if encoder == "hevc_nvenc" and _cuda_decode_available():
+        return list(_CUDA_DECODE_ARGS)
+    return []
+
+
+@lru_cache(maxsize=None)
+def _select_hevc_encoder(hwaccel: str) -> str:
+    """Pick the HEVC encoder for ``hwaccel`` (``auto``, ``none`` or a family).
+
+    ffmpeg builds list hardware encoders even when no device is present, so
+    each candidate is verified with a one-frame test encode. The result is
+    cached for the lifetime of the process.
+    """
+    choice = (hwaccel or "auto").strip().lower()
+    if choice in _SOFTWARE_HWACCEL:
+        return "libx265"
+    if choice == "auto":
+        candidates: Sequence[str] = _HEVC_HW_ENCODERS
+    else:
+        candidates = (choice if choice.startswith("hevc_") else f"hevc_{choice}",)
+    for encoder in candidates:
+        if _hevc_encoder_works(encoder):
+            logger.info(f"Using hardware HEVC encoder: {encoder}")
+            return encoder
+    if choice != "auto":
+        logger.warning(f"Hardware encoder '{choice}' unavailable, using libx265")
+    return "libx265"
+
+
+def _frame_decode_args(app) -> List[str]:
+    """Return per-input ffmpeg arguments for decode-only frame grabs."""
+    choice = str(app.config.get("hwaccel", "auto")).strip().lower()
+    if choice in _SOFTWARE_HWACCEL:
+        return []
+    return list(_FRAME_DECODE_ARGS)
+
+
+def _conversion_workers(app, total_files: int) -> int:
+    """Return how many ffmpeg encodes should run side by side."""
+    workers = int(app.config.get("parallel_encodes", 0) or 0)
+    if workers <= 0:
+        workers = (os.cpu_count() or 1) // _THREADS_PER_ENCODE
+    return max(1, min(workers, total_files))
+
+
+def _ffmpeg_thread_args(app, workers: int = 1) -> List[str]:
+    """Return ``-threads`` args for one of ``workers`` concurrent encodes."""
+    threads = int(app.config.get("ffmpeg_threads", 0) or 0)
+    if threads <= 0 and workers > 1:
+        threads = max(1, (os.cpu_count() or 1) // workers)
+    return ["-threads", str(threads)] if threads > 0 else []
+
+
+def _convert_one(
+    app,
+    job_id: str,
+    video: Path,
+    i: int,
+    total_files: int,
+    crf_value: int,
+    encoder: str,
+    x265_params: Optional[str],
+    report_progress,
+    thread_args: Sequence[str] = (),
+) -> bool:
+    """Convert a single episode to H.265, returning ``True`` when it is done."""
+    job = app.jobs.get(job_id)
+    if job and job.status == "cancelled":
+        return False
+    ext = str(video).rsplit(".", 1)[1].lower()
+    codec, duration, pix_fmt = _probe_video(video)
+    if ext == "mp4":
+        if codec in ["hevc", "h265"]:
+            log_job(
+                job_id,
+                logging.INFO,
+                f"Skipping already H.265 encoded file: {video}",
+            )
+            if job:
+                job.update(
+                    message=(
+                        "Skipping already H.265 encoded file: "
+                        f"{os.path.basename(str(video))}"
+                    ),
+                )
+            return True
+    base = str(video).rsplit(".", 1)[0]
+    temp_file = f"{base}.temp.mp4"
+    input_args, video_args = _hevc_encode_args(
+        encoder,
+        crf_value,
+        x265_params,
+        str(app.config.get("x265_preset", "faster")),
+    )
+    decode_args = _hevc_decode_args(encoder)
+    cmd = [
+        "ffmpeg",
+        *_FFMPEG_PROGRESS_ARGS,
+        *decode_args,
+        *input_args,
+        "-i",
+        str(video),
+        *video_args,
+        *_pix_fmt_args(encoder, pix_fmt, decode_args),
+        *thread_args,
+        "-tag:v",
+        "hvc1",
+        "-c:a",
+        "aac",
+        "-b:a",
+        "128k",
+        "-movflags",
+        "+faststart",
+        temp_file,
+    ]
+    filename = os.path.basename(str(video))
+    if job:
+        job.update(
+            file_name=filename,
+            detailed_status=(
+                f"Converting {filename} to H.265 (file {i+1}/{total_files})"
+            ),
+            message=(f"Converting {filename} to H.265 ({i+1}/{total_files})"),
+        )
+    log_job(job_id, logging.INFO, f"Converting {video} to H.265")
+    try:
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+        if job:
+            job.process = process
+        debug = logger.isEnabledFor(logging.DEBUG)
+        # Only whole-percent changes are reported to the job
+        last_progress = -1
+        for line in iter_process_output(process, job):
+            if debug:
+                logger.debug(line.decode("utf-8", "replace").strip())
+            if job and duration > 0:
+                try:
+                    seconds = _ffmpeg_progress_seconds(line)
+                    if seconds is not None:
+                        file_progress = min(100, int(seconds / duration * 100))
+                        if file_progress == last_progress:
+                            continue
+                        last_progress = file_progress
+                        job.update(
+                            progress=report_progress(i, file_progress),
+                            stage_progress=file_progress,
+                            detailed_status=(
+                                f"Converting {filename}: {file_progress}% "
+                                f"(file {i+1}/{total_files})"
+                            ),
+                        )
+                        if file_progress % 20 == 0:
+                            job.update(
+                                message=(
+                                    f"Converting {filename}: {file_progress}% "
+                                    f"complete"
+                                )
+                            )
+                except Exception as e:
+                    log_job(job_id, logging.ERROR, f"Error parsing progress: {e}")
+        process.wait()
+        if job:
+            job.process = None
+        if process.returncode == 0:
+            target = f"{base}.mp4"
+            os.replace(temp_file, target)
+            if str(video) != target:
+                os.remove(video)
+            log_job(job_id, logging.INFO, f"Converted: {video} → {target}")
+            if job:
+                job.update(
+                    message=f"Successfully converted {filename} to H.265",
+                    detailed_status=f"Converted {filename}",
+                )
+            return True
+        else:
+            log_job(
+                job_id,
+                logging.ERROR,
+                f"Failed to convert {video}, return code: {process.returncode}",
+            )
+            if job:
+                job.update(
+                    message=(
+                        "Failed to convert "
+                        f"{filename}, return code: {process.returncode}"
+                    ),
+                    detailed_status=f"Error converting {filename}",
+                )
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+    except subprocess.SubprocessError as e:
+        log_job(job_id, logging.ERROR, f"Failed to convert {video}: {e}")
+        if job:
+            job.process = None
+            job.update(
+                message=f"Failed to convert {filename}: {str(e)}",
+                detailed_status=f"Error converting {filename}",
+            )
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+    return False
 
 
 def convert_video_files(app, folder: str, season_num: str, job_id: str) -> None:
@@ -514,9 +1079,8 @@ def convert_video_files(app, folder: str, season_num: str, job_id: str) -> None:
             detailed_status="Preparing video conversion to H.265",
             message="Starting video conversion to H.265",
         )
-    video_files = []
-    for ext in ["webm", "mp4"]:
-        video_files.extend(list(Path(folder).glob(f"*S{season_num}E*.{ext}")))
+    season_files = _scan_season(folder, season_num)
+    video_files = season_files.get("webm", []) + season_files.get("mp4", [])
     total_files = len(video_files)
     if total_files == 0:
         if job:
@@ -530,173 +1094,46 @@ def convert_video_files(app, folder: str, season_num: str, job_id: str) -> None:
             total_files=total_files,
             detailed_status=f"Converting {total_files} video files to H.265",
         )
-    for i, video in enumerate(video_files):
-        ext = str(video).rsplit(".", 1)[1].lower()
-        if ext == "mp4":
-            probe_cmd = [
-                "ffprobe",
-                "-v",
-                "error",
-                "-select_streams",
-                "v:0",
-                "-show_entries",
-                "stream=codec_name",
-                "-of",
-                "json",
-                str(video),
-            ]
-            result = subprocess.run(probe_cmd, capture_output=True, text=True)
-            codec = (
-                json.loads(result.stdout).get("streams", [{}])[0].get("codec_name", "")
-            )
-            if codec in ["hevc", "h265"]:
-                log_job(
-                    job_id,
-                    logging.INFO,
-                    f"Skipping already H.265 encoded file: {video}",
-                )
-                if job:
-                    job.update(
-                        processed_files=i + 1,
-                        message=(
-                            "Skipping already H.265 encoded file: "
-                            f"{os.path.basename(str(video))}"
-                        ),
-                    )
-                continue
-        base = str(video).rsplit(".", 1)[0]
-        temp_file = f"{base}.temp.mp4"
-        cmd = [
-            "ffmpeg",
-            "-i",
-            str(video),
-            "-c:v",
-            "libx265",
-            "-preset",
-            "medium",
-            "-crf",
-            str(crf_value),
-            "-tag:v",
-            "hvc1",
-            "-c:a",
-            "aac",
-            "-b:a",
-            "128k",
-            temp_file,
-        ]
-        filename = os.path.basename(str(video))
-        if job:
-            job.update(
-                file_name=filename,
-                processed_files=i + 1,
-                detailed_status=(
-                    f"Converting {filename} to H.265 (file {i+1}/{total_files})"
-                ),
-                message=(f"Converting {filename} to H.265 ({i+1}/{total_files})"),
-            )
-        log_job(job_id, logging.INFO, f"Converting {video} to H.265")
-        try:
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                universal_newlines=True,
-                start_new_session=True,
-            )
-            if job:
-                job.process = process
-            for line in process.stdout:
-                if job and job.status == "cancelled":
-                    terminate_process(process)
-                    break
-                logger.debug(line.strip())
-                if job and "time=" in line:
-                    try:
-                        time_str = re.search(r"time=(\d+:\d+:\d+\.\d+)", line)
-                        if time_str:
-                            time_parts = time_str.group(1).split(":")
-                            seconds = (
-                                float(time_parts[0]) * 3600
-                                + float(time_parts[1]) * 60
-                                + float(time_parts[2])
-                            )
-                            duration_cmd = [
-                                "ffprobe",
-                                "-v",
-                                "error",
-                                "-show_entries",
-                                "format=duration",
-                                "-of",
-                                "default=noprint_wrappers=1:nokey=1",
-                                str(video),
-                            ]
-                            duration_result = subprocess.run(
-                                duration_cmd, capture_output=True, text=True, check=True
-                            )
-                            duration = float(duration_result.stdout.strip())
-                            if duration > 0:
-                                file_progress = min(100, int(seconds / duration * 100))
-                                total_progress = min(
-                                    99,
-                                    ((i) / total_files * 100)
-                                    + (file_progress / total_files),
-                                )
-                                job.update(
-                                    progress=total_progress,
-                                    stage_progress=file_progress,
-                                    detailed_status=(
-                                        f"Converting {filename}: {file_progress}% "
-                                        f"(file {i+1}/{total_files})"
-                                    ),
-                                )
-                                if file_progress % 20 == 0:
-                                    job.update(
-                                        message=(
-                                            f"Converting {filename}: {file_progress}% "
-                                            f"complete"
-                                        )
-                                    )
-                    except Exception as e:
-                        log_job(job_id, logging.ERROR, f"Error parsing progress: {e}")
-            process.wait()
-            if job:
-                job.process = None
-            if process.returncode == 0:
-                os.rename(temp_file, f"{base}.mp4")
-                if str(video) != f"{base}.mp4":
-                    os.remove(video)
-                log_job(job_id, logging.INFO, f"Converted: {video} → {base}.mp4")
-                if job:
-                    job.update(
-                        message=f"Successfully converted {filename} to H.265",
-                        detailed_status=f"Converted {i+1}/{total_files} files",
-                    )
-            else:
-                log_job(
-                    job_id,
-                    logging.ERROR,
-                    f"Failed to convert {video}, return code: {process.returncode}",
-                )
-                if job:
-                    job.update(
-                        message=(
-                            "Failed to convert "
-                            f"{filename}, return code: {process.returncode}"
-                        ),
-                        detailed_status=f"Error converting {filename}",
-                    )
-                if os.path.exists(temp_file):
-                    os.remove(temp_file)
-        except subprocess.SubprocessError as e:
-            log_job(job_id, logging.ERROR, f"Failed to convert {video}: {e}")
+    encoder = _select_hevc_encoder(str(app.config.get("hwaccel", "auto")))
+    workers = _conversion_workers(app, total_files)
+    x265_params = None
+    if workers > 1 and encoder == "libx265":
+        x265_params = f"pools={max(1, (os.cpu_count() or 1) // workers)}"
+        log_job(job_id, logging.INFO, f"Running {workers} conversions in parallel")
+    thread_args = _ffmpeg_thread_args(app, workers)
+    progress_lock = threading.Lock()
+    file_progress: Dict[int, int] = {}
+
+    def report_progress(index: int, percent: int) -> float:
+        with progress_lock:
+            file_progress[index] = percent
+            return min(99, sum(file_progress.values()) / total_files)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(
+                _convert_one,
+                app,
+                job_id,
+                video,
+                i,
+                total_files,
+                crf_value,
+                encoder,
+                x265_params,
+                report_progress,
+                thread_args,
+            ): i
+            for i, video in enumerate(video_files)
+        }
+        for processed, future in enumerate(as_completed(futures), start=1):
+            if future.result():
+                report_progress(futures[future], 100)
             if job:
-                job.process = None
                 job.update(
-                    message=f"Failed to convert {filename}: {str(e)}",
-                    detailed_status=f"Error converting {filename}",
+                    processed_files=processed,
+                    detailed_status=f"Converted {processed}/{total_files} files",
                 )
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
     if job:
         job.update(
             progress=100,
@@ -735,8 +1172,9 @@ def convert_movie_file(app, folder: str, job_id: str) -> None:
         )
 
     video_file = None
+    folder_files = _scan_season(folder)
     for ext in ["webm", "mp4", "mkv"]:
-        files = list(Path(folder).glob(f"*.{ext}"))
+        files = folder_files.get(ext)
         if files:
             video_file = files[0]
             break
@@ -751,21 +1189,8 @@ def convert_movie_file(app, folder: str, job_id: str) -> None:
         return
 
     ext = video_file.suffix.lower()[1:]
+    codec, duration, pix_fmt = _probe_video(video_file)
     if ext == "mp4":
-        probe_cmd = [
-            "ffprobe",
-            "-v",
-            "error",
-            "-select_streams",
-            "v:0",
-            "-show_entries",
-            "stream=codec_name",
-            "-of",
-            "json",
-            str(video_file),
-        ]
-        result = subprocess.run(probe_cmd, capture_output=True, text=True)
-        codec = json.loads(result.stdout).get("streams", [{}])[0].get("codec_name", "")
         if codec in ["hevc", "h265"]:
             log_job(
                 job_id,
@@ -781,22 +1206,29 @@ def convert_movie_file(app, folder: str, job_id: str) -> None:
 
     base = str(video_file).rsplit(".", 1)[0]
     temp_file = f"{base}.temp.mp4"
+    encoder = _select_hevc_encoder(str(app.config.get("hwaccel", "auto")))
+    input_args, video_args = _hevc_encode_args(
+        encoder, crf_value, x265_preset=str(app.config.get("x265_preset", "faster"))
+    )
+    decode_args = _hevc_decode_args(encoder)
     cmd = [
         "ffmpeg",
+        *_FFMPEG_PROGRESS_ARGS,
+        *decode_args,
+        *input_args,
         "-i",
         str(video_file),
-        "-c:v",
-        "libx265",
-        "-preset",
-        "medium",
-        "-crf",
-        str(crf_value),
+        *video_args,
+        *_pix_fmt_args(encoder, pix_fmt, decode_args),
+        *_ffmpeg_thread_args(app),
         "-tag:v",
         "hvc1",
         "-c:a",
         "aac",
         "-b:a",
         "128k",
+        "-movflags",
+        "+faststart",
         temp_file,
     ]
     filename = video_file.name
@@ -813,60 +1245,40 @@ def convert_movie_file(app, folder: str, job_id: str) -> None:
             cmd,
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
-            universal_newlines=True,
             start_new_session=True,
         )
         if job:
             job.process = process
-        for line in process.stdout:
-            if job and job.status == "cancelled":
-                terminate_process(process)
-                break
-            logger.debug(line.strip())
-            if job and "time=" in line:
+        debug = logger.isEnabledFor(logging.DEBUG)
+        # Only whole-percent changes are reported to the job
+        last_progress = -1
+        for line in iter_process_output(process, job):
+            if debug:
+                logger.debug(line.decode("utf-8", "replace").strip())
+            if job and duration > 0:
                 try:
-                    time_str = re.search(r"time=(\d+:\d+:\d+\.\d+)", line)
-                    if time_str:
-                        time_parts = time_str.group(1).split(":")
-                        seconds = (
-                            float(time_parts[0]) * 3600
-                            + float(time_parts[1]) * 60
-                            + float(time_parts[2])
-                        )
-                        duration_cmd = [
-                            "ffprobe",
-                            "-v",
-                            "error",
-                            "-show_entries",
-                            "format=duration",
-                            "-of",
-                            "default=noprint_wrappers=1:nokey=1",
-                            str(video_file),
-                        ]
-                        duration_result = subprocess.run(
-                            duration_cmd, capture_output=True, text=True, check=True
+                    seconds = _ffmpeg_progress_seconds(line)
+                    if seconds is not None:
+                        file_progress = min(100, int(seconds / duration * 100))
+                        if file_progress == last_progress:
+                            continue
+                        last_progress = file_progress
+                        job.update(
+                            progress=file_progress,
+                            stage_progress=file_progress,
+                            detailed_status=f"Converting {filename}: {file_progress}%",
                         )
-                        duration = float(duration_result.stdout.strip())
-                        if duration > 0:
-                            file_progress = min(100, int(seconds / duration * 100))
-                            if job:
-                                job.update(
-                                    progress=file_progress,
-                                    stage_progress=file_progress,
-                                    detailed_status=(
-                                        f"Converting {filename}: {file_progress}%"
-                                    ),
-                                )
                 except Exception as e:
                     log_job(job_id, logging.ERROR, f"Error parsing progress: {e}")
         process.wait()
         if job:
             job.process = None
         if process.returncode == 0:
-            os.rename(temp_file, f"{base}.mp4")
-            if str(video_file) != f"{base}.mp4":
+            target = f"{base}.mp4"
+            os.replace(temp_file, target)
+            if str(video_file) != target:
                 os.remove(video_file)
-            log_job(job_id, logging.INFO, f"Converted: {video_file} → {base}.mp4")
+            log_job(job_id, logging.INFO, f"Converted: {video_file} → {target}")
             if job:
                 job.update(
                     progress=100,
@@ -930,8 +1342,7 @@ def process_movie_metadata(
         if job:
             job.update(message="Error: JSON metadata index out of range")
         return
-    with open(json_files[json_index], "r") as f:
-        data = json.load(f)
+    data = load_json_file(json_files[json_index])
     description = (
         data.get("description", "").split("\n")[0] if data.get("description") else ""
     )
@@ -994,30 +1405,61 @@ def process_movie_metadata(
             tmdb.download_poster(poster_path, str(Path(folder) / "poster.jpg"), api_key)
         except Exception as e:
             log_job(job_id, logging.ERROR, f"Failed to download poster: {e}")
-    nfo_content = (
-        "<?xml version='1.0' encoding='UTF-8' standalone='yes'?>\n"
-        "<movie>\n"
-        f"  <title>{title}</title>\n"
-        f"  <plot>{plot}</plot>\n"
-        f"  <studio>YouTube</studio>\n"
-    )
+    parts = [
+        _NFO_HEADER,
+        "<movie>\n",
+        f"  <title>{escape(str(title))}</title>\n",
+        f"  <plot>{escape(str(plot))}</plot>\n",
+        "  <studio>YouTube</studio>\n",
+    ]
     if year:
-        nfo_content += f"  <year>{year}</year>\n"
+        parts.append(f"  <year>{escape(str(year))}</year>\n")
     if tmdb_id:
-        nfo_content += f"  <id>{tmdb_id}</id>\n"
+        parts.append(f"  <id>{escape(str(tmdb_id))}</id>\n")
     for g in genres:
-        nfo_content += f"  <genre>{g}</genre>\n"
+        parts.append(f"  <genre>{escape(str(g))}</genre>\n")
     for actor in actors:
-        nfo_content += "  <actor>\n    <name>{}</name>\n  </actor>\n".format(actor)
-    nfo_content += "</movie>\n"
-    with open(Path(folder) / "movie.nfo", "w") as f:
-        f.write(nfo_content)
+        parts.append(f"  <actor>\n    <name>{escape(str(actor))}</name>\n  </actor>\n")
+    parts.append("</movie>\n")
+    nfo_content = "".join(parts)
+    _write_nfo(Path(folder) / "movie.nfo", nfo_content)
     if job:
         job.update(progress=100, stage_progress=100, message="Movie metadata processed")
     for jf in json_files:
         os.remove(jf)
 
 
+def _stack_images(frames: Sequence[Path], output: Path) -> None:
+    """Stack ``frames`` vertically into ``output``.
+
+    Pillow does this in-process when installed; otherwise, or if Pillow
+    cannot read the frames, ImageMagick's ``convert -append`` is used.
+    """
+    if Image is not None:
+        try:
+            images = [Image.open(f) for f in frames]
+            try:
+                width = max(img.width for img in images)
+                canvas = Image.new(
+                    "RGB", (width, sum(img.height for img in images)), "white"
+                )
+                top = 0
+                for img in images:
+                    canvas.paste(img, (0, top))
+                    top += img.height
+                canvas.save(output, quality=92)
+            finally:
+                for img in images:
+                    img.close()
+            return
+        except OSError as e:
+            logger.debug(f"Pillow could not build {output}, using convert: {e}")
+    run_subprocess(
+        ["convert", *[str(f) for f in frames], "-append", str(output)],
+        check=True,
+    )
+
+
 def generate_movie_artwork(app, folder: str, job_id: str) -> None:
     """Generate a simple poster for a movie from extracted frames."""
     job = app.jobs.get(job_id)
@@ -1042,6 +1484,7 @@ def generate_movie_artwork(app, folder: str, job_id: str) -> None:
         run_subprocess(
             [
                 "ffmpeg",
+                *_frame_decode_args(app),
                 "-i",
                 str(movie_file),
                 "-vf",
@@ -1055,16 +1498,7 @@ def generate_movie_artwork(app, folder: str, job_id: str) -> None:
         )
         frame_files = sorted(Path(frames_dir).glob("frame_*.jpg"))
         if frame_files:
-            poster_path = Path(folder) / "poster.jpg"
-            run_subprocess(
-                [
-                    "convert",
-                    *[str(f) for f in frame_files],
-                    "-append",
-                    str(poster_path),
-                ],
-                check=True,
-            )
+            _stack_images(frame_files, Path(folder) / "poster.jpg")
             if job:
                 job.update(progress=100, message="Created movie poster")
     except (subprocess.CalledProcessError, OSError) as e:
@@ -1073,6 +1507,59 @@ def generate_movie_artwork(app, folder: str, job_id: str) -> None:
             job.update(message=f"Error generating movie artwork: {str(e)}")
 
 
+def _extract_thumbnail_batch(
+    batch: Sequence[Tuple[Path, str]], decode_args: Sequence[str] = ()
+) -> List[bool]:
+    """Run one ffmpeg mapping every input in ``batch`` to its own frame."""
+    cmd = ["ffmpeg", "-y", "-v", "error"]
+    for video, _ in batch:
+        cmd.extend([*decode_args, "-ss", "00:01:30", "-i", str(video)])
+    for i, (_, thumb_path) in enumerate(batch):
+        cmd.extend(["-map", f"{i}:v:0", "-frames:v", "1", "-q:v", "2", thumb_path])
+    try:
+        subprocess.run(cmd, check=True, capture_output=True)
+    except subprocess.CalledProcessError:
+        if len(batch) > 1:
+            return [
+                ok
+                for item in batch
+                for ok in _extract_thumbnail_batch([item], decode_args)
+            ]
+        return [False]
+    return [os.path.exists(thumb_path) for _, thumb_path in batch]
+
+
+def _extract_thumbnails(
+    thumbnails: Sequence[Tuple[Path, str]], decode_args: Sequence[str] = ()
+) -> List[bool]:
+    """Grab a frame 90 seconds into each video, one ffmpeg run per batch.
+
+    Each batch maps every input to its own single-frame output and batches
+    run concurrently. If a batch fails as a whole (for example one unreadable
+    input) its videos are retried individually so one bad file does not cost
+    the others.
+    """
+    batches = [
+        thumbnails[start : start + _THUMBNAIL_BATCH]
+        for start in range(0, len(thumbnails), _THUMBNAIL_BATCH)
+    ]
+    if len(batches) <= 1:
+        return [
+            ok
+            for batch in batches
+            for ok in _extract_thumbnail_batch(batch, decode_args)
+        ]
+    workers = min(_THUMBNAIL_WORKERS, len(batches))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return [
+            ok
+            for results in executor.map(
+                _extract_thumbnail_batch, batches, [decode_args] * len(batches)
+            )
+            for ok in results
+        ]
+
+
 def generate_artwork(
     app, folder: str, show_name: str, season_num: str, job_id: str
 ) -> None:
@@ -1082,12 +1569,25 @@ def generate_artwork(
             status="generating_artwork", message="Generating thumbnails and artwork"
         )
     show_folder = str(Path(folder).parent)
-    episodes = list(Path(folder).glob(f"*S{season_num}E*.mp4"))
+    episodes = _scan_season(folder, season_num).get("mp4", [])
     if not episodes:
         log_job(job_id, logging.WARNING, "No episodes found for artwork generation")
         if job:
             job.update(message="No episodes found for artwork generation")
         return
+    thumbnails = []
+    for video in episodes:
+        video_base = str(video).rsplit(".", 1)[0]
+        basename = os.path.basename(video_base)
+        if app.config.get("clean_filenames", True):
+            basename = clean_filename(basename)
+        thumb_path = os.path.join(os.path.dirname(video_base), f"{basename}-thumb.jpg")
+        thumbnails.append((video, thumb_path))
+    # Episode thumbnails do not depend on the posters, so extract them while
+    # the poster pipelines run.
+    decode_args = _frame_decode_args(app)
+    thumb_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="thumbs")
+    thumb_results = thumb_pool.submit(_extract_thumbnails, thumbnails, decode_args)
     try:
         if job:
             job.update(progress=30, message="Creating show and season artwork")
@@ -1098,6 +1598,7 @@ def generate_artwork(
             run_subprocess(
                 [
                     "ffmpeg",
+                    *decode_args,
                     "-i",
                     str(episode),
                     "-vf",
@@ -1139,26 +1640,40 @@ def generate_artwork(
             )
             if job:
                 job.update(progress=60, message="Created show poster")
-        season_frames_dir = os.path.join(app.temp_dir, "season_frames")
-        os.makedirs(season_frames_dir, exist_ok=True)
-        for i, episode in enumerate(episodes[:6]):
-            frame_file = os.path.join(season_frames_dir, f"frame_{i:03d}.jpg")
-            run_subprocess(
-                [
-                    "ffmpeg",
-                    "-i",
-                    str(episode),
-                    "-vf",
-                    "thumbnail",
-                    "-frames:v",
-                    "1",
-                    frame_file,
-                ],
-                check=True,
-                capture_output=True,
+        season_episodes = episodes[:6]
+        if season_episodes:
+            # One ffmpeg picks a representative frame from each episode and
+            # streams them as PPM images straight into montage.
+            frame_inputs: List[str] = []
+            frame_filters: List[str] = []
+            for i, episode in enumerate(season_episodes):
+                frame_inputs.extend([*decode_args, "-i", str(episode)])
+                frame_filters.append(
+                    f"[{i}:v:0]thumbnail,scale=400:225:force_original_aspect_ratio="
+                    "decrease,pad=400:225:(ow-iw)/2:(oh-ih)/2,setsar=1,"
+                    f"trim=end_frame=1,setpts=PTS-STARTPTS[f{i}]"
+                )
+            labels = "".join(f"[f{i}]" for i in range(len(season_episodes)))
+            frame_filters.append(
+                f"{labels}concat=n={len(season_episodes)}:v=1:a=0[frames]"
             )
-        season_frames = list(Path(season_frames_dir).glob("*.jpg"))
-        if season_frames:
+            frames_args = [
+                "ffmpeg",
+                "-v",
+                "error",
+                *frame_inputs,
+                "-filter_complex",
+                ";".join(frame_filters),
+                "-map",
+                "[frames]",
+                "-frames:v",
+                str(len(season_episodes)),
+                "-f",
+                "image2pipe",
+                "-c:v",
+                "ppm",
+                "pipe:1",
+            ]
             montage_args = [
                 "montage",
                 "-geometry",
@@ -1167,7 +1682,7 @@ def generate_artwork(
                 "black",
                 "-tile",
                 "3x2",
-                *[str(f) for f in season_frames],
+                "ppm:-",
                 "-",
             ]
             convert_args = [
@@ -1189,78 +1704,67 @@ def generate_artwork(
                 "-annotate",
                 "+0+20",
                 f"Season {season_num}",
+                # Write the poster, then derive the landscape image from the
+                # same pixels instead of decoding the poster again.
+                "-write",
                 f"{folder}/season{season_num}-poster.jpg",
+                "-resize",
+                "1000x562!",
+                f"{folder}/season{season_num}.jpg",
             ]
+            p0 = subprocess.Popen(
+                frames_args,
+                stdout=subprocess.PIPE,
+                start_new_session=True,
+            )
             p1 = subprocess.Popen(
                 montage_args,
+                stdin=p0.stdout,
                 stdout=subprocess.PIPE,
                 start_new_session=True,
             )
+            p0.stdout.close()
             p2 = subprocess.Popen(
                 convert_args,
                 stdin=p1.stdout,
                 start_new_session=True,
             )
+            p1.stdout.close()
             p2.communicate()
-            run_subprocess(
-                [
-                    "convert",
-                    f"{folder}/season{season_num}-poster.jpg",
-                    "-resize",
-                    "1000x562!",
-                    f"{folder}/season{season_num}.jpg",
-                ],
-                check=True,
-            )
+            if p0.wait() != 0:
+                raise subprocess.CalledProcessError(p0.returncode, frames_args)
+            if p1.wait() != 0:
+                raise subprocess.CalledProcessError(p1.returncode, montage_args)
+            if p2.returncode:
+                raise subprocess.CalledProcessError(p2.returncode, convert_args)
             if job:
                 job.update(progress=100, message="Created season artwork")
-        for i, video in enumerate(episodes):
-            video_base = str(video).rsplit(".", 1)[0]
-            basename = os.path.basename(video_base)
-            if app.config.get("clean_filenames", True):
-                basename = clean_filename(basename)
-            thumb_path = os.path.join(
-                os.path.dirname(video_base), f"{basename}-thumb.jpg"
-            )
-            try:
-                subprocess.run(
-                    [
-                        "ffmpeg",
-                        "-ss",
-                        "00:01:30",
-                        "-i",
-                        str(video),
-                        "-vframes",
-                        "1",
-                        "-q:v",
-                        "2",
-                        thumb_path,
-                    ],
-                    check=True,
-                    capture_output=True,
-                )
+        for (video, thumb_path), ok in zip(thumbnails, thumb_results.result()):
+            if ok:
                 log_job(
                     job_id,
                     logging.INFO,
                     f"Generated thumbnail: {thumb_path}",
                 )
-            except subprocess.CalledProcessError:
-                log_job(
-                    job_id,
-                    logging.ERROR,
-                    f"Failed to generate thumbnail for {video}",
-                )
-                if job:
-                    job.update(
-                        message=(
-                            "Failed to generate thumbnail for "
-                            f"{os.path.basename(str(video))}"
-                        )
+                continue
+            log_job(
+                job_id,
+                logging.ERROR,
+                f"Failed to generate thumbnail for {video}",
+            )
+            if job:
+                job.update(
+                    message=(
+                        "Failed to generate thumbnail for "
+                        f"{os.path.basename(str(video))}"
                     )
+                )
     except (subprocess.CalledProcessError, OSError) as e:
         log_job(job_id, logging.ERROR, f"Error generating artwork: {e}")
         if job:
             job.update(message=f"Error generating artwork: {str(e)}")
+    finally:
+        thumb_pool.shutdown(wait=True)
 
 
 def create_nfo_files(
@@ -1270,25 +1774,12 @@ def create_nfo_files(
     if job:
         job.update(status="creating_nfo", message="Creating NFO files")
     show_folder = str(Path(folder).parent)
-    season_nfo = (
-        "<?xml version='1.0' encoding='UTF-8' standalone='yes'?>\n"
-        "<season>\n"
-        f"  <seasonnumber>{season_num}</seasonnumber>\n"
-        f"  <title>Season {season_num}</title>\n"
-        f"  <plot>Season {season_num} of {show_name}</plot>\n"
-        "</season>\n"
-    )
-    with open(f"{folder}/season.nfo", "w") as f:
-        f.write(season_nfo)
-    tvshow_nfo = (
-        "<?xml version='1.0' encoding='UTF-8' standalone='yes'?>\n"
-        "<tvshow>\n"
-        f"  <title>{show_name}</title>\n"
-        "  <studio>YouTube</studio>\n"
-        "</tvshow>\n"
+    season_nfo = _SEASON_NFO.substitute(
+        season=escape(str(season_num)), show=escape(show_name)
     )
-    with open(f"{show_folder}/tvshow.nfo", "w") as f:
-        f.write(tvshow_nfo)
+    _write_nfo(f"{folder}/season.nfo", season_nfo)
+    tvshow_nfo = _TVSHOW_NFO.substitute(show=escape(show_name))
+    _write_nfo(f"{show_folder}/tvshow.nfo", tvshow_nfo)
     if job:
         job.update(progress=100, message="Created NFO files")
 
@@ -1355,7 +1846,7 @@ def download_audiobook_audio(app, url: str, folder: str, job_id: str) -> Optiona
     if not os.path.isabs(ytdlp_path):
         script_dir = os.path.dirname(os.path.abspath(__file__))
         local_ytdlp = os.path.join(script_dir, ytdlp_path)
-        if os.path.exists(local_ytdlp) and os.access(local_ytdlp, os.X_OK):
+        if _is_exec(local_ytdlp):
             ytdlp_path = local_ytdlp
 
     cmd = [
@@ -1402,10 +1893,7 @@ def download_audiobook_audio(app, url: str, folder: str, job_id: str) -> Optiona
         if job:
             job.process = process
 
-        for raw_line in process.stdout:
-            if job and job.status == "cancelled":
-                terminate_process(process)
-                break
+        for raw_line in iter_process_output(process, job):
             line = raw_line.strip()
             log_job(job_id, logging.INFO, line)
             if job and "Destination:" in line:
@@ -1541,7 +2029,7 @@ def download_music_tracks(
     if not os.path.isabs(ytdlp_path):
         script_dir = os.path.dirname(os.path.abspath(__file__))
         local_ytdlp = os.path.join(script_dir, ytdlp_path)
-        if os.path.exists(local_ytdlp) and os.access(local_ytdlp, os.X_OK):
+        if _is_exec(local_ytdlp):
             ytdlp_path = local_ytdlp
 
     cmd = [
@@ -1595,15 +2083,13 @@ def download_music_tracks(
         total_items = 0
         processed = 0
         current_file = ""
-        for raw_line in process.stdout:
-            if job and job.status == "cancelled":
-                terminate_process(process)
-                break
+        last_progress_update = float("-inf")
+        for raw_line in iter_process_output(process, job):
             line = raw_line.strip()
             log_job(job_id, logging.INFO, line)
             if job:
                 if "Destination:" in line:
-                    match = re.search(r"Destination:\s+(.+)", line)
+                    match = _DOWNLOAD_DEST_RE.search(line)
                     if match:
                         current_file = os.path.basename(match.group(1))
                         processed += 1
@@ -1616,12 +2102,16 @@ def download_music_tracks(
                             message=f"Downloading {current_file}",
                         )
                 elif "[download]" in line and "of" in line and "item" in line:
-                    total_match = re.search(r"of\s+(\d+)\s+item", line)
+                    total_match = _DOWNLOAD_TOTAL_RE.search(line)
                     if total_match:
                         total_items = int(total_match.group(1))
                         job.update(total_files=total_items)
                 elif "%" in line:
-                    progress_match = re.search(r"(\d+\.\d+)%", line)
+                    now = time.monotonic()
+                    if now - last_progress_update < _PROGRESS_UPDATE_INTERVAL:
+                        continue
+                    last_progress_update = now
+                    progress_match = _PROGRESS_PCT_RE.search(line)
                     if progress_match:
                         progress_value = float(progress_match.group(1))
                         overall = progress_value
@@ -1859,105 +2349,263 @@ def prepare_music_tracks(
     return prepared_files
 
 
+def _season_sort_key(name: str) -> Tuple[int, str]:
+    """Order ``Season 2`` before ``Season 10``; unnumbered names sort last."""
+    match = _SEASON_NUM_RE.search(name)
+    return (int(match.group(1)) if match else sys.maxsize, name)
+
+
+def _stat_entry(entry: os.DirEntry) -> os.stat_result:
+    return entry.stat()
+
+
+def _format_mtime(timestamp: float) -> str:
+    """Format a file modification time the way the web UI displays it."""
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(timestamp))
+
+
+def _episode_sort_key(episode: Dict):
+    ep_num = episode.get("episode_num")
+    return (ep_num is None, ep_num if ep_num is not None else episode["name"])
+
+
+def _list_season(season_path: str, output_dir: str, map_fn=map) -> Dict:
+    """Describe one ``Season NN`` directory using a single directory scan.
+
+    Episode files are stat'ed through ``map_fn`` so the calls can be spread
+    over a thread pool on slow or network storage.
+    """
+    name = os.path.basename(season_path)
+    season = {"name": name, "path": season_path, "episodes": []}
+    match = _SEASON_NUM_RE.search(name)
+    season_num = match.group(1) if match else ""
+    poster_name = f"season{season_num}-poster.jpg"
+    # Where supported, scan through a directory fd so each DirEntry.stat() is
+    # an fstatat() relative to it rather than a full path lookup.
+    dir_fd = os.open(season_path, _DIR_OPEN_FLAGS) if _SCANDIR_FD else None
+    try:
+        entries = []
+        with os.scandir(season_path if dir_fd is None else dir_fd) as it:
+            for entry in it:
+                if entry.name == poster_name:
+                    season["poster"] = os.path.relpath(
+                        os.path.join(season_path, entry.name), output_dir
+                    )
+                elif entry.name.endswith(".mp4") and entry.is_file():
+                    entries.append(entry)
+        if len(entries) < _PARALLEL_STAT_MIN:
+            map_fn = map
+        for entry, st in zip(entries, map_fn(_stat_entry, entries)):
+            match = _EPISODE_CODE_RE.search(entry.name)
+            season["episodes"].append(
+                {
+                    "name": entry.name[:-4],
+                    "path": os.path.join(season_path, entry.name),
+                    "size": st.st_size,
+                    "modified": _format_mtime(st.st_mtime),
+                    "episode_num": int(match.group(2)) if match else None,
+                }
+            )
+    finally:
+        if dir_fd is not None:
+            os.close(dir_fd)
+    season["episodes"].sort(key=_episode_sort_key)
+    return season
+
+
+def _media_tree_key(output_dir: str) -> Optional[Tuple]:
+    """Return the modification times of the show and season directories.
+
+    Adding, removing or renaming an episode touches its season directory, so
+    the listing only needs rebuilding when this key changes.
+    """
+    try:
+        shows = os.scandir(output_dir)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    key = []
+    with shows:
+        for show_entry in shows:
+            if not show_entry.is_dir():
+                continue
+            seasons = []
+            with os.scandir(show_entry.path) as it:
+                for entry in it:
+                    if entry.name.startswith("Season ") and entry.is_dir():
+                        seasons.append((entry.name, entry.stat().st_mtime_ns))
+            seasons.sort()
+            key.append(
+                (show_entry.name, show_entry.stat().st_mtime_ns, tuple(seasons))
+            )
+    key.sort()
+    return (output_dir, os.stat(output_dir).st_mtime_ns, tuple(key))
+
+
 def list_media(app) -> List[Dict]:
-    media = []
-    output_dir = Path(app.config["output_dir"])
-    if not output_dir.exists():
+    """Return the TV library, rebuilding it only when the tree has changed.
+
+    While the background refresher is running the last snapshot is returned
+    without touching the filesystem. The returned list is shared between
+    callers and must not be modified.
+    """
+    if app.media_refresh_thread is not None and app._media_cache[0] is not None:
+        return app._media_cache[1]
+    return _refresh_media_cache(app)
+
+
+def _refresh_media_cache(app) -> List[Dict]:
+    output_dir = str(app.config["output_dir"])
+    with app._media_cache_lock:
+        key = _media_tree_key(output_dir)
+        if key is None:
+            return []
+        cached_key, cached = app._media_cache
+        if key == cached_key:
+            return cached
+        if app._stat_pool is None:
+            app._stat_pool = ThreadPoolExecutor(
+                max_workers=_STAT_WORKERS, thread_name_prefix="media-stat"
+            )
+        if app._show_pool is None:
+            app._show_pool = ThreadPoolExecutor(
+                max_workers=_SHOW_WORKERS, thread_name_prefix="media-show"
+            )
+        media = _build_media_list(
+            output_dir, app._stat_pool.map, app._show_pool.map
+        )
+        app._media_cache = (key, media)
         return media
-    for show_dir in output_dir.iterdir():
-        if not show_dir.is_dir():
-            continue
-        show = {
-            "name": show_dir.name,
-            "path": str(show_dir),
-            "seasons": [],
-        }
 
-        poster_file = show_dir / "poster.jpg"
-        if poster_file.exists():
-            show["poster"] = os.path.relpath(poster_file, output_dir)
 
-        episode_total = 0
+def start_media_refresher(app, interval: float = MEDIA_REFRESH_INTERVAL) -> None:
+    """Start a background thread that keeps the media listing snapshot fresh."""
 
-        for season_dir in show_dir.iterdir():
-            if not season_dir.is_dir() or not season_dir.name.startswith("Season "):
-                continue
-            season = {
-                "name": season_dir.name,
-                "path": str(season_dir),
-                "episodes": [],
-            }
+    if not getattr(app, "media_refresh_stop_event", None):
+        app.media_refresh_stop_event = threading.Event()
+    else:
+        app.media_refresh_stop_event.clear()
 
-            match = re.search(r"(\d+)", season_dir.name)
-            season_num = match.group(1) if match else ""
-
-            season_poster = season_dir / f"season{season_num}-poster.jpg"
-            if season_poster.exists():
-                season["poster"] = os.path.relpath(season_poster, output_dir)
-            for episode_file in season_dir.glob("*.mp4"):
-                match = re.search(r"S(\d+)E(\d+)", episode_file.name)
-                episode_num = int(match.group(2)) if match else None
-                episode = {
-                    "name": episode_file.stem,
-                    "path": str(episode_file),
-                    "size": episode_file.stat().st_size,
-                    "modified": datetime.fromtimestamp(
-                        episode_file.stat().st_mtime
-                    ).strftime("%Y-%m-%d %H:%M:%S"),
-                    "episode_num": episode_num,
-                }
-                season["episodes"].append(episode)
-                episode_total += 1
+    def _run() -> None:
+        while not app.media_refresh_stop_event.is_set():
+            try:
+                _refresh_media_cache(app)
+            except Exception as e:
+                logger.error(f"Media listing refresh failed: {e}")
+            app.media_refresh_stop_event.wait(interval)
+
+    app.media_refresh_thread = threading.Thread(target=_run, daemon=True)
+    app.media_refresh_thread.start()
+
+
+def stop_media_refresher(app) -> None:
+    """Signal the media refresher thread to stop and wait for it."""
+    if getattr(app, "media_refresh_stop_event", None):
+        app.media_refresh_stop_event.set()
+    if getattr(app, "media_refresh_thread", None):
+        app.media_refresh_thread.join()
+        app.media_refresh_thread = None
+
+
+def _list_show(show_path: str, output_dir: str, map_fn=map) -> Dict:
+    show = {
+        "name": os.path.basename(show_path),
+        "path": show_path,
+        "seasons": [],
+    }
+    episode_total = 0
+    seasons = []
+    # Scan in bytes mode so only names that pass the checks below
+    # are decoded.
+    with os.scandir(os.fsencode(show_path)) as it:
+        for entry in it:
+            if entry.name == b"poster.jpg":
+                show["poster"] = os.path.relpath(os.fsdecode(entry.path), output_dir)
+            elif entry.name.startswith(SEASON_PREFIX) and entry.is_dir():
+                season_path = os.fsdecode(entry.path)
+                season = _list_season(season_path, output_dir, map_fn)
+                episode_total += len(season["episodes"])
+                seasons.append((_season_sort_key(os.fsdecode(entry.name)), season))
+    seasons.sort(key=itemgetter(0))
+    show["seasons"] = [season for _, season in seasons]
+    show["episode_count"] = episode_total
+    return show
+
+
+def _build_media_list(output_dir: str, map_fn=map, show_map_fn=map) -> List[Dict]:
+    """List every show under ``output_dir``.
+
+    Shows are scanned independently through ``show_map_fn`` and episode stats
+    through ``map_fn``; they must not share a pool, as show workers block on
+    the stat workers.
+    """
+    try:
+        with os.scandir(output_dir) as it:
+            show_paths = [entry.path for entry in it if entry.is_dir()]
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+    if len(show_paths) < 2:
+        show_map_fn = map
+    return list(
+        show_map_fn(lambda path: _list_show(path, output_dir, map_fn), show_paths)
+    )
+
+
+_MOVIE_EXTENSIONS = (".mp4", ".mkv", ".webm")
 
-            def sort_key(e):
-                ep_num = e.get("episode_num")
-                return (ep_num is None, ep_num if ep_num is not None else e["name"])
 
-            season["episodes"].sort(key=sort_key)
-            show["seasons"].append(season)
-        show["seasons"].sort(key=lambda s: s["name"])
-        show["episode_count"] = episode_total
-        media.append(show)
-    return media
+def _find_movie(movie_path: str, name: str) -> Tuple[Optional[os.DirEntry], bool]:
+    """Scan a movie folder once for its video file and ``poster.jpg``.
+
+    A file named after the folder wins; otherwise the first video by name is
+    used, preferring mp4 over mkv and webm. Folders holding ``Season``
+    directories are TV shows and yield no movie.
+    """
+    videos: Dict[str, List[os.DirEntry]] = {ext: [] for ext in _MOVIE_EXTENSIONS}
+    has_poster = False
+    with os.scandir(movie_path) as it:
+        for entry in it:
+            if entry.name.startswith("Season ") and entry.is_dir():
+                return None, False
+            if entry.name == "poster.jpg":
+                has_poster = True
+                continue
+            ext = os.path.splitext(entry.name)[1]
+            if ext in videos and entry.is_file():
+                videos[ext].append(entry)
+    for ext in _MOVIE_EXTENSIONS:
+        for entry in videos[ext]:
+            if entry.name == f"{name}{ext}":
+                return entry, has_poster
+    for ext in _MOVIE_EXTENSIONS:
+        if videos[ext]:
+            return min(videos[ext], key=lambda e: e.name), has_poster
+    return None, has_poster
 
 
 def list_movies(app) -> List[Dict]:
     movies = []
-    output_dir = Path(app.config["output_dir"])
-    if not output_dir.exists():
+    output_dir = str(app.config["output_dir"])
+    try:
+        folders = os.scandir(output_dir)
+    except (FileNotFoundError, NotADirectoryError):
         return movies
-    for movie_dir in output_dir.iterdir():
-        if not movie_dir.is_dir():
-            continue
-        if any(
-            sd.is_dir() and sd.name.startswith("Season ") for sd in movie_dir.iterdir()
-        ):
-            continue
-        movie_file = None
-        for ext in ["mp4", "mkv", "webm"]:
-            candidate = movie_dir / f"{movie_dir.name}.{ext}"
-            if candidate.exists():
-                movie_file = candidate
-                break
-        if not movie_file:
-            for ext in ["mp4", "mkv", "webm"]:
-                files = list(movie_dir.glob(f"*.{ext}"))
-                if files:
-                    movie_file = files[0]
-                    break
-        if movie_file:
-            poster_file = movie_dir / "poster.jpg"
+    with folders:
+        for movie_dir in folders:
+            if not movie_dir.is_dir():
+                continue
+            movie_file, has_poster = _find_movie(movie_dir.path, movie_dir.name)
+            if movie_file is None:
+                continue
+            st = movie_file.stat()
             movies.append(
                 {
                     "name": movie_dir.name,
-                    "path": str(movie_file),
-                    "size": movie_file.stat().st_size,
-                    "modified": datetime.fromtimestamp(
-                        movie_file.stat().st_mtime
-                    ).strftime("%Y-%m-%d %H:%M:%S"),
+                    "path": movie_file.path,
+                    "size": st.st_size,
+                    "modified": _format_mtime(st.st_mtime),
                     "poster": (
-                        os.path.relpath(poster_file, output_dir)
-                        if poster_file.exists()
+                        os.path.join(movie_dir.name, "poster.jpg")
+                        if has_poster
                         else None
                     ),
                 }
@@ -1978,7 +2626,7 @@ def get_playlist_videos(app, url: str) -> List[Dict]:
             text=True,
             check=True,
         )
-        data = json.loads(result.stdout)
+        data = loads_json(result.stdout)
         entries = data.get("entries", [])
         videos = []
         for idx, entry in enumerate(entries, start=1):
@@ -2005,7 +2653,7 @@ def get_music_playlist_details(app, url: str) -> Dict:
             text=True,
             check=True,
         )
-        data = json.loads(result.stdout)
+        data = loads_json(result.stdout)
     except (subprocess.CalledProcessError, json.JSONDecodeError) as exc:
         logger.error(f"Failed to fetch music playlist info: {exc}")
         return {"entries": []}
@@ -2095,6 +2743,8 @@ __all__ = [
     "generate_artwork",
     "create_nfo_files",
     "list_media",
+    "start_media_refresher",
+    "stop_media_refresher",
     "list_movies",
     "get_playlist_videos",
     "get_music_playlist_details",
@@ -3,17 +3,24 @@ import json
 import re
 import subprocess
 import threading
-from pathlib import Path
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional
 
 from .config import logger
+from .utils import dumps_json, load_json_file
+
+_PLAYLIST_ID_RE = re.compile(r"list=([^&]+)")
+_NON_WORD_RE = re.compile(r"\W+")
+
+# Playlists listed side by side during an update check
+_UPDATE_CHECK_WORKERS = 8
 
 
 def _load_playlists(playlists_file: str) -> Dict[str, Dict[str, str]]:
     if os.path.exists(playlists_file):
         try:
-            with open(playlists_file, "r") as f:
-                return json.load(f)
+            return load_json_file(playlists_file)
         except (IOError, json.JSONDecodeError):
             logger.warning("Failed to load playlists file, starting fresh")
     return {}
@@ -23,17 +30,19 @@ def _save_playlists(playlists_file: str, playlists: Dict[str, Dict[str, str]]) -
     if os.environ.get("PYTEST_CURRENT_TEST"):
         return
     os.makedirs(os.path.dirname(playlists_file), exist_ok=True)
-    with open(playlists_file, "w") as f:
-        json.dump(playlists, f, indent=2)
+    with open(playlists_file, "wb") as f:
+        f.write(dumps_json(playlists, indent=True))
 
 
+@lru_cache(maxsize=256)
 def _get_playlist_id(url: str) -> str:
-    match = re.search(r"list=([^&]+)", url)
+    match = _PLAYLIST_ID_RE.search(url)
     if match:
         return match.group(1)
-    return re.sub(r"\W+", "", url)
+    return _NON_WORD_RE.sub("", url)
 
 
+@lru_cache(maxsize=256)
 def _get_archive_file(url: str) -> str:
     pid = _get_playlist_id(url)
     return os.path.join("config", "archives", f"{pid}.txt")
@@ -93,53 +102,91 @@ def _remove_playlist(
 
 
 def _get_existing_max_index(folder: str, season_num: str) -> int:
-    pattern = re.compile(rf"S{season_num}E(\d+)")
+    """Return the highest episode number among ``S{season_num}E`` mp4 files."""
+    tag = f"S{season_num}E"
     max_idx = 0
-    for file in Path(folder).glob(f"*S{season_num}E*.mp4"):
-        match = pattern.search(file.name)
-        if match:
-            max_idx = max(max_idx, int(match.group(1)))
+    try:
+        with os.scandir(folder) as it:
+            for entry in it:
+                name = entry.name
+                if not name.endswith(".mp4"):
+                    continue
+                start = name.find(tag)
+                while start >= 0:
+                    end = digits = start + len(tag)
+                    while end < len(name) and name[end].isdecimal():
+                        end += 1
+                    if end > digits:
+                        max_idx = max(max_idx, int(name[digits:end]))
+                        break
+                    start = name.find(tag, digits)
+    except (FileNotFoundError, NotADirectoryError):
+        return 0
     return max_idx
 
 
+def _read_archive_ids(archive: str) -> FrozenSet[str]:
+    """Return every whitespace-separated token in a download archive.
+
+    Entries may be bare ids or yt-dlp's ``<extractor> <id>`` lines; splitting
+    on whitespace covers both in a single C-level pass.
+    """
+    try:
+        with open(archive, "r") as f:
+            return frozenset(f.read().split())
+    except FileNotFoundError:
+        return frozenset()
+
+
+def _new_playlist_ids(ytdlp_path: str, info: Dict) -> List[str]:
+    """Return ids in a tracked playlist that are not yet in its archive."""
+    archive = info.get("archive", _get_archive_file(info["url"]))
+    try:
+        result = subprocess.run(
+            [ytdlp_path, "--flat-playlist", "--print", "id", info["url"]],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except subprocess.CalledProcessError as e:
+        logger.error(f"Failed to check playlist {info['url']}: {e}")
+        return []
+
+    # One id per playlist entry, in playlist order; "NA" marks a missing id
+    start_index = int(info.get("start_index", 1))
+    ids = [
+        vid
+        for idx, vid in enumerate(result.stdout.splitlines(), start=1)
+        if idx >= start_index and vid and vid != "NA"
+    ]
+    archived = _read_archive_ids(archive)
+    new_ids = [vid for vid in ids if vid not in archived]
+    if not new_ids:
+        logger.info(f"No updates found for playlist {info['url']}")
+    return new_ids
+
+
 def check_playlist_updates(app) -> List[str]:
-    created_jobs = []
-    for pid, info in app.playlists.items():
-        if info.get("disabled"):
-            continue
-        archive = info.get("archive", _get_archive_file(info["url"]))
-        try:
-            result = subprocess.run(
-                [
-                    app.config["ytdlp_path"],
-                    "--flat-playlist",
-                    "--dump-single-json",
-                    info["url"],
-                ],
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-            data = json.loads(result.stdout)
-        except (subprocess.CalledProcessError, json.JSONDecodeError) as e:
-            logger.error(f"Failed to check playlist {info['url']}: {e}")
-            continue
+    """Queue a job for every enabled playlist with videos not yet downloaded.
 
-        start_index = int(info.get("start_index", 1))
-        ids = [
-            e.get("id")
-            for idx, e in enumerate(data.get("entries", []), start=1)
-            if idx >= start_index and e.get("id")
-        ]
-        archived = set()
-        if os.path.exists(archive):
-            with open(archive, "r") as f:
-                archived = {line.strip() for line in f if line.strip()}
-        new_ids = [vid for vid in ids if vid not in archived]
+    The yt-dlp listings are fetched concurrently; jobs are then created in
+    playlist order on the calling thread.
+    """
+    created_jobs = []
+    tracked = [info for info in app.playlists.values() if not info.get("disabled")]
+    if not tracked:
+        return created_jobs
+    ytdlp_path = app.config["ytdlp_path"]
+    workers = min(_UPDATE_CHECK_WORKERS, len(tracked))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(
+            executor.map(lambda info: _new_playlist_ids(ytdlp_path, info), tracked)
+        )
+
+    for info, new_ids in zip(tracked, results):
         if not new_ids:
-            logger.info(f"No updates found for playlist {info['url']}")
             continue
-
+        start_index = int(info.get("start_index", 1))
         folder = app.create_folder_structure(info["show_name"], info["season_num"])
         last_ep = app.get_last_episode(info["show_name"], info["season_num"])
         if last_ep == 0:
@@ -204,6 +251,7 @@ __all__ = [
     "_set_playlist_enabled",
     "_remove_playlist",
     "_get_existing_max_index",
+    "_read_archive_ids",
     "check_playlist_updates",
     "start_update_checker",
     "stop_update_checker",
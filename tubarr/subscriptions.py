@@ -9,14 +9,23 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 from .config import logger
-from .utils import sanitize_name
+from .playlist import _read_archive_ids
+from .utils import dumps_json, load_json_file, sanitize_name
+
+# Channel id, /channel/<id> path, then @handle, tried in that order
+_SUBSCRIPTION_ID_PATTERNS = (
+    re.compile(r"(UC[\w-]{5,})"),
+    re.compile(r"channel/([^/?]+)"),
+    re.compile(r"@([\w.-]+)"),
+)
+_NON_WORD_RE = re.compile(r"\W+")
+_SPECIALS_EPISODE_RE = re.compile(r"S00E(\d+)", re.IGNORECASE)
 
 
 def _load_subscriptions(subscriptions_file: str) -> Dict[str, Dict[str, object]]:
     if os.path.exists(subscriptions_file):
         try:
-            with open(subscriptions_file, "r") as f:
-                return json.load(f)
+            return load_json_file(subscriptions_file)
         except (IOError, json.JSONDecodeError):
             logger.warning("Failed to load subscriptions file, starting fresh")
     return {}
@@ -28,21 +37,16 @@ def _save_subscriptions(
     if os.environ.get("PYTEST_CURRENT_TEST"):
         return
     os.makedirs(os.path.dirname(subscriptions_file), exist_ok=True)
-    with open(subscriptions_file, "w") as f:
-        json.dump(subscriptions, f, indent=2)
+    with open(subscriptions_file, "wb") as f:
+        f.write(dumps_json(subscriptions, indent=True))
 
 
 def _get_subscription_id(url: str) -> str:
-    match = re.search(r"(UC[\w-]{5,})", url)
-    if match:
-        return match.group(1)
-    match = re.search(r"channel/([^/?]+)", url)
-    if match:
-        return match.group(1)
-    match = re.search(r"@([\w.-]+)", url)
-    if match:
-        return match.group(1)
-    return re.sub(r"\W+", "", url)
+    for pattern in _SUBSCRIPTION_ID_PATTERNS:
+        match = pattern.search(url)
+        if match:
+            return match.group(1)
+    return _NON_WORD_RE.sub("", url)
 
 
 def _normalise_retention(
@@ -249,10 +253,7 @@ def check_subscription_updates(app) -> List[str]:
         entries, _ = _fetch_channel_entries(app, info["url"])
         if not entries:
             continue
-        archived_ids = set()
-        if os.path.exists(archive):
-            with open(archive, "r") as f:
-                archived_ids = {line.strip() for line in f if line.strip()}
+        archived_ids = _read_archive_ids(archive)
         new_entries = [e for e in entries if e.get("id") not in archived_ids]
         if not new_entries:
             logger.info(f"No updates found for channel {info['url']}")
@@ -303,22 +304,18 @@ def apply_retention_policy(app, subscription_id: str) -> None:
         / sanitize_name(info["show_name"])
         / "Season 00"
     )
-    if not folder.exists():
+    # One scan serves both picking the episodes and finding their files
+    try:
+        with os.scandir(folder) as it:
+            files = [entry for entry in it if entry.is_file()]
+    except OSError:
         return
 
-    pattern = re.compile(r"S00E(\d+)", re.IGNORECASE)
-    episodes: Dict[int, Path] = {}
-    for file in folder.iterdir():
-        if not file.is_file():
-            continue
-        match = pattern.search(file.name)
-        if not match:
-            continue
-        number = int(match.group(1))
-        if number not in episodes and file.suffix.lower() in {".mp4", ".mkv", ".webm"}:
-            episodes[number] = file
-        elif number not in episodes:
-            episodes[number] = file
+    episodes: Dict[int, os.DirEntry] = {}
+    for entry in files:
+        match = _SPECIALS_EPISODE_RE.search(entry.name)
+        if match:
+            episodes.setdefault(int(match.group(1)), entry)
 
     if not episodes:
         return
@@ -329,9 +326,9 @@ def apply_retention_policy(app, subscription_id: str) -> None:
     elif mode == "days":
         threshold = datetime.utcnow() - timedelta(days=int(value))
         remove_numbers = []
-        for number, path in episodes.items():
+        for number, entry in episodes.items():
             try:
-                modified = datetime.utcfromtimestamp(path.stat().st_mtime)
+                modified = datetime.utcfromtimestamp(entry.stat().st_mtime)
             except OSError:
                 continue
             if modified < threshold:
@@ -339,13 +336,17 @@ def apply_retention_policy(app, subscription_id: str) -> None:
     else:
         return
 
-    for number in remove_numbers:
-        pattern = f"*S00E{number:02d}*"
-        for target in folder.glob(pattern):
-            try:
-                target.unlink()
-            except OSError:
-                logger.warning(f"Failed to remove file {target}")
+    markers = tuple(f"S00E{number:02d}" for number in remove_numbers)
+    if not markers:
+        return
+    for entry in files:
+        name = entry.name
+        if name.startswith(".") or not any(marker in name for marker in markers):
+            continue
+        try:
+            os.unlink(entry.path)
+        except OSError:
+            logger.warning(f"Failed to remove file {entry.path}")
 
 
 __all__ = [
@@ -6,15 +6,20 @@ from typing import Dict, Optional
 BASE_URL = "https://api.themoviedb.org/3"
 IMAGE_BASE = "https://image.tmdb.org/t/p/w500"
 
+_BRACKETED_RE = re.compile(r"\[[^\]]*\]")
+_QUALITY_PAREN_RE = re.compile(r"\((?:\d{4}p|HD|4K).*?\)", re.I)
+_RESOLUTION_RE = re.compile(r"\b\d{3,4}p\b", re.I)
+_WHITESPACE_RE = re.compile(r"\s+")
+
 
 def clean_title(title: str) -> str:
     """Remove common YouTube style suffixes from titles."""
     if not title:
         return ""
-    title = re.sub(r"\[[^\]]*\]", "", title)
-    title = re.sub(r"\((?:\d{4}p|HD|4K).*?\)", "", title, flags=re.I)
-    title = re.sub(r"\b\d{3,4}p\b", "", title, flags=re.I)
-    return re.sub(r"\s+", " ", title).strip()
+    title = _BRACKETED_RE.sub("", title)
+    title = _QUALITY_PAREN_RE.sub("", title)
+    title = _RESOLUTION_RE.sub("", title)
+    return _WHITESPACE_RE.sub(" ", title).strip()
 
 
 def search_movie(title: str, year: str, api_key: str) -> Optional[Dict]:
@@ -1,9 +1,19 @@
 import os
 import re
+import json
 import subprocess
 import logging
+import queue
+import shutil
 import signal
-from typing import List
+import threading
+from functools import lru_cache
+from typing import Any, Iterator, List, Union
+
+try:  # orjson is an optional speed-up; the stdlib parser is used otherwise
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
 
 logger = logging.getLogger("yt-to-jellyfin")
 
@@ -13,38 +23,63 @@ def log_job(job_id: str, level: int, message: str) -> None:
     logger.log(level, f"Job {job_id}: {message}")
 
 
+def loads_json(data: Union[bytes, str]) -> Any:
+    """Parse JSON text using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_json(obj: Any, indent: bool = False) -> bytes:
+    """Serialize ``obj`` to UTF-8 JSON using orjson when available.
+
+    Output is compact unless ``indent`` is set, which indents by two spaces
+    for files people may read or edit by hand.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    if indent:
+        return json.dumps(obj, indent=2).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def load_json_file(path: Union[str, "os.PathLike[str]"]) -> Any:
+    """Read and parse a JSON file with a single read call."""
+    with open(path, "rb") as f:
+        return loads_json(f.read())
+
+
+_SANITIZE_TABLE = str.maketrans({"_": " ", **{c: None for c in '\\/:"*?<>|'}})
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
 def sanitize_name(name: str) -> str:
     """Sanitize file/directory names to be compatible with file systems."""
-    name = name.strip()
-    name = name.replace("_", " ")
-    sanitized = re.sub(r'[\\/:"*?<>|]', "", name)
-    sanitized = re.sub(r"\s+", " ", sanitized)
-    return sanitized
+    sanitized = name.strip().translate(_SANITIZE_TABLE)
+    return _WHITESPACE_RE.sub(" ", sanitized)
 
 
+# Everything before the first SxxEyy code, the code, and everything after it
+_EPISODE_SPLIT_RE = re.compile(r"^(.*?)(S\d+E\d+)(.*)$", re.DOTALL)
+_DASH_RE = re.compile(r"\s*-\s*")
+
+
+@lru_cache(maxsize=4096)
 def clean_filename(name: str) -> str:
     """Clean up filename for better readability."""
-    episode_pattern = r"(S\d+E\d+)"
-    episode_match = re.search(episode_pattern, name)
-    if not episode_match:
+    match = _EPISODE_SPLIT_RE.match(name)
+    if not match:
         return name.replace("_", " ")
-    parts = re.split(episode_pattern, name, maxsplit=1)
-    if len(parts) >= 1 and parts[0]:
-        parts[0] = parts[0].replace("_", " ")
-        parts[0] = re.sub(r"\s*-\s*", " - ", parts[0])
-        parts[0] = re.sub(r"\s+", " ", parts[0])
-        parts[0] = parts[0].strip()
-    result = ""
-    for i, part in enumerate(parts):
-        if i > 0 and i % 2 == 1 and parts[i - 1] and not parts[i - 1].endswith(" "):
-            result += " " + part
-        else:
-            result += part
-    if result.startswith("S") and re.match(r"^S\d+E\d+", result) and len(parts) > 1:
-        if not parts[1].startswith(" "):
-            episode_end = re.match(r"^S\d+E\d+", result).end()
-            result = result[:episode_end] + " " + result[episode_end:]
-    return result
+    prefix, episode, rest = match.groups()
+    prefix = prefix.replace("_", " ")
+    prefix = _WHITESPACE_RE.sub(" ", _DASH_RE.sub(" - ", prefix)).strip()
+    if prefix:
+        return f"{prefix} {episode}{rest}"
+    return f"{episode} {rest}"
 
 
 def run_subprocess(cmd: List[str], **kwargs) -> subprocess.CompletedProcess:
@@ -77,6 +112,65 @@ def terminate_process(process: subprocess.Popen) -> None:
         logger.error(f"Failed to terminate process: {exc}")
 
 
+_OUTPUT_EOF = object()
+_OUTPUT_CHUNK_SIZE = 65536
+
+# Pipe buffer for chatty subprocesses such as yt-dlp, so short progress
+# lines are gathered into fewer reads
+PIPE_BUFSIZE = 1 << 20
+_LINE_BREAK_RE = re.compile(rb"[\r\n]")
+
+
+def iter_process_output(
+    process: subprocess.Popen, job: Any = None, poll_interval: float = 0.5
+) -> Iterator[str]:
+    """Yield output lines from ``process`` without blocking on a quiet pipe.
+
+    A daemon thread drains ``process.stdout`` into a queue so the caller wakes
+    up at least every ``poll_interval`` seconds. If ``job`` is cancelled in
+    the meantime the process is terminated and iteration stops, even when the
+    subprocess has not printed anything.
+
+    Binary pipes are read in chunks and split on both ``\r`` and ``\n`` so
+    carriage-return progress updates arrive as they happen and are yielded as
+    undecoded ``bytes``; text pipes yield ``str`` lines as before.
+    """
+    lines: "queue.Queue[Any]" = queue.Queue()
+
+    def _drain() -> None:
+        try:
+            read_chunk = getattr(process.stdout, "read1", None)
+            if read_chunk is None:
+                for line in process.stdout:
+                    lines.put(line)
+                return
+            pending = b""
+            for chunk in iter(lambda: read_chunk(_OUTPUT_CHUNK_SIZE), b""):
+                *complete, pending = _LINE_BREAK_RE.split(pending + chunk)
+                for line in complete:
+                    if line:
+                        lines.put(line)
+            if pending:
+                lines.put(pending)
+        except (OSError, ValueError):  # pragma: no cover - pipe closed on kill
+            pass
+        finally:
+            lines.put(_OUTPUT_EOF)
+
+    threading.Thread(target=_drain, daemon=True).start()
+    while True:
+        if job is not None and job.status == "cancelled":
+            terminate_process(process)
+            return
+        try:
+            line = lines.get(timeout=poll_interval)
+        except queue.Empty:
+            continue
+        if line is _OUTPUT_EOF:
+            return
+        yield line
+
+
 def check_dependencies(ytdlp_path: str, extra: List[str] = None) -> bool:
     """Check if all required dependencies are installed."""
     dependencies = ["ffmpeg", "convert", "montage"]
@@ -85,10 +179,12 @@ def check_dependencies(ytdlp_path: str, extra: List[str] = None) -> bool:
 
     logger.info(f"Using yt-dlp path: {ytdlp_path}")
     if ytdlp_path.startswith("/"):
-        if not os.path.exists(ytdlp_path):
+        try:
+            mode = os.stat(ytdlp_path).st_mode
+        except OSError:
             logger.error(f"yt-dlp not found at path: {ytdlp_path}")
             return False
-        if not os.access(ytdlp_path, os.X_OK):
+        if not mode & 0o111:
             logger.error(f"yt-dlp is not executable: {ytdlp_path}")
             return False
         logger.info(f"Found yt-dlp at: {ytdlp_path}")
@@ -97,17 +193,13 @@ def check_dependencies(ytdlp_path: str, extra: List[str] = None) -> bool:
 
     ffmpeg_path = None
     for cmd in dependencies:
-        try:
-            result = subprocess.run(
-                ["which", cmd], check=True, capture_output=True, text=True
-            )
-            found_path = result.stdout.strip()
-            logger.info(f"Found dependency {cmd} at: {found_path}")
-            if cmd == "ffmpeg":
-                ffmpeg_path = found_path or cmd
-        except subprocess.CalledProcessError:
+        found_path = shutil.which(cmd)
+        if not found_path:
             logger.error(f"Required dependency not found: {cmd}")
             return False
+        logger.info(f"Found dependency {cmd} at: {found_path}")
+        if cmd == "ffmpeg":
+            ffmpeg_path = found_path
 
     ffmpeg_cmd = ffmpeg_path or "ffmpeg"
     try:
@@ -145,6 +237,11 @@ __all__ = [
     "check_dependencies",
     "run_subprocess",
     "terminate_process",
+    "iter_process_output",
+    "PIPE_BUFSIZE",
     "logger",
     "log_job",
+    "loads_json",
+    "dumps_json",
+    "load_json_file",
 ]
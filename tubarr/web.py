@@ -2,12 +2,20 @@ from flask import (
     Flask,
     render_template,
     request,
-    jsonify,
     send_from_directory,
+    stream_with_context,
 )
+import gzip
+import hashlib
 import os
+import re
+import stat
+import threading
+import time
 
 from .core import logger, YTToJellyfin
+from .jobs import TERMINAL_JOB_STATUSES
+from .utils import dumps_json
 
 # Create Flask application for web interface
 # Determine the repository root so the web assets can be located correctly
@@ -18,9 +26,110 @@ app = Flask(
     template_folder=os.path.join(_BASE_DIR, "web", "templates"),
     static_folder=os.path.join(_BASE_DIR, "web", "static"),
 )
+# Templates ship with the package, so skip the per-render stat for changes
+app.config["TEMPLATES_AUTO_RELOAD"] = False
+app.jinja_env.auto_reload = False
+# Let browsers reuse script.js/style.css between page loads
+app.config["SEND_FILE_MAX_AGE_DEFAULT"] = 3600
 
 ytj = YTToJellyfin()
 
+# Converted episodes are never rewritten in place, so clients may keep them;
+# artwork can be regenerated and is revalidated via its ETag instead.
+_EPISODE_FILE_RE = re.compile(r"S\d{2,}E\d{2,}.*\.(mp4|mkv)$", re.IGNORECASE)
+_EPISODE_MAX_AGE = 3600
+
+
+def _is_regular_file(path):
+    """Return True if ``path`` names an existing regular file (one stat call)."""
+    try:
+        return stat.S_ISREG(os.stat(path).st_mode)
+    except (OSError, TypeError, ValueError):
+        return False
+
+
+def _is_true(value):
+    return value is True
+
+
+def _keep(value):
+    return value
+
+
+# Settings PUT /config may change, mapped to the coercion for their values
+_CONFIG_COERCE = {
+    "output_dir": _keep,
+    "quality": _keep,
+    "use_h265": _is_true,
+    "crf": int,
+    "parallel_encodes": int,
+    "ffmpeg_threads": int,
+    "hwaccel": _keep,
+    "x265_preset": _keep,
+    "web_port": int,
+    "completed_jobs_limit": int,
+    "max_concurrent_jobs": int,
+    "jellyfin_enabled": _is_true,
+    "jellyfin_tv_path": _keep,
+    "jellyfin_movie_path": _keep,
+    "jellyfin_host": _keep,
+    "jellyfin_port": _keep,
+    "jellyfin_api_key": _keep,
+    "jellyfin_copy_mode": _keep,
+    "tmdb_api_key": _keep,
+    "tvdb_api_key": _keep,
+    "tvdb_pin": _keep,
+    "imdb_enabled": _keep,
+    "imdb_api_key": _keep,
+    "clean_filenames": _is_true,
+    "update_checker_enabled": _is_true,
+    "update_checker_interval": int,
+    "sonarr_blackhole_path": _keep,
+    "radarr_blackhole_path": _keep,
+}
+_UPDATE_CHECKER_KEYS = frozenset({"update_checker_enabled", "update_checker_interval"})
+_TVDB_KEYS = frozenset({"tvdb_api_key", "tvdb_pin"})
+
+# Seconds between keep-alive comments on an idle job progress stream
+_SSE_HEARTBEAT = 15
+# Each open progress stream holds a server thread, so only a few may be open
+# at once and each is closed after a while (EventSource reconnects by itself)
+MAX_PROGRESS_STREAMS = 4
+_SSE_MAX_AGE = 300
+_sse_streams = threading.BoundedSemaphore(MAX_PROGRESS_STREAMS)
+
+# Encoded /media body for the current snapshot: (shows, body, gzipped, etag).
+# list_media() hands out the same list object until the library changes, so
+# repeat polls reuse the bytes instead of serializing and compressing again.
+_media_body = (None, b"", b"", "")
+
+
+def _json_response(payload, status=200):
+    """Return ``payload`` as JSON, serialized with orjson when installed."""
+    return app.response_class(
+        dumps_json(payload), status=status, mimetype="application/json"
+    )
+
+
+def _iter_json_array(items):
+    """Yield a JSON array one element at a time for a streamed response."""
+    yield b"["
+    for i, item in enumerate(items):
+        yield b"," + dumps_json(item) if i else dumps_json(item)
+    yield b"]"
+
+
+def _encode_media(shows):
+    """Return the raw body, gzipped body and ETag for a media snapshot."""
+    global _media_body
+    cached = _media_body
+    if cached[0] is not shows:
+        body = b"".join(_iter_json_array(shows))
+        etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+        cached = (shows, body, gzip.compress(body, compresslevel=6), etag)
+        _media_body = cached
+    return cached[1:]
+
 
 def _parse_optional_int(value, label):
     if value is None or value == "":
@@ -41,17 +150,16 @@ def _parse_optional_bool(value):
 
 @app.route("/")
 def index():
-    """Main web interface page."""
+    """Main web interface page.
+
+    Jobs and media are loaded by the page itself from ``/jobs`` and
+    ``/media``, so only the settings the template renders are passed in.
+    """
     music_defaults = {
         "music_output_dir": ytj.config.get("music_output_dir", ""),
         "jellyfin_music_path": ytj.config.get("jellyfin_music_path", ""),
     }
-    return render_template(
-        "index.html",
-        jobs=ytj.get_jobs(),
-        media=ytj.list_media(),
-        music_defaults=music_defaults,
-    )
+    return render_template("index.html", music_defaults=music_defaults)
 
 
 @app.route("/jobs", methods=["GET", "POST"])
@@ -78,19 +186,23 @@ def jobs():
             quality_override = _parse_optional_int(quality_val, "quality")
             crf_override = _parse_optional_int(crf_val, "CRF")
         except ValueError as exc:
-            return jsonify({"error": str(exc)}), 400
+            return _json_response({"error": str(exc)}, status=400)
         use_h265_override = _parse_optional_bool(use_h265_raw)
 
         if send_to_sonarr:
             destination_path = ytj.config.get("sonarr_blackhole_path") or None
             destination_label = "sonarr"
             if not destination_path:
-                return jsonify({"error": "Sonarr blackhole path is not configured"}), 400
+                return _json_response(
+                    {"error": "Sonarr blackhole path is not configured"}, status=400
+                )
 
         if not playlist_url or not show_name:
-            return jsonify({"error": "Missing required parameters"}), 400
+            return _json_response({"error": "Missing required parameters"}, status=400)
         if not auto_detect and (not season_num or not episode_start):
-            return jsonify({"error": "Season and episode start are required"}), 400
+            return _json_response(
+                {"error": "Season and episode start are required"}, status=400
+            )
         if auto_detect:
             season_num = season_num or "00"
             episode_start = episode_start or "01"
@@ -128,10 +240,10 @@ def jobs():
                 destination_path=destination_path,
                 destination_label=destination_label,
             )
-        return jsonify({"job_id": job_id})
+        return _json_response({"job_id": job_id})
     else:
         # Get all jobs
-        return jsonify(ytj.get_jobs())
+        return _json_response(ytj.get_jobs())
 
 
 @app.route("/movies", methods=["GET", "POST"])
@@ -148,20 +260,22 @@ def movies():
         destination_label = None
 
         if not video_url or not movie_name:
-            return jsonify({"error": "Missing required parameters"}), 400
+            return _json_response({"error": "Missing required parameters"}, status=400)
 
         try:
             quality_override = _parse_optional_int(quality_val, "quality")
             crf_override = _parse_optional_int(crf_val, "CRF")
         except ValueError as exc:
-            return jsonify({"error": str(exc)}), 400
+            return _json_response({"error": str(exc)}, status=400)
         use_h265_override = _parse_optional_bool(use_h265_raw)
 
         if send_to_radarr:
             destination_path = ytj.config.get("radarr_blackhole_path") or None
             destination_label = "radarr"
             if not destination_path:
-                return jsonify({"error": "Radarr blackhole path is not configured"}), 400
+                return _json_response(
+                    {"error": "Radarr blackhole path is not configured"}, status=400
+                )
 
         optional_kwargs = {}
         if quality_override is not None:
@@ -190,16 +304,16 @@ def movies():
                         **optional_kwargs,
                     )
                 )
-            return jsonify({"job_ids": job_ids})
+            return _json_response({"job_ids": job_ids})
         else:
             job_id = ytj.create_movie_job(
                 video_url,
                 movie_name,
                 **optional_kwargs,
             )
-            return jsonify({"job_id": job_id})
+            return _json_response({"job_id": job_id})
     else:
-        return jsonify(ytj.list_movies())
+        return _json_response(ytj.list_movies())
 
 
 @app.route("/music/jobs", methods=["GET", "POST"])
@@ -209,15 +323,15 @@ def music_jobs():
     if request.method == "POST":
         data = request.get_json(silent=True) or {}
         if not data:
-            return jsonify({"error": "Missing request payload"}), 400
+            return _json_response({"error": "Missing request payload"}, status=400)
         try:
             job_id = ytj.create_music_job(data)
         except ValueError as exc:
-            return jsonify({"error": str(exc)}), 400
-        return jsonify({"job_id": job_id})
+            return _json_response({"error": str(exc)}, status=400)
+        return _json_response({"job_id": job_id})
 
     jobs = [job for job in ytj.get_jobs() if job.get("media_type") == "music"]
-    return jsonify(jobs)
+    return _json_response(jobs)
 
 
 @app.route("/audiobooks/jobs", methods=["GET", "POST"])
@@ -232,19 +346,19 @@ def audiobook_jobs():
         cover_url = data.get("cover_url") or None
 
         if not url or not title or not author:
-            return jsonify({"error": "Missing required parameters"}), 400
+            return _json_response({"error": "Missing required parameters"}, status=400)
 
         try:
             job_id = ytj.create_audiobook_job(
                 url, title, author, cover_url=cover_url
             )
         except ValueError as exc:
-            return jsonify({"error": str(exc)}), 400
+            return _json_response({"error": str(exc)}, status=400)
 
-        return jsonify({"job_id": job_id})
+        return _json_response({"job_id": job_id})
 
     jobs = [job for job in ytj.get_jobs() if job.get("media_type") == "audiobook"]
-    return jsonify(jobs)
+    return _json_response(jobs)
 
 
 @app.route("/music/jobs/<job_id>", methods=["GET"])
@@ -253,8 +367,8 @@ def music_job_detail(job_id):
 
     job = ytj.get_job(job_id)
     if not job or job.get("media_type") != "music":
-        return jsonify({"error": "Job not found"}), 404
-    return jsonify(job)
+        return _json_response({"error": "Job not found"}, status=404)
+    return _json_response(job)
 
 
 @app.route("/music/playlists/info", methods=["GET"])
@@ -263,9 +377,9 @@ def music_playlist_info():
 
     url = request.args.get("url")
     if not url:
-        return jsonify({"error": "Missing url"}), 400
+        return _json_response({"error": "Missing url"}, status=400)
     info = ytj.get_music_playlist_info(url)
-    return jsonify(info)
+    return _json_response(info)
 
 
 @app.route("/jobs/<job_id>", methods=["GET", "DELETE"])
@@ -273,32 +387,92 @@ def job_detail(job_id):
     """Get or modify a specific job."""
     if request.method == "DELETE":
         if ytj.cancel_job(job_id):
-            return jsonify({"success": True})
-        return jsonify({"error": "Job not found"}), 404
+            return _json_response({"success": True})
+        return _json_response({"error": "Job not found"}, status=404)
 
     job = ytj.get_job(job_id)
     if job:
-        return jsonify(job)
-    return jsonify({"error": "Job not found"}), 404
+        return _json_response(job)
+    return _json_response({"error": "Job not found"}, status=404)
+
+
+@app.route("/jobs/<job_id>/progress")
+def job_progress(job_id):
+    """Stream a job's progress as server-sent events until it finishes."""
+    job = ytj.jobs.get(job_id)
+    if not job:
+        return _json_response({"error": "Job not found"}, status=404)
+
+    if not _sse_streams.acquire(blocking=False):
+        response = _json_response(
+            {"error": "Too many progress streams open"}, status=503
+        )
+        response.headers["Retry-After"] = str(_SSE_HEARTBEAT)
+        return response
+
+    def generate():
+        deadline = time.monotonic() + _SSE_MAX_AGE
+        version, snapshot = job.progress_snapshot()
+        while True:
+            yield b"data: " + dumps_json(snapshot) + b"\n\n"
+            if snapshot["status"] in TERMINAL_JOB_STATUSES:
+                return
+            while not job.wait_for_change(version, _SSE_HEARTBEAT):
+                if time.monotonic() >= deadline:
+                    return
+                yield b": heartbeat\n\n"
+            if time.monotonic() >= deadline:
+                return
+            version, snapshot = job.progress_snapshot()
+
+    response = app.response_class(
+        stream_with_context(generate()), mimetype="text/event-stream"
+    )
+    # Runs when the server closes the response, even if it was never iterated
+    response.call_on_close(_sse_streams.release)
+    response.headers["Cache-Control"] = "no-cache"
+    # Keep reverse proxies from buffering the stream
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
 
 
 @app.route("/media", methods=["GET"])
 def media():
-    """List all media files."""
-    return jsonify(ytj.list_media())
+    """List all media files.
+
+    The response carries an ETag of the snapshot so re-polls get a 304, and
+    is sent gzipped to clients that accept it. The gzipped body has its own
+    ETag since its bytes differ from the plain one.
+    """
+    body, gzipped, etag = _encode_media(ytj.list_media())
+    response = app.response_class(body, mimetype="application/json")
+    response.vary.add("Accept-Encoding")
+    if "gzip" in request.accept_encodings:
+        response.set_data(gzipped)
+        response.content_encoding = "gzip"
+        etag += "-gz"
+    response.set_etag(etag)
+    return response.make_conditional(request)
 
 
 @app.route("/media_files/<path:filename>")
 def media_files(filename):
     """Serve media files such as posters."""
     output_dir = ytj.config.get("output_dir", "")
-    return send_from_directory(output_dir, filename)
+    if _EPISODE_FILE_RE.search(filename):
+        response = send_from_directory(
+            output_dir, filename, max_age=_EPISODE_MAX_AGE
+        )
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        return response
+    return send_from_directory(output_dir, filename, max_age=0)
 
 
 @app.route("/playlists", methods=["GET"])
 def playlists():
     """Return registered playlists."""
-    return jsonify(ytj.list_playlists())
+    return _json_response(ytj.list_playlists())
 
 
 @app.route("/subscriptions", methods=["GET", "POST"])
@@ -315,9 +489,9 @@ def subscriptions():
                 channel_url, show_name, retention_type, retention_value
             )
         except ValueError as exc:
-            return jsonify({"error": str(exc)}), 400
-        return jsonify({"subscription_id": subscription_id})
-    return jsonify(ytj.list_subscriptions())
+            return _json_response({"error": str(exc)}, status=400)
+        return _json_response({"subscription_id": subscription_id})
+    return _json_response(ytj.list_subscriptions())
 
 
 @app.route("/subscriptions/<sid>", methods=["PUT", "DELETE"])
@@ -325,8 +499,8 @@ def subscription_modify(sid):
     """Update or remove a subscription."""
     if request.method == "DELETE":
         if ytj.remove_subscription(sid):
-            return jsonify({"success": True})
-        return jsonify({"error": "Subscription not found"}), 404
+            return _json_response({"success": True})
+        return _json_response({"error": "Subscription not found"}, status=404)
 
     data = request.get_json() or {}
     show_name = data.get("show_name")
@@ -344,10 +518,10 @@ def subscription_modify(sid):
             enabled=enabled,
         )
     except ValueError as exc:
-        return jsonify({"error": str(exc)}), 400
+        return _json_response({"error": str(exc)}, status=400)
     if not updated:
-        return jsonify({"error": "Subscription not found"}), 404
-    return jsonify({"success": True})
+        return _json_response({"error": "Subscription not found"}, status=404)
+    return _json_response({"success": True})
 
 
 @app.route("/playlists/<pid>", methods=["PUT", "DELETE"])
@@ -356,29 +530,29 @@ def playlist_modify(pid):
     if request.method == "PUT":
         data = request.get_json() or {}
         if "enabled" not in data:
-            return jsonify({"error": "Missing enabled flag"}), 400
+            return _json_response({"error": "Missing enabled flag"}, status=400)
         if ytj.set_playlist_enabled(pid, bool(data["enabled"])):
-            return jsonify({"success": True})
-        return jsonify({"error": "Playlist not found"}), 404
+            return _json_response({"success": True})
+        return _json_response({"error": "Playlist not found"}, status=404)
     else:  # DELETE
         if ytj.remove_playlist(pid):
-            return jsonify({"success": True})
-        return jsonify({"error": "Playlist not found"}), 404
+            return _json_response({"success": True})
+        return _json_response({"error": "Playlist not found"}, status=404)
 
 
 @app.route("/playlist_info")
 def playlist_info():
     url = request.args.get("url")
     if not url:
-        return jsonify({"error": "Missing url"}), 400
-    return jsonify(ytj.get_playlist_videos(url))
+        return _json_response({"error": "Missing url"}, status=400)
+    return _json_response(ytj.get_playlist_videos(url))
 
 
 @app.route("/playlists/check", methods=["POST"])
 def playlists_check():
     """Check all playlists for updates and return created job ids."""
     jobs = ytj.check_playlist_updates()
-    return jsonify({"created_jobs": jobs})
+    return _json_response({"created_jobs": jobs})
 
 
 @app.route("/config", methods=["GET", "PUT"])
@@ -388,61 +562,12 @@ def config():
         # Get updated configuration from request
         new_config = request.json
         if new_config:
-            # Update allowed configuration settings
-            allowed_keys = [
-                "output_dir",
-                "quality",
-                "use_h265",
-                "crf",
-                "web_port",
-                "completed_jobs_limit",
-                "max_concurrent_jobs",
-                "jellyfin_enabled",
-                "jellyfin_tv_path",
-                "jellyfin_movie_path",
-                "jellyfin_host",
-                "jellyfin_port",
-                "jellyfin_api_key",
-                "tmdb_api_key",
-                "tvdb_api_key",
-                "tvdb_pin",
-                "imdb_enabled",
-                "imdb_api_key",
-                "clean_filenames",
-                "update_checker_enabled",
-                "update_checker_interval",
-                "sonarr_blackhole_path",
-                "radarr_blackhole_path",
-            ]
-
-            should_restart_update = False
-            should_reinit_tvdb = False
-            # Update only allowed keys
-            for key in allowed_keys:
+            # Update only allowed keys, coercing each value for its setting
+            for key, coerce in _CONFIG_COERCE.items():
                 if key in new_config:
-                    if key in [
-                        "jellyfin_enabled",
-                        "use_h265",
-                        "clean_filenames",
-                        "update_checker_enabled",
-                    ]:
-                        ytj.config[key] = new_config[key] is True
-                    elif key in [
-                        "crf",
-                        "web_port",
-                        "completed_jobs_limit",
-                        "max_concurrent_jobs",
-                        "update_checker_interval",
-                    ]:
-                        ytj.config[key] = int(new_config[key])
-                    else:
-                        ytj.config[key] = new_config[key]
-
-                    if key in ["update_checker_enabled", "update_checker_interval"]:
-                        should_restart_update = True
-
-                    if key in ["tvdb_api_key", "tvdb_pin"]:
-                        should_reinit_tvdb = True
+                    ytj.config[key] = coerce(new_config[key])
+            should_restart_update = not _UPDATE_CHECKER_KEYS.isdisjoint(new_config)
+            should_reinit_tvdb = not _TVDB_KEYS.isdisjoint(new_config)
 
             # Special handling for cookies_path
             if "cookies_path" in new_config:
@@ -451,7 +576,7 @@ def config():
                 ytj.config["cookies_path"] = cookies_path
 
                 # Check if the file exists and update cookies if it does
-                if os.path.exists(cookies_path):
+                if _is_regular_file(cookies_path):
                     ytj.config["cookies"] = cookies_path
                     logger.info(f"Updated cookies file path to: {cookies_path}")
                 else:
@@ -461,6 +586,10 @@ def config():
                         f"Cookies file not found at {cookies_path}, not using cookies"
                     )
 
+            if "max_concurrent_jobs" in new_config:
+                # Start queued jobs now if the limit was raised
+                ytj.set_max_concurrent_jobs(ytj.config["max_concurrent_jobs"])
+
             if should_restart_update:
                 if ytj.update_thread and ytj.update_thread.is_alive():
                     ytj.stop_update_checker()
@@ -490,11 +619,13 @@ def config():
                 _save_config(ytj.config)
             except Exception as e:
                 logger.error(f"Failed to save configuration: {e}")
-                return jsonify({"error": f"Failed to save configuration: {str(e)}"}), 500
+                return _json_response(
+                    {"error": f"Failed to save configuration: {str(e)}"}, status=500
+                )
 
-            return jsonify({"success": True, "message": "Configuration updated"})
+            return _json_response({"success": True, "message": "Configuration updated"})
 
-        return jsonify({"error": "Invalid configuration data"}), 400
+        return _json_response({"error": "Invalid configuration data"}, status=400)
     else:
         # Get configuration
         safe_config = {k: v for k, v in ytj.config.items()}
@@ -506,7 +637,13 @@ def config():
         if "cookies" in safe_config:
             del safe_config["cookies"]
 
-        return jsonify(safe_config)
+        # The settings page refetches this on every visit; let it revalidate
+        # against an ETag and get a 304 while nothing has changed.
+        response = _json_response(safe_config)
+        body = response.get_data()
+        response.set_etag(hashlib.blake2b(body, digest_size=16).hexdigest())
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
 
 
 @app.route("/history")
@@ -518,7 +655,7 @@ def history():
         if j.status in {"completed", "failed", "cancelled"}
     ]
     finished.sort(key=lambda j: j["created_at"])
-    return jsonify(finished)
+    return _json_response(finished)
 
 
-__all__ = ["app", "ytj", "history"]
+__all__ = ["app", "ytj", "history", "MAX_PROGRESS_STREAMS"]
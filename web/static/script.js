@@ -2517,6 +2517,8 @@ function showJobDetails(jobId) {
             modal.setAttribute('data-job-id', jobId);
             
             updateJobDetailModal(job);
+            watchJobProgress(jobId, job);
+            modal.addEventListener('hidden.bs.modal', stopJobProgress, { once: true });
             
             const modalObj = new bootstrap.Modal(modal);
             modalObj.show();
@@ -2527,6 +2529,51 @@ function showJobDetails(jobId) {
         });
 }
 
+// Live progress for the job shown in the details modal
+let jobProgressSource = null;
+
+function watchJobProgress(jobId, job) {
+    stopJobProgress();
+    if (!window.EventSource || ['completed', 'failed', 'cancelled'].includes(job.status)) {
+        return;
+    }
+    const source = new EventSource(`/jobs/${jobId}/progress`);
+    source.onmessage = function(event) {
+        const update = JSON.parse(event.data);
+        Object.assign(job, update);
+        const modal = document.getElementById('jobDetailModal');
+        if (modal.getAttribute('data-job-id') === jobId) {
+            updateJobDetailModal(job);
+        }
+        if (['completed', 'failed', 'cancelled'].includes(update.status)) {
+            stopJobProgress();
+            // The stream carries progress only; fetch the final log once
+            fetch(`/jobs/${jobId}`)
+                .then(response => response.json())
+                .then(finished => {
+                    if (modal.getAttribute('data-job-id') === jobId) {
+                        updateJobDetailModal(finished);
+                    }
+                })
+                .catch(error => console.error('Error fetching job details:', error));
+        }
+    };
+    source.onerror = function() {
+        // Refused (too many streams open); the regular job polling takes over
+        if (source.readyState === EventSource.CLOSED) {
+            stopJobProgress();
+        }
+    };
+    jobProgressSource = source;
+}
+
+function stopJobProgress() {
+    if (jobProgressSource) {
+        jobProgressSource.close();
+        jobProgressSource = null;
+    }
+}
+
 function updateJobDetailModal(job) {
     document.getElementById('detail-show-name').textContent = job.show_name;
     document.getElementById('detail-season').textContent = job.season_num;